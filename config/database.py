@@ -8,7 +8,14 @@ MONGODB_CONFIG = {
     'database': 'xsearch',
     'connect_timeout_ms': 30000,
     'socket_timeout_ms': 30000,
-    'read_preference': 'secondaryPreferred'
+    'read_preference': 'secondaryPreferred',
+    # Connection pool settings for the process-wide client (utils/db_connector.get_mongo_client)
+    'max_pool_size': 50,
+    'min_pool_size': 2,
+    'max_idle_time_ms': 300000,
+    'server_selection_timeout_ms': 10000,
+    'retry_writes': True,
+    'retry_reads': True
 }
 
 # MongoDB Connection Settings
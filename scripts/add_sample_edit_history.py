@@ -2,8 +2,7 @@
 Add sample edit history to some terms for testing
 """
 
-from pymongo import MongoClient
-from datetime import datetime, timedelta
+from datetime import timedelta
 import sys
 import os
 import random
@@ -11,14 +10,14 @@ import random
 # Add parent directory to path
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
-from config.database import MONGODB_CONFIG
+from utils.db_connector import get_database
+from utils.ist import now_ist
+from utils.edit_events import build_edit_event, replace_edit_events
 
 def add_sample_edits():
     """Add sample edit history to random terms"""
     
-    # Connect to MongoDB
-    client = MongoClient(MONGODB_CONFIG['uri'])
-    db = client[MONGODB_CONFIG['database']]
+    db = get_database()
     collection = db['search_term_categories']
     
     print("Adding sample edit history...")
@@ -40,7 +39,7 @@ def add_sample_edits():
     
     for term_doc in selected_terms:
         term = term_doc['searchTerm']
-        created_date = term_doc.get('createdDate', datetime.utcnow())
+        created_date = term_doc.get('createdDate', now_ist())
         model_cats = term_doc.get('modelIdentifiedCategories', [])
         
         if not model_cats:
@@ -58,7 +57,7 @@ def add_sample_edits():
         })
         
         # Add random edits between creation date and now
-        days_diff = (datetime.utcnow() - created_date).days
+        days_diff = (now_ist() - created_date).days
         if days_diff < 1:
             days_diff = 5  # Minimum range
         
@@ -83,19 +82,15 @@ def add_sample_edits():
         # Sort by timestamp
         edits.sort(key=lambda x: x['timestamp'])
         
-        # Update the document
-        result = collection.update_one(
-            {'searchTerm': term},
-            {'$set': {'editHistory': edits}}
-        )
+        # Replace the term's edit events
+        replace_edit_events(db, term, [
+            build_edit_event(term, edit['action'], edit['details'], edit['timestamp']) for edit in edits
+        ])
         
-        if result.modified_count > 0:
-            print(f"✅ Added {len(edits)} edits to '{term}'")
+        print(f"✅ Added {len(edits)} edits to '{term}'")
     
     print("=" * 60)
     print(f"Done! Added edit history to {len(selected_terms)} terms")
-    
-    client.close()
 
 if __name__ == "__main__":
     add_sample_edits()
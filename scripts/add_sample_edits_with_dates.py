@@ -3,7 +3,6 @@ Add sample edit history to terms with specific past dates
 Creates 2-3 edits with dates like N-10, N-4 days ago
 """
 
-from pymongo import MongoClient
 from datetime import datetime, timedelta
 import sys
 import os
@@ -12,14 +11,13 @@ import random
 # Add parent directory to path
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
-from config.database import MONGODB_CONFIG
+from utils.db_connector import get_database
+from utils.edit_events import build_edit_event, replace_edit_events
 
 def add_dated_edits():
     """Add sample edit history with specific past dates"""
     
-    # Connect to MongoDB
-    client = MongoClient(MONGODB_CONFIG['uri'])
-    db = client[MONGODB_CONFIG['database']]
+    db = get_database()
     collection = db['search_term_categories']
     
     print("=" * 70)
@@ -34,7 +32,6 @@ def add_dated_edits():
     
     if not all_terms:
         print("No terms found with model categories")
-        client.close()
         return
     
     # Select random 5 terms to add edit history
@@ -110,23 +107,19 @@ def add_dated_edits():
         # Sort by timestamp
         edits.sort(key=lambda x: x['timestamp'])
         
-        # Update the document
-        result = collection.update_one(
-            {'searchTerm': term},
-            {'$set': {'editHistory': edits}}
-        )
+        # Replace the term's edit events
+        replace_edit_events(db, term, [
+            build_edit_event(term, edit['action'], edit['details'], edit['timestamp']) for edit in edits
+        ])
         
-        if result.modified_count > 0:
-            print(f"✅ Added {len(edits)-1} edits to '{term}'")
-            for edit in edits[1:]:  # Skip creation edit
-                days_ago = (today - edit['timestamp']).days
-                print(f"   {edit['timestamp'].strftime('%Y-%m-%d')} (N-{days_ago}): {edit['action']}")
+        print(f"✅ Added {len(edits)-1} edits to '{term}'")
+        for edit in edits[1:]:  # Skip creation edit
+            days_ago = (today - edit['timestamp']).days
+            print(f"   {edit['timestamp'].strftime('%Y-%m-%d')} (N-{days_ago}): {edit['action']}")
     
     print("=" * 70)
     print(f"Done! Added edit history to {len(terms_to_edit)} terms")
     print("=" * 70)
-    
-    client.close()
 
 if __name__ == "__main__":
     add_dated_edits()
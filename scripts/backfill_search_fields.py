@@ -0,0 +1,57 @@
+"""
+Backfill the search fields on search_term_categories
+
+Sets searchTermNormalized (lowercased, whitespace-collapsed searchTerm, used
+for index-backed prefix matches) and loads (Loads from
+data/non_performing_terms.csv, used to rank search results) on every term.
+See utils/term_search.py.
+
+Repeatable, so it can be rerun after the Loads CSV is refreshed. Runs as a
+batched migration (see utils/migrations.py) and accepts --dry-run,
+--throttle-ms and --batch-size.
+"""
+
+import sys
+import os
+
+from pymongo import UpdateOne
+
+# Add parent directory to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from utils.migrations import Migration, run_migrations
+from utils.term_search import load_term_loads, normalize_term
+
+
+class BackfillSearchFields(Migration):
+    """Write searchTermNormalized and loads for a batch of terms"""
+
+    name = 'backfill_search_fields'
+    collection_name = 'search_term_categories'
+    description = 'Set searchTermNormalized and loads for term search'
+    projection = {'searchTerm': 1, 'searchTermNormalized': 1, 'loads': 1}
+    batch_size = 1000
+    repeatable = True
+
+    def __init__(self):
+        self.loads = load_term_loads()
+
+    def build_ops(self, docs):
+        ops = []
+        for doc in docs:
+            normalized = normalize_term(doc['searchTerm'])
+            loads = self.loads.get(normalized, doc.get('loads', 0))
+            if doc.get('searchTermNormalized') != normalized or doc.get('loads') != loads:
+                ops.append(UpdateOne(
+                    {'_id': doc['_id']},
+                    {'$set': {'searchTermNormalized': normalized, 'loads': loads}}
+                ))
+        return ops
+
+
+if __name__ == "__main__":
+    print("=" * 70)
+    print("Backfilling Search Fields")
+    print("=" * 70)
+
+    run_migrations([BackfillSearchFields()], description='Set searchTermNormalized and loads on all terms')
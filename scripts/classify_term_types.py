@@ -5,12 +5,12 @@ Based on intersection between catalog categories and model-identified categories
 
 import sys
 import os
-from datetime import datetime
 
 # Add parent directory to path
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 from utils.db_connector import get_db_connection
+from utils.ist import now_ist
 
 
 def classify_term_type(term_doc):
@@ -88,7 +88,7 @@ def classify_all_terms():
                 {
                     '$set': {
                         'termType': term_type,
-                        'termTypeClassifiedDate': datetime.utcnow()
+                        'termTypeClassifiedDate': now_ist()
                     }
                 }
             )
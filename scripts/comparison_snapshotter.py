@@ -0,0 +1,179 @@
+"""
+Background refresh of product comparison snapshots
+
+Keeps comparison_snapshots (utils/comparison_snapshots.py) current for the
+terms under active review:
+
+- after edits: polls edit_events for boost and category changes (bulk edits
+  included) and re-snapshots the edited terms
+- nightly: re-snapshots every active review term once per IST day, at or
+  after NIGHTLY_HOUR
+
+Progress (last processed edit event, last nightly run) is kept in
+worker_state, so a restart neither misses edits nor repeats the nightly run.
+Edit event ids are generated by the writing client, so an event can commit
+with an id below the checkpoint (other processes, clock skew). Each poll
+therefore re-reads EVENT_OVERLAP seconds before the checkpoint and skips
+the events it already processed; after a restart the overlap is
+re-snapshotted once, which is harmless.
+
+Usage:
+    python scripts/comparison_snapshotter.py                   # run continuously
+    python scripts/comparison_snapshotter.py --once            # one full refresh, then exit (cron)
+    python scripts/comparison_snapshotter.py --environment production lowerEnv
+"""
+
+import sys
+import os
+import time
+import argparse
+from datetime import timedelta
+
+from bson import ObjectId
+from pymongo import ASCENDING
+from pymongo.errors import PyMongoError
+
+# Add parent directory to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from utils.db_connector import MongoDBConnector
+from utils.ist import now_ist
+from utils.comparison_snapshots import (
+    SNAPSHOT_TERM_PROJECTION, TERMS_COLLECTION, active_review_terms, ensure_snapshot_indexes, refresh_snapshots
+)
+from utils.edit_events import EDIT_EVENTS_COLLECTION
+from utils.rate_limiter import RateLimiter
+
+WORKER_NAME = 'comparison_snapshotter'
+STATE_COLLECTION = 'worker_state'
+
+# Edit actions that change what the AI side of a comparison returns
+SNAPSHOT_ACTIONS = ('boost_update', 'category_added', 'category_removed', 'created')
+# Seconds between edit_events polls
+POLL_INTERVAL = 30
+# Seconds before the checkpoint re-read on every poll (late commits, clock skew)
+EVENT_OVERLAP = 120
+# IST hour from which the nightly refresh runs
+NIGHTLY_HOUR = 2
+
+def load_state(state_collection):
+    return state_collection.find_one({'_id': WORKER_NAME}) or {}
+
+
+def save_state(state_collection, **fields):
+    state_collection.update_one(
+        {'_id': WORKER_NAME},
+        {'$set': {**fields, 'updatedDate': now_ist()}},
+        upsert=True
+    )
+
+
+def refresh(db, term_docs, environments, limiter, label):
+    for environment in environments:
+        refreshed, failures = refresh_snapshots(db, term_docs, environment, now_ist(), limiter)
+        print(f"  {label} [{environment}]: {refreshed} snapshot(s) refreshed, {len(failures)} failed")
+        for term, message in failures[:5]:
+            print(f"    ✗ {term}: {message}")
+
+
+def refresh_edited(db, state_collection, last_event_id, seen, environments, limiter):
+    """
+    Re-snapshot terms with new edit events; returns the new checkpoint
+
+    Reads events from EVENT_OVERLAP seconds before last_event_id and skips
+    the ids in seen (events processed by earlier polls), which it updates.
+    """
+    query = {'action': {'$in': list(SNAPSHOT_ACTIONS)}}
+    if last_event_id is not None:
+        since = last_event_id.generation_time - timedelta(seconds=EVENT_OVERLAP)
+        query['_id'] = {'$gt': ObjectId.from_datetime(since)}
+    events = [
+        event for event in db[EDIT_EVENTS_COLLECTION].find(query, {'searchTerm': 1}).sort('_id', ASCENDING)
+        if event['_id'] not in seen
+    ]
+    if not events:
+        return last_event_id
+
+    terms = list({event['searchTerm'] for event in events})
+    term_docs = list(db[TERMS_COLLECTION].find(
+        {'searchTerm': {'$in': terms}, 'status': 'in_progress'}, SNAPSHOT_TERM_PROJECTION
+    ))
+    if term_docs:
+        refresh(db, term_docs, environments, limiter, f"{len(term_docs)} edited term(s)")
+
+    seen.update(event['_id'] for event in events)
+    last_event_id = max(events[-1]['_id'], last_event_id or events[-1]['_id'])
+    save_state(state_collection, lastEventId=last_event_id)
+    # Ids older than the next poll's window are never read again (1 s margin for whole-second ids)
+    cutoff = last_event_id.generation_time - timedelta(seconds=EVENT_OVERLAP + 1)
+    seen.difference_update([event_id for event_id in seen if event_id.generation_time < cutoff])
+    return last_event_id
+
+
+def run_nightly(db, state_collection, environments, limiter):
+    term_docs = active_review_terms(db, now_ist())
+    refresh(db, term_docs, environments, limiter, f"Nightly ({len(term_docs)} active term(s))")
+    save_state(state_collection, lastNightlyDate=now_ist().strftime('%Y-%m-%d'))
+
+
+def run_worker(connector, environments, limiter, once=False):
+    db = connector.db
+    state_collection = connector.get_collection(STATE_COLLECTION)
+    ensure_snapshot_indexes(db)
+
+    if once:
+        run_nightly(db, state_collection, environments, limiter)
+        return
+
+    state = load_state(state_collection)
+    last_event_id = state.get('lastEventId')
+    if last_event_id is None:
+        # First start: only edits from now on; the nightly run covers the rest
+        latest = db[EDIT_EVENTS_COLLECTION].find_one({}, {'_id': 1}, sort=[('_id', -1)])
+        last_event_id = latest['_id'] if latest else None
+        save_state(state_collection, lastEventId=last_event_id)
+
+    seen = set()
+    while True:
+        last_event_id = refresh_edited(db, state_collection, last_event_id, seen, environments, limiter)
+
+        now = now_ist()
+        today = now.strftime('%Y-%m-%d')
+        if now.hour >= NIGHTLY_HOUR and load_state(state_collection).get('lastNightlyDate') != today:
+            run_nightly(db, state_collection, environments, limiter)
+
+        time.sleep(POLL_INTERVAL)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Refresh product comparison snapshots')
+    parser.add_argument('--environment', nargs='+', choices=['production', 'lowerEnv'], default=['production'])
+    parser.add_argument('--rps', type=float, default=5, help='Search API requests per second')
+    parser.add_argument('--once', action='store_true', help='Refresh all active review terms once and exit')
+    args = parser.parse_args()
+
+    print("=" * 70)
+    print("Comparison Snapshotter")
+    print("=" * 70)
+
+    connector = MongoDBConnector()
+    limiter = RateLimiter(args.rps)
+
+    while True:
+        if not connector.connect():
+            return
+        try:
+            run_worker(connector, args.environment, limiter, args.once)
+            break
+        except KeyboardInterrupt:
+            print("\nStopping snapshotter")
+            break
+        except PyMongoError as e:
+            print(f"✗ MongoDB error: {e}. Retrying in 5s...")
+            time.sleep(5)
+        finally:
+            connector.disconnect()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,107 +1,112 @@
 """
 Convert all UTC dates to IST in the database
-- search_term_categories: createdDate, updatedDate, editHistory timestamps
-- search_term_trends: timestamps (date strings)
+- search_term_categories: createdDate, updatedDate, termTypeClassifiedDate, editHistory timestamps
+- search_term_trends: lastUpdated (timestamps are date strings and stay as they are)
+
+Runs as resumable batched migrations. Converted documents are marked with
+datesConvertedToIst, and only documents inserted before the first run are
+converted (later ones are written in IST already), so rerunning, even with
+--force, never shifts a document twice.
+
+If the database was already converted by an earlier version of this script,
+record that without touching any documents:
+    python scripts/convert_dates_to_ist.py --mark-completed
 """
 
-from pymongo import MongoClient
-from datetime import datetime, timedelta
 import sys
 import os
 
 # Add parent directory to path
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
-from config.database import MONGODB_CONFIG
+from utils.ist import IST_OFFSET
+from utils.migrations import Migration, run_migrations
+
+IST_OFFSET_MS = int(IST_OFFSET.total_seconds() * 1000)
+
+CONVERTED_MARKER = 'datesConvertedToIst'
+
 
-IST_OFFSET = timedelta(hours=5, minutes=30)
+def shift_to_ist(expr):
+    """Aggregation expression adding the IST offset to a date (non-dates are left as is)"""
+    return {
+        '$cond': [
+            {'$eq': [{'$type': expr}, 'date']},
+            {'$add': [expr, IST_OFFSET_MS]},
+            expr
+        ]
+    }
 
-def utc_to_ist(utc_dt):
-    """Convert UTC datetime to IST"""
-    if utc_dt is None:
-        return None
-    return utc_dt + IST_OFFSET
 
-def convert_categories_to_ist():
+class ConvertCategoriesToIst(Migration):
     """Convert dates in search_term_categories to IST"""
-    client = MongoClient(MONGODB_CONFIG['uri'])
-    db = client[MONGODB_CONFIG['database']]
-    collection = db['search_term_categories']
-    
-    print("Converting search_term_categories to IST...")
-    
-    count = 0
-    for doc in collection.find({}):
-        updates = {}
-        
-        # Convert createdDate
-        if 'createdDate' in doc and doc['createdDate']:
-            updates['createdDate'] = utc_to_ist(doc['createdDate'])
-        
-        # Convert updatedDate
-        if 'updatedDate' in doc and doc['updatedDate']:
-            updates['updatedDate'] = utc_to_ist(doc['updatedDate'])
-        
-        # Convert editHistory timestamps
-        if 'editHistory' in doc and doc['editHistory']:
-            new_history = []
-            for edit in doc['editHistory']:
-                if 'timestamp' in edit and edit['timestamp']:
-                    edit['timestamp'] = utc_to_ist(edit['timestamp'])
-                new_history.append(edit)
-            updates['editHistory'] = new_history
-        
-        # Convert termTypeClassifiedDate
-        if 'termTypeClassifiedDate' in doc and doc['termTypeClassifiedDate']:
-            updates['termTypeClassifiedDate'] = utc_to_ist(doc['termTypeClassifiedDate'])
-        
-        if updates:
-            collection.update_one({'_id': doc['_id']}, {'$set': updates})
-            count += 1
-    
-    print(f"✅ Updated {count} documents in search_term_categories")
-    client.close()
-
-def convert_trends_to_ist():
-    """Convert date strings in search_term_trends to IST"""
-    client = MongoClient(MONGODB_CONFIG['uri'])
-    db = client[MONGODB_CONFIG['database']]
-    collection = db['search_term_trends']
-    
-    print("Converting search_term_trends timestamps to IST...")
-    
-    count = 0
-    for doc in collection.find({}):
-        updates = {}
-        
-        # Convert timestamp strings (YYYY-MM-DD format remains same in IST)
-        # Since timestamps are date strings only, we keep them as is
-        # Only convert lastUpdated datetime
-        if 'lastUpdated' in doc and doc['lastUpdated']:
-            updates['lastUpdated'] = utc_to_ist(doc['lastUpdated'])
-        
-        if updates:
-            collection.update_one({'_id': doc['_id']}, {'$set': updates})
-            count += 1
-    
-    print(f"✅ Updated {count} documents in search_term_trends")
-    client.close()
+
+    name = 'convert_categories_dates_to_ist'
+    collection_name = 'search_term_categories'
+    description = 'Shift createdDate, updatedDate, termTypeClassifiedDate and editHistory timestamps from UTC to IST'
+    filter = {CONVERTED_MARKER: {'$ne': True}}
+    existing_documents_only = True
+
+    def pipeline(self):
+        return [{
+            '$set': {
+                'createdDate': shift_to_ist('$createdDate'),
+                'updatedDate': shift_to_ist('$updatedDate'),
+                'termTypeClassifiedDate': shift_to_ist('$termTypeClassifiedDate'),
+                'editHistory': {
+                    '$cond': [
+                        {'$isArray': '$editHistory'},
+                        {
+                            '$map': {
+                                'input': '$editHistory',
+                                'as': 'edit',
+                                'in': {'$mergeObjects': [
+                                    '$$edit',
+                                    {'timestamp': shift_to_ist('$$edit.timestamp')}
+                                ]}
+                            }
+                        },
+                        '$editHistory'
+                    ]
+                },
+                CONVERTED_MARKER: True
+            }
+        }]
+
+
+class ConvertTrendsToIst(Migration):
+    """Convert lastUpdated in search_term_trends to IST"""
+
+    name = 'convert_trends_dates_to_ist'
+    collection_name = 'search_term_trends'
+    description = 'Shift lastUpdated from UTC to IST'
+    filter = {CONVERTED_MARKER: {'$ne': True}}
+    existing_documents_only = True
+
+    def pipeline(self):
+        return [{
+            '$set': {
+                'lastUpdated': shift_to_ist('$lastUpdated'),
+                CONVERTED_MARKER: True
+            }
+        }]
+
 
 def main():
     print("=" * 70)
     print("Converting All Dates from UTC to IST")
     print("=" * 70)
     print()
-    
-    convert_categories_to_ist()
-    print()
-    convert_trends_to_ist()
-    
-    print()
-    print("=" * 70)
-    print("✅ All dates converted to IST successfully!")
-    print("=" * 70)
+
+    if run_migrations(
+        [ConvertCategoriesToIst(), ConvertTrendsToIst()],
+        description='Convert stored UTC dates to IST'
+    ):
+        print()
+        print("=" * 70)
+        print("✅ Date conversion finished")
+        print("=" * 70)
+
 
 if __name__ == "__main__":
     main()
-
@@ -6,7 +6,6 @@ Create realistic demo data for selected terms
 - Generate CTR trends showing improvement/underperforming/neutral
 """
 
-from pymongo import MongoClient
 from datetime import datetime, timezone, timedelta
 import sys
 import os
@@ -15,28 +14,23 @@ import random
 # Add parent directory to path
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
-from config.database import MONGODB_CONFIG
+from utils.db_connector import get_database
+from utils.edit_events import EDIT_EVENTS_COLLECTION, build_edit_event, replace_edit_events
+from utils.trend_store import replace_series, refresh_trend_stats
 
 
 def clean_all_edits():
-    """Remove edit history from all terms"""
-    client = MongoClient(MONGODB_CONFIG['uri'])
-    db = client[MONGODB_CONFIG['database']]
-    collection = db['search_term_categories']
+    """Remove all edit events"""
+    db = get_database()
     
-    result = collection.update_many(
-        {},
-        {'$set': {'editHistory': []}}
-    )
+    result = db[EDIT_EVENTS_COLLECTION].delete_many({})
     
-    print(f"✅ Cleaned edit history from {result.modified_count} terms")
-    client.close()
+    print(f"✅ Cleaned {result.deleted_count} edit events")
 
 
 def select_demo_terms():
     """Select 12 diverse terms for demo (4 improvement, 4 underperforming, 4 neutral)"""
-    client = MongoClient(MONGODB_CONFIG['uri'])
-    db = client[MONGODB_CONFIG['database']]
+    db = get_database()
     collection = db['search_term_categories']
     
     # Get all terms with model categories
@@ -50,7 +44,6 @@ def select_demo_terms():
     
     # Select 12 diverse terms
     selected = random.sample(all_terms, min(12, len(all_terms)))
-    client.close()
     
     return [term['searchTerm'] for term in selected]
 
@@ -103,8 +96,7 @@ def create_demo_data(demo_terms):
     - D-3: Added category with boost N
     - D-1: Boost changed for any category
     """
-    client = MongoClient(MONGODB_CONFIG['uri'])
-    db = client[MONGODB_CONFIG['database']]
+    db = get_database()
     collection = db['search_term_categories']
     trends_collection = db['search_term_trends']
     
@@ -189,11 +181,13 @@ def create_demo_data(demo_terms):
         })
         
         # Update edit history
+        replace_edit_events(db, term, [
+            build_edit_event(term, edit['action'], edit['details'], edit['timestamp']) for edit in edits
+        ])
         collection.update_one(
             {'searchTerm': term},
             {
                 '$set': {
-                    'editHistory': edits,
                     'createdDate': d_minus_5,
                     'updatedDate': d_minus_1
                 }
@@ -211,21 +205,20 @@ def create_demo_data(demo_terms):
         # Use the intended trend type (don't recalculate)
         calculated_trend = trend_type
         
-        # Update trends
+        # Update trends summary and replace the daily points
         trends_collection.update_one(
             {'searchTerm': term},
             {
                 '$set': {
                     'searchTerm': term,
-                    'ctr': ctr_values,
-                    'cvr': cvr_values,
-                    'timestamps': timestamps,
                     'trendType': calculated_trend,
                     'lastUpdated': today
                 }
             },
             upsert=True
         )
+        replace_series(db, term, timestamps, ctr_values, cvr_values)
+        refresh_trend_stats(db, term, recalculate_type=False)
         
         print(f"✅ {term} ({trend_type}) - CTR: {ctr_values[0]:.3f} → {ctr_values[-1]:.3f}")
     
@@ -233,8 +226,6 @@ def create_demo_data(demo_terms):
     print("✅ DEMO DATA CREATED SUCCESSFULLY")
     print("=" * 70)
     
-    client.close()
-    
     return {
         'improvement': improvement_terms,
         'underperforming': underperforming_terms,
@@ -0,0 +1,100 @@
+"""
+Create the MongoDB indexes the UI and scripts rely on
+
+Safe to rerun: create_index is a no-op when the index already exists.
+"""
+
+import sys
+import os
+
+from pymongo import ASCENDING, DESCENDING
+
+# Add parent directory to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from utils.db_connector import get_database
+from utils.comparison_snapshots import ensure_snapshot_indexes
+from utils.edit_events import ensure_edit_event_indexes
+from utils.trend_store import ensure_trend_indexes
+
+# Replaced by the same keys with a trailing _id for keyset pagination, or
+# backing an order the term table no longer offers (AI-side purity)
+SUPERSEDED_TERM_INDEXES = (
+    'status_updatedDate', 'trendStatus_updatedDate', 'status_trendStatus_updatedDate',
+    'relevanceScores_aiPurity_id', 'status_relevanceScores_aiPurity_id',
+)
+
+
+def ensure_term_indexes(db):
+    """Indexes on search_term_categories"""
+    collection = db['search_term_categories']
+    existing = collection.index_information()
+    for name in SUPERSEDED_TERM_INDEXES:
+        if name in existing:
+            collection.drop_index(name)
+
+    collection.create_index([('searchTerm', ASCENDING)], unique=True, name='searchTerm_unique')
+    # Prefix matches on the lowercased term (utils/term_search.py)
+    collection.create_index([('searchTermNormalized', ASCENDING)], name='searchTermNormalized')
+    # Keyset pagination sorts on (updatedDate, _id) (utils/term_queries.py)
+    collection.create_index(
+        [('updatedDate', DESCENDING), ('_id', DESCENDING)],
+        name='updatedDate_id'
+    )
+    collection.create_index(
+        [('status', ASCENDING), ('updatedDate', DESCENDING), ('_id', DESCENDING)],
+        name='status_updatedDate_id'
+    )
+    # Materialized trend fields (scripts/materialize_trend_stats.py), used by the trend filter
+    collection.create_index(
+        [('trendStatus', ASCENDING), ('updatedDate', DESCENDING), ('_id', DESCENDING)],
+        name='trendStatus_updatedDate_id'
+    )
+    collection.create_index(
+        [('status', ASCENDING), ('trendStatus', ASCENDING), ('updatedDate', DESCENDING), ('_id', DESCENDING)],
+        name='status_trendStatus_updatedDate_id'
+    )
+    # "Most Searched" order of the term table
+    collection.create_index([('loads', DESCENDING), ('_id', DESCENDING)], name='loads_id')
+    collection.create_index(
+        [('status', ASCENDING), ('loads', DESCENDING), ('_id', DESCENDING)],
+        name='status_loads_id'
+    )
+    # Relevance score orders of the term table (utils/relevance.py)
+    for field in ('rbo', 'purity'):
+        collection.create_index(
+            [(f'relevanceScores.{field}', ASCENDING), ('_id', ASCENDING)],
+            name=f'relevanceScores_{field}_id'
+        )
+        collection.create_index(
+            [('status', ASCENDING), (f'relevanceScores.{field}', ASCENDING), ('_id', ASCENDING)],
+            name=f'status_relevanceScores_{field}_id'
+        )
+
+
+def create_indexes():
+    """Create all indexes"""
+    db = get_database()
+
+    print("=" * 60)
+    print("Creating MongoDB Indexes")
+    print("=" * 60)
+
+    ensure_term_indexes(db)
+    print("✓ search_term_categories")
+
+    ensure_trend_indexes(db)
+    print("✓ search_term_trends / search_term_trend_buckets")
+
+    ensure_edit_event_indexes(db)
+    print("✓ edit_events")
+
+    ensure_snapshot_indexes(db)
+    print("✓ comparison_snapshots")
+
+    print("=" * 60)
+    print("Done!")
+
+
+if __name__ == "__main__":
+    create_indexes()
@@ -0,0 +1,103 @@
+"""
+Batch control-vs-AI relevance evaluation
+
+Fetches the control and AI results of every selected term (see
+utils/relevance.py), computes Jaccard, rank-biased overlap and category
+purity, and stores them on the term as relevanceScores. The term table can
+then sort by them.
+
+Runs against lowerEnv, or against recorded responses replayed by
+scripts/recorded_search_server.py (--environment recorded), never against
+production. Requests are rate limited across all workers; at the default
+50 requests/s (three per term) a few thousand terms take a few minutes.
+
+Usage:
+    python scripts/evaluate_relevance.py                       # all in-progress terms
+    python scripts/evaluate_relevance.py --status all --trend underperforming
+    python scripts/evaluate_relevance.py --term "sepatu lari" --term adidas --dry-run
+    python scripts/evaluate_relevance.py --environment recorded --limit 100
+"""
+
+import sys
+import os
+import time
+import argparse
+
+# Add parent directory to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from utils.db_connector import MongoDBConnector
+from utils.ist import now_ist
+from utils.rate_limiter import RateLimiter
+from utils.relevance import EVALUATION_PROJECTION, TERMS_COLLECTION, evaluate_terms
+from utils.term_queries import build_term_filter
+
+def main():
+    parser = argparse.ArgumentParser(description='Score control vs AI search results of many terms')
+    parser.add_argument('--environment', choices=['lowerEnv', 'recorded'], default='lowerEnv')
+    parser.add_argument('--term', action='append', help='Evaluate only this term (repeatable)')
+    parser.add_argument('--status', choices=['in_progress', 'locked', 'all'], default='in_progress')
+    parser.add_argument('--trend', choices=['all', 'improvement', 'underperforming', 'neutral'], default='all')
+    parser.add_argument('--limit', type=int, default=40, help='Products compared per side')
+    parser.add_argument('--workers', type=int, default=16, help='Concurrent search requests')
+    parser.add_argument('--rps', type=float, default=50, help='Search API requests per second')
+    parser.add_argument('--dry-run', action='store_true', help='Print scores without storing them')
+    args = parser.parse_args()
+
+    print("=" * 70)
+    print(f"Relevance Evaluation ({args.environment})")
+    print("=" * 70)
+
+    connector = MongoDBConnector()
+    if not connector.connect():
+        return
+
+    try:
+        if args.term:
+            filter_query = {'searchTerm': {'$in': args.term}}
+        else:
+            filter_query = build_term_filter(None, None if args.status == 'all' else args.status, args.trend)
+        collection = connector.get_collection(TERMS_COLLECTION)
+        total = collection.count_documents(filter_query)
+        print(f"Terms selected: {total}")
+
+        started = time.monotonic()
+        done = [0]
+
+        def report(term, scores, error):
+            done[0] += 1
+            if error:
+                print(f"  ✗ {term}: {error}")
+            elif args.dry_run or args.term:
+                print(f"  {term}: " + ", ".join(
+                    f"{name}={'—' if scores[name] is None else round(scores[name], 3)}"
+                    for name in ('jaccard', 'rbo', 'purity')
+                ))
+            if done[0] % 500 == 0:
+                elapsed = time.monotonic() - started
+                print(f"  ... {done[0]}/{total} terms ({done[0] / elapsed:.1f} terms/s)")
+
+        cursor = collection.find(filter_query, EVALUATION_PROJECTION).batch_size(1000)
+        counts = evaluate_terms(
+            connector.db,
+            cursor,
+            environment=args.environment,
+            limit=args.limit,
+            workers=args.workers,
+            limiter=RateLimiter(args.rps),
+            now=now_ist(),
+            dry_run=args.dry_run,
+            on_result=report
+        )
+
+        elapsed = time.monotonic() - started
+        print(f"\n✓ Evaluated {counts['evaluated']} terms in {elapsed:.0f}s "
+              f"({counts['failed']} failed, {counts['skipped']} without active AI categories)")
+        if args.dry_run:
+            print("  Dry run: nothing was stored")
+    finally:
+        connector.disconnect()
+
+
+if __name__ == "__main__":
+    main()
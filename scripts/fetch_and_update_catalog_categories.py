@@ -6,13 +6,12 @@ import sys
 import os
 import time
 import requests
-from datetime import datetime
 
 # Add parent directory to path
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
-from config.database import MONGODB_CONFIG
-from pymongo import MongoClient
+from utils.db_connector import get_database
+from utils.ist import now_ist
 
 # Import headers and cookies from scrapper
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'scrapper')))
@@ -67,9 +66,7 @@ def fetch_catalog_categories_for_term(search_term):
 def update_all_catalog_categories():
     """Fetch and update catalog categories for all terms"""
     
-    # Connect to MongoDB
-    client = MongoClient(MONGODB_CONFIG['uri'])
-    db = client[MONGODB_CONFIG['database']]
+    db = get_database()
     collection = db['search_term_categories']
     
     # Get all terms that don't have catalog categories or have empty ones
@@ -108,7 +105,7 @@ def update_all_catalog_categories():
                 {
                     '$set': {
                         'catalogCategories': catalog_categories,
-                        'updatedDate': datetime.utcnow()
+                        'updatedDate': now_ist()
                     }
                 }
             )
@@ -128,8 +125,6 @@ def update_all_catalog_categories():
     print(f"✅ Successfully updated: {success_count}")
     print(f"❌ Errors: {error_count}")
     print("=" * 70)
-    
-    client.close()
 
 
 if __name__ == "__main__":
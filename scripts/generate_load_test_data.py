@@ -0,0 +1,225 @@
+"""
+Generate synthetic search terms and CTR/CVR trends for load testing
+
+Builds matching search_term_categories, search_term_trends,
+search_term_trend_buckets and edit_events documents for any number of
+synthetic terms with a fixed seed, vectorized with NumPy, and bulk-loads them
+in batches. Every generated document carries synthetic: True so the data set
+can be removed again with --cleanup.
+
+Example:
+    python scripts/generate_load_test_data.py --terms 1000000 --days 30 --seed 42
+"""
+
+import sys
+import os
+import time
+import argparse
+from datetime import timedelta
+
+import numpy as np
+import pandas as pd
+
+# Add parent directory to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from utils.db_connector import get_db_connection
+from utils.ist import now_ist
+from utils.trend_generator import (
+    TREND_TYPES, pick_trend_types, generate_trend_matrix, classify_trend_matrix, upward_streak_matrix
+)
+from utils.edit_events import EDIT_EVENTS_COLLECTION
+from utils.trend_store import TREND_BUCKETS_COLLECTION, month_of
+
+C3_CATEGORIES_FILE = os.path.join(os.path.dirname(__file__), '..', 'data', 'c3_categories.csv')
+
+CATALOG_PER_TERM = 5
+MODEL_PER_TERM = 3
+# Share of terms whose top model category also appears in the catalog (boostingConfiguration)
+OVERLAP_RATE = 0.6
+LOCKED_RATE = 0.1
+
+
+def load_taxonomy():
+    """Return (codes, names) arrays from c3_categories.csv"""
+    df = pd.read_csv(C3_CATEGORIES_FILE).dropna(subset=['C3Code', 'C3Name'])
+    return df['C3Code'].to_numpy(dtype=object), df['C3Name'].to_numpy(dtype=object)
+
+
+def generate_chunk(rng, start_idx, size, num_days, codes, names, prefix, now):
+    """
+    Generate one chunk of term and trend documents
+
+    All random draws for the chunk are vectorized; only the final dict
+    assembly iterates per term.
+    """
+    num_codes = len(codes)
+    catalog_idx = rng.integers(0, num_codes, size=(size, CATALOG_PER_TERM))
+    model_idx = rng.integers(0, num_codes, size=(size, MODEL_PER_TERM))
+    overlap = rng.random(size) < OVERLAP_RATE
+    model_idx[overlap, 0] = catalog_idx[overlap, 0]
+    model_scores = np.sort(rng.integers(31, 100, size=(size, MODEL_PER_TERM)), axis=1)[:, ::-1]
+
+    is_boosting = (model_idx[:, :, None] == catalog_idx[:, None, :]).any(axis=(1, 2))
+    is_locked = rng.random(size) < LOCKED_RATE
+    loads = rng.lognormal(6, 1.5, size=size).round()
+    created_days_ago = rng.integers(num_days, num_days + 30, size=size)
+    updated_days_ago = rng.integers(0, num_days, size=size)
+
+    ctr, cvr = generate_trend_matrix(rng, pick_trend_types(rng, size), num_days)
+    trend_labels, pct_change = classify_trend_matrix(ctr)
+    upward_days = upward_streak_matrix(ctr)
+
+    timestamps = [(now - timedelta(days=num_days - 1 - i)).strftime('%Y-%m-%d') for i in range(num_days)]
+    # Day index ranges per month bucket, shared by every term in the chunk
+    month_slices = []
+    for day_idx, date_str in enumerate(timestamps):
+        if not month_slices or month_slices[-1][0] != month_of(date_str):
+            month_slices.append([month_of(date_str), day_idx, day_idx + 1])
+        else:
+            month_slices[-1][2] = day_idx + 1
+    ctr_lists = ctr.tolist()
+    cvr_lists = cvr.tolist()
+
+    term_docs = []
+    trend_docs = []
+    bucket_docs = []
+    event_docs = []
+    for i in range(size):
+        term = f"{prefix} {start_idx + i:07d}"
+        created = now - timedelta(days=int(created_days_ago[i]))
+        term_docs.append({
+            'searchTerm': term,
+            'searchTermNormalized': term,
+            'loads': float(loads[i]),
+            'catalogCategories': [
+                {'code': codes[c], 'name': names[c]} for c in catalog_idx[i]
+            ],
+            'modelIdentifiedCategories': [
+                {'code': codes[c], 'name': names[c], 'score': int(s), 'boostValue': 100}
+                for c, s in zip(model_idx[i], model_scores[i])
+            ],
+            'termType': 'boostingConfiguration' if is_boosting[i] else 'filterConfiguration',
+            'termTypeClassifiedDate': created,
+            'status': 'locked' if is_locked[i] else 'in_progress',
+            'trendStatus': trend_labels[i],
+            'pctChange5d': float(pct_change[i]),
+            'upwardDays': int(upward_days[i]),
+            'latestCtr': ctr_lists[i][-1],
+            'latestCvr': cvr_lists[i][-1],
+            'trendStatsUpdatedDate': now,
+            'createdDate': created,
+            'updatedDate': now - timedelta(days=int(updated_days_ago[i])),
+            'synthetic': True
+        })
+        event_docs.append({
+            'searchTerm': term,
+            'timestamp': created,
+            'action': 'created',
+            'details': 'Synthetic load-test entry',
+            'synthetic': True
+        })
+        trend_docs.append({
+            'searchTerm': term,
+            'trendType': trend_labels[i],
+            'lastUpdated': now,
+            'synthetic': True
+        })
+        for month, start, end in month_slices:
+            bucket_docs.append({
+                'searchTerm': term,
+                'month': month,
+                'points': [
+                    {'date': timestamps[d], 'ctr': ctr_lists[i][d], 'cvr': cvr_lists[i][d]}
+                    for d in range(start, end)
+                ],
+                'count': end - start,
+                'firstDate': timestamps[start],
+                'lastDate': timestamps[end - 1],
+                'synthetic': True
+            })
+
+    return term_docs, trend_docs, bucket_docs, event_docs
+
+
+def generate_load_test_data(num_terms, num_days=30, seed=42, batch_size=10000, prefix='loadtest'):
+    """Generate and bulk-load num_terms synthetic terms with their trends"""
+    connector = get_db_connection()
+    if not connector:
+        print("✗ Failed to connect to MongoDB")
+        return False
+
+    try:
+        terms_collection = connector.get_collection('search_term_categories')
+        trends_collection = connector.get_collection('search_term_trends')
+        buckets_collection = connector.get_collection(TREND_BUCKETS_COLLECTION)
+        events_collection = connector.get_collection(EDIT_EVENTS_COLLECTION)
+
+        codes, names = load_taxonomy()
+        rng = np.random.default_rng(seed)
+        now = now_ist().replace(microsecond=0)
+
+        print("=" * 70)
+        print("Generating Load-Test Data")
+        print("=" * 70)
+        print(f"  Terms: {num_terms:,} | Days: {num_days} | Seed: {seed} | Batch: {batch_size:,}")
+        print(f"  Trend types: {', '.join(TREND_TYPES)}")
+
+        started = time.perf_counter()
+        inserted = 0
+        for start_idx in range(0, num_terms, batch_size):
+            size = min(batch_size, num_terms - start_idx)
+            term_docs, trend_docs, bucket_docs, event_docs = generate_chunk(rng, start_idx, size, num_days, codes, names, prefix, now)
+
+            terms_collection.insert_many(term_docs, ordered=False)
+            trends_collection.insert_many(trend_docs, ordered=False)
+            buckets_collection.insert_many(bucket_docs, ordered=False)
+            events_collection.insert_many(event_docs, ordered=False)
+            inserted += size
+
+            elapsed = time.perf_counter() - started
+            print(f"  Progress: {inserted:,}/{num_terms:,} terms ({inserted / elapsed:,.0f} terms/s)")
+
+        print(f"\n✓ Loaded {inserted:,} terms in {time.perf_counter() - started:.1f}s")
+        return True
+
+    except Exception as e:
+        print(f"✗ Error generating load-test data: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+    finally:
+        connector.disconnect()
+
+
+def cleanup_load_test_data():
+    """Remove all synthetic documents"""
+    connector = get_db_connection()
+    if not connector:
+        print("✗ Failed to connect to MongoDB")
+        return
+
+    try:
+        for name in ('search_term_categories', 'search_term_trends', TREND_BUCKETS_COLLECTION, EDIT_EVENTS_COLLECTION):
+            result = connector.get_collection(name).delete_many({'synthetic': True})
+            print(f"✓ Deleted {result.deleted_count:,} synthetic documents from {name}")
+    finally:
+        connector.disconnect()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Generate synthetic load-test data')
+    parser.add_argument('--terms', type=int, default=100000, help='Number of synthetic terms')
+    parser.add_argument('--days', type=int, default=30, help='Daily trend points per term')
+    parser.add_argument('--seed', type=int, default=42, help='Random seed')
+    parser.add_argument('--batch-size', type=int, default=10000, help='Documents per insert batch')
+    parser.add_argument('--prefix', type=str, default='loadtest', help='Search term prefix')
+    parser.add_argument('--cleanup', action='store_true', help='Delete previously generated data')
+
+    args = parser.parse_args()
+
+    if args.cleanup:
+        cleanup_load_test_data()
+    else:
+        generate_load_test_data(args.terms, args.days, args.seed, args.batch_size, args.prefix)
@@ -7,12 +7,14 @@ import csv
 import sys
 import os
 from collections import defaultdict
-from datetime import datetime
 
 # Add parent directory to path
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 from utils.db_connector import get_db_connection
+from utils.ist import now_ist
+from utils.term_search import load_term_loads, normalize_term
+from utils.trend_store import INITIAL_TREND_STATS
 
 
 def read_catalog_categories(csv_file):
@@ -74,7 +76,8 @@ def create_combined_documents(catalog_data, model_data):
     Combine catalog and model data into MongoDB documents
     """
     documents = []
-    current_time = datetime.utcnow()
+    current_time = now_ist()
+    term_loads = load_term_loads()
     
     # Get all unique terms
     all_terms = set(catalog_data.keys()) | set(model_data.keys())
@@ -82,8 +85,11 @@ def create_combined_documents(catalog_data, model_data):
     for term in all_terms:
         doc = {
             'searchTerm': term,
+            'searchTermNormalized': normalize_term(term),
+            'loads': term_loads.get(normalize_term(term), 0),
             'catalogCategories': catalog_data.get(term, []),
             'modelIdentifiedCategories': model_data.get(term, []),
+            **INITIAL_TREND_STATS,
             'createdDate': current_time,
             'updatedDate': current_time
         }
@@ -0,0 +1,89 @@
+"""
+Materialize trend statistics onto search_term_categories
+
+Computes trendStatus, pctChange5d, upwardDays, latestCtr and latestCvr for
+every term from its newest trend buckets and stores them on the term
+document, so the term list renders without per-row trend queries.
+
+By default trendStatus copies the trendType label from search_term_trends
+(the same label the UI has always shown); --recalculate derives it from the
+data instead and updates the summary too.
+
+Runs as a repeatable batched migration (see utils/migrations.py), so it
+accepts --dry-run, --throttle-ms and --batch-size.
+"""
+
+import sys
+import os
+from pymongo import UpdateOne
+
+# Add parent directory to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from utils.ist import now_ist
+from utils.migrations import Migration, run_migrations
+from utils.trend_store import (
+    TRENDS_COLLECTION, classify_pct_change, compute_trend_stats,
+    get_recent_series_many, trend_stats_update
+)
+
+
+class MaterializeTrendStats(Migration):
+    """Recompute materialized trend fields for a batch of terms"""
+
+    name = 'materialize_trend_stats'
+    collection_name = 'search_term_categories'
+    description = 'Denormalize trend status and percent change onto term documents'
+    projection = {'searchTerm': 1}
+    repeatable = True
+
+    def __init__(self, recalculate=False):
+        self.recalculate = recalculate
+
+    def build_ops(self, docs):
+        terms = [doc['searchTerm'] for doc in docs]
+        series_by_term = get_recent_series_many(self.db, terms)
+
+        labels = {}
+        if not self.recalculate:
+            for summary in self.db[TRENDS_COLLECTION].find({'searchTerm': {'$in': terms}}, {'searchTerm': 1, 'trendType': 1}):
+                labels[summary['searchTerm']] = summary.get('trendType', 'neutral')
+
+        now = now_ist()
+        term_ops = []
+        summary_ops = []
+        for doc in docs:
+            term = doc['searchTerm']
+            series = series_by_term.get(term, {'ctr': [], 'cvr': []})
+            stats = compute_trend_stats(series['ctr'], series['cvr'])
+
+            if self.recalculate:
+                trend_type = classify_pct_change(stats['pctChange5d'])
+                summary_ops.append(UpdateOne(
+                    {'searchTerm': term},
+                    {'$set': {'trendType': trend_type, 'lastUpdated': now}},
+                    upsert=True
+                ))
+            else:
+                trend_type = labels.get(term, 'neutral')
+
+            term_ops.append(UpdateOne({'_id': doc['_id']}, {'$set': trend_stats_update(stats, trend_type, now)}))
+
+        if summary_ops:
+            self.db[TRENDS_COLLECTION].bulk_write(summary_ops, ordered=False)
+        return term_ops
+
+
+if __name__ == "__main__":
+    recalculate = '--recalculate' in sys.argv
+    argv = [arg for arg in sys.argv[1:] if arg != '--recalculate']
+
+    print("=" * 70)
+    print("Materializing Trend Statistics")
+    print("=" * 70)
+
+    run_migrations(
+        [MaterializeTrendStats(recalculate=recalculate)],
+        description='Materialize trend statistics onto term documents (add --recalculate to relabel from data)',
+        argv=argv
+    )
@@ -0,0 +1,67 @@
+"""
+Move editHistory arrays from search_term_categories into edit_events
+
+Every element of a term's editHistory becomes one edit_events document
+(see utils/edit_events.py) and the array is removed from the term.
+
+Migrated events carry migrated: True. A batch first deletes the migrated
+events of its terms before inserting them again, so a batch replayed after a
+crash does not duplicate events, and events the UI logged in the meantime
+are left alone.
+"""
+
+import sys
+import os
+
+from pymongo import UpdateOne
+
+# Add parent directory to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from utils.migrations import Migration, run_migrations
+from utils.db_connector import get_database
+from utils.edit_events import (
+    EDIT_EVENTS_COLLECTION, build_edit_event, ensure_edit_event_indexes, log_edit_events
+)
+
+
+class MigrateEditHistory(Migration):
+    """Split editHistory arrays into edit_events documents"""
+
+    name = 'migrate_edit_history'
+    collection_name = 'search_term_categories'
+    description = 'Move editHistory arrays into the edit_events collection'
+    filter = {'editHistory': {'$exists': True}}
+    projection = {'searchTerm': 1, 'editHistory': 1, 'createdDate': 1}
+    batch_size = 200
+
+    def build_ops(self, docs):
+        events = []
+        for doc in docs:
+            for edit in doc.get('editHistory') or []:
+                event = build_edit_event(
+                    doc['searchTerm'],
+                    edit.get('action', 'edit'),
+                    edit.get('details', ''),
+                    edit.get('timestamp') or doc.get('createdDate')
+                )
+                event['migrated'] = True
+                events.append(event)
+
+        self.db[EDIT_EVENTS_COLLECTION].delete_many({
+            'searchTerm': {'$in': [doc['searchTerm'] for doc in docs]},
+            'migrated': True
+        })
+        log_edit_events(self.db, events)
+
+        # Drop the arrays only after their events are written
+        return [UpdateOne({'_id': doc['_id']}, {'$unset': {'editHistory': ''}}) for doc in docs]
+
+
+if __name__ == "__main__":
+    print("=" * 70)
+    print("Migrating Edit History to edit_events")
+    print("=" * 70)
+
+    ensure_edit_event_indexes(get_database())
+    run_migrations([MigrateEditHistory()], description='Move editHistory arrays into edit_events')
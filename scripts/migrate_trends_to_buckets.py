@@ -0,0 +1,68 @@
+"""
+Move CTR/CVR series from search_term_trends into monthly buckets
+
+Each search_term_trends document used to hold the whole history in parallel
+ctr, cvr and timestamps arrays. This migration writes those points into
+search_term_trend_buckets (see utils/trend_store.py) and strips the arrays,
+leaving search_term_trends as the per-term summary (trendType, lastUpdated).
+
+Run it before anything starts appending points to the buckets: a bucket is
+replaced with the source points for its month, which keeps replayed batches
+idempotent.
+"""
+
+import sys
+import os
+
+from pymongo import ReplaceOne, UpdateOne
+
+# Add parent directory to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from utils.migrations import Migration, run_migrations
+from utils.db_connector import get_database
+from utils.trend_store import TREND_BUCKETS_COLLECTION, build_bucket_docs, ensure_trend_indexes
+
+
+class MigrateTrendsToBuckets(Migration):
+    """Split per-term trend arrays into month buckets"""
+
+    name = 'migrate_trends_to_buckets'
+    collection_name = 'search_term_trends'
+    description = 'Move ctr/cvr/timestamps arrays into search_term_trend_buckets'
+    filter = {'timestamps': {'$exists': True}}
+    projection = {'searchTerm': 1, 'ctr': 1, 'cvr': 1, 'timestamps': 1}
+    batch_size = 200
+
+    def build_ops(self, docs):
+        bucket_ops = []
+        for doc in docs:
+            for bucket in build_bucket_docs(
+                doc['searchTerm'],
+                doc.get('timestamps', []),
+                doc.get('ctr', []),
+                doc.get('cvr', [])
+            ):
+                bucket_ops.append(ReplaceOne(
+                    {'searchTerm': bucket['searchTerm'], 'month': bucket['month']},
+                    bucket,
+                    upsert=True
+                ))
+
+        if bucket_ops:
+            self.db[TREND_BUCKETS_COLLECTION].bulk_write(bucket_ops, ordered=False)
+
+        # Strip the arrays only after their buckets are written
+        return [
+            UpdateOne({'_id': doc['_id']}, {'$unset': {'ctr': '', 'cvr': '', 'timestamps': ''}})
+            for doc in docs
+        ]
+
+
+if __name__ == "__main__":
+    print("=" * 70)
+    print("Migrating Trends to Monthly Buckets")
+    print("=" * 70)
+
+    ensure_trend_indexes(get_database())
+    run_migrations([MigrateTrendsToBuckets()], description='Move trend arrays into monthly buckets')
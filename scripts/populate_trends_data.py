@@ -7,10 +7,13 @@ import os
 import random
 from datetime import datetime, timedelta
 
+from pymongo import UpdateOne
+
 # Add parent directory to path
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 from utils.db_connector import get_db_connection
+from utils.trend_store import TREND_BUCKETS_COLLECTION, build_bucket_docs, compute_trend_stats, trend_stats_update
 
 
 def generate_random_trends(start_date=None, num_points=10, trend_type='neutral'):
@@ -78,6 +81,7 @@ def populate_trends():
     try:
         terms_collection = connector.get_collection('search_term_categories')
         trends_collection = connector.get_collection('search_term_trends')
+        buckets_collection = connector.get_collection(TREND_BUCKETS_COLLECTION)
         
         # Get all search terms with their creation dates
         terms = list(terms_collection.find({}, {'searchTerm': 1, 'createdDate': 1}))
@@ -89,8 +93,11 @@ def populate_trends():
         
         # Clear existing trends data
         trends_collection.delete_many({})
+        buckets_collection.delete_many({})
         
         trends_docs = []
+        bucket_docs = []
+        stats_ops = []
         trend_types = ['upward', 'downward', 'neutral']
         
         for idx, term_doc in enumerate(terms):
@@ -129,14 +136,16 @@ def populate_trends():
             
             trends_doc = {
                 'searchTerm': term,
-                'ctr': trends['ctr'],
-                'cvr': trends['cvr'],
-                'timestamps': trends['timestamps'],
                 'trendType': calculated_status,  # Store the actual calculated trend
                 'lastUpdated': datetime.now()
             }
             
             trends_docs.append(trends_doc)
+            bucket_docs.extend(build_bucket_docs(term, trends['timestamps'], trends['ctr'], trends['cvr']))
+            
+            # Materialize the same statistics onto the term document
+            stats = compute_trend_stats(trends['ctr'], trends['cvr'])
+            stats_ops.append(UpdateOne({'_id': term_doc['_id']}, {'$set': trend_stats_update(stats, calculated_status)}))
             
         print(f"  Generated trends: ~{len(terms)//3} upward, ~{len(terms)//3} downward, ~{len(terms)//3} neutral")
         
@@ -144,14 +153,21 @@ def populate_trends():
         if trends_docs:
             result = trends_collection.insert_many(trends_docs)
             print(f"\n✓ Inserted {len(result.inserted_ids)} trend records")
+        if bucket_docs:
+            result = buckets_collection.insert_many(bucket_docs)
+            print(f"✓ Inserted {len(result.inserted_ids)} monthly trend buckets")
+        if stats_ops:
+            result = terms_collection.bulk_write(stats_ops, ordered=False)
+            print(f"✓ Materialized trend stats on {result.modified_count} terms")
         
         # Show sample
-        sample = trends_collection.find_one()
+        sample = buckets_collection.find_one()
         if sample:
-            print(f"\nSample trend data for '{sample['searchTerm']}':")
-            print(f"  CTR: {sample['ctr'][:5]}...")
-            print(f"  CVR: {sample['cvr'][:5]}...")
-            print(f"  Dates: {sample['timestamps'][:5]}...")
+            points = sample['points'][:5]
+            print(f"\nSample trend data for '{sample['searchTerm']}' ({sample['month']}):")
+            print(f"  CTR: {[p['ctr'] for p in points]}...")
+            print(f"  CVR: {[p['cvr'] for p in points]}...")
+            print(f"  Dates: {[p['date'] for p in points]}...")
         
         print("\n" + "=" * 60)
         print("✓ Trends data populated successfully!")
@@ -0,0 +1,253 @@
+"""
+Change-driven termType reclassification worker
+
+Subscribes to a change stream on search_term_categories and re-runs
+classify_term_type only for documents whose catalogCategories or
+modelIdentifiedCategories changed. The resume token is checkpointed in the
+worker_state collection so a restart continues from where the last run stopped.
+
+Change streams need a replica set. To test locally against a single node:
+    mongod --replSet rs0 --dbpath /tmp/rs0 --port 27017
+    mongosh --eval 'rs.initiate()'
+    python scripts/reclassify_worker.py --uri "mongodb://localhost:27017/?replicaSet=rs0"
+"""
+
+import sys
+import os
+import time
+import argparse
+
+from pymongo import UpdateOne
+from pymongo.errors import OperationFailure, PyMongoError
+
+# Add parent directory to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from utils.db_connector import MongoDBConnector
+from utils.ist import now_ist
+from scripts.classify_term_types import classify_term_type
+
+WORKER_NAME = 'term_type_reclassifier'
+STATE_COLLECTION = 'worker_state'
+WATCHED_FIELDS = ('catalogCategories', 'modelIdentifiedCategories')
+
+# Server error code when the resume token has fallen off the oplog
+CHANGE_STREAM_HISTORY_LOST = 286
+
+def build_pipeline():
+    """
+    Change stream pipeline that only passes events touching the category arrays
+
+    Inserts and replaces always pass. Updates pass when any updated, removed or
+    truncated field path starts with one of WATCHED_FIELDS, so boost-only edits
+    ('modelIdentifiedCategories.2.boostValue') still pass but status, history and
+    termType writes (including our own) are filtered out on the server.
+    """
+    field_regex = '^(' + '|'.join(WATCHED_FIELDS) + r')(\.|$)'
+    changed_paths = {'$concatArrays': [
+        {'$map': {
+            'input': {'$objectToArray': {'$ifNull': ['$updateDescription.updatedFields', {}]}},
+            'in': '$$this.k'
+        }},
+        {'$ifNull': ['$updateDescription.removedFields', []]},
+        {'$map': {
+            'input': {'$ifNull': ['$updateDescription.truncatedArrays', []]},
+            'in': '$$this.field'
+        }}
+    ]}
+    touches_categories = {'$anyElementTrue': [{'$map': {
+        'input': changed_paths,
+        'as': 'path',
+        'in': {'$regexMatch': {'input': '$$path', 'regex': field_regex}}
+    }}]}
+
+    return [{'$match': {'$or': [
+        {'operationType': {'$in': ['insert', 'replace']}},
+        {'operationType': 'update', '$expr': touches_categories}
+    ]}}]
+
+
+def load_resume_token(state_collection):
+    """Return the last checkpointed resume token, or None"""
+    state = state_collection.find_one({'_id': WORKER_NAME})
+    return state.get('resumeToken') if state else None
+
+
+def save_resume_token(state_collection, token):
+    """Checkpoint the resume token for this worker"""
+    state_collection.update_one(
+        {'_id': WORKER_NAME},
+        {'$set': {'resumeToken': token, 'updatedDate': now_ist()}},
+        upsert=True
+    )
+
+
+def reclassify_from_change(collection, change):
+    """
+    Reclassify the document carried by a change event
+
+    Returns:
+        The new termType if the document was updated, otherwise None
+    """
+    doc = change.get('fullDocument')
+    if not doc:
+        # Document was deleted before the post-image was looked up
+        return None
+
+    term_type = classify_term_type(doc)
+    if doc.get('termType') == term_type:
+        return None
+
+    # Guard on termType so a concurrent writer that already fixed it wins
+    result = collection.update_one(
+        {'_id': doc['_id'], 'termType': {'$ne': term_type}},
+        {
+            '$set': {
+                'termType': term_type,
+                'termTypeClassifiedDate': now_ist()
+            }
+        }
+    )
+    return term_type if result.modified_count > 0 else None
+
+
+def sweep_all(collection, batch_size=500):
+    """Reclassify every document once (used when the change history was lost)"""
+    ops = []
+    updated = 0
+    projection = {'catalogCategories.code': 1, 'modelIdentifiedCategories.code': 1, 'termType': 1}
+    for doc in collection.find({}, projection):
+        term_type = classify_term_type(doc)
+        if doc.get('termType') != term_type:
+            ops.append(UpdateOne(
+                {'_id': doc['_id']},
+                {'$set': {'termType': term_type, 'termTypeClassifiedDate': now_ist()}}
+            ))
+        if len(ops) >= batch_size:
+            updated += collection.bulk_write(ops, ordered=False).modified_count
+            ops = []
+    if ops:
+        updated += collection.bulk_write(ops, ordered=False).modified_count
+    return updated
+
+
+def current_operation_time(db):
+    """Cluster time of the latest operation (a change stream start point)"""
+    return db.command('hello')['operationTime']
+
+
+def run_worker(connector, checkpoint_every=50, max_events=None, reset=False, start_at=None):
+    """
+    Consume the change stream until interrupted (or max_events are processed)
+
+    Args:
+        connector: Connected MongoDBConnector
+        checkpoint_every: Persist the resume token after this many events
+        max_events: Stop after processing this many events (useful for tests)
+        reset: Ignore any stored resume token and start from now
+        start_at: Cluster time to start from instead of now (with reset)
+    """
+    collection = connector.get_collection('search_term_categories')
+    state_collection = connector.get_collection(STATE_COLLECTION)
+
+    token = None if reset else load_resume_token(state_collection)
+    if token:
+        print("Resuming from stored token")
+    elif start_at is not None:
+        print("Starting from the beginning of the classification sweep")
+    else:
+        print("Starting from current position")
+
+    processed = 0
+    reclassified = 0
+    since_checkpoint = 0
+    saved_token = token
+
+    try:
+        with collection.watch(
+            build_pipeline(),
+            full_document='updateLookup',
+            resume_after=token,
+            start_at_operation_time=None if token else start_at,
+            max_await_time_ms=1000
+        ) as stream:
+            while stream.alive:
+                change = stream.try_next()
+
+                if change is not None:
+                    processed += 1
+                    since_checkpoint += 1
+                    new_type = reclassify_from_change(collection, change)
+                    if new_type:
+                        reclassified += 1
+                        term = change['fullDocument'].get('searchTerm')
+                        print(f"  ↻ '{term}' → {new_type}")
+
+                # Checkpoint on idle or every N events. stream.resume_token also
+                # advances past events the server filtered out.
+                current_token = stream.resume_token
+                if current_token and current_token != saved_token and (change is None or since_checkpoint >= checkpoint_every):
+                    save_resume_token(state_collection, current_token)
+                    saved_token = current_token
+                    since_checkpoint = 0
+
+                if max_events is not None and processed >= max_events:
+                    break
+
+            if stream.resume_token and stream.resume_token != saved_token:
+                save_resume_token(state_collection, stream.resume_token)
+
+    except OperationFailure as e:
+        if e.code != CHANGE_STREAM_HISTORY_LOST:
+            raise
+        # Token fell off the oplog: events were missed, so fall back to one sweep
+        print("⚠️  Resume token is no longer in the oplog, running a full classification sweep")
+        state_collection.delete_one({'_id': WORKER_NAME})
+        # Changes made while the sweep runs may be missed by it; replay them afterwards
+        sweep_started = current_operation_time(connector.db)
+        print(f"  Reclassified {sweep_all(collection)} terms")
+        return run_worker(connector, checkpoint_every, max_events, reset=True, start_at=sweep_started)
+
+    print(f"Processed {processed} change events, reclassified {reclassified} terms")
+    return processed
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Reclassify termType from change streams')
+    parser.add_argument('--uri', type=str, help='Override the MongoDB URI (e.g. a local replica set)')
+    parser.add_argument('--database', type=str, help='Override the database name')
+    parser.add_argument('--checkpoint-every', type=int, default=50, help='Persist the resume token every N events')
+    parser.add_argument('--max-events', type=int, help='Exit after processing N events')
+    parser.add_argument('--reset', action='store_true', help='Ignore the stored resume token')
+    args = parser.parse_args()
+
+    print("=" * 70)
+    print("termType Reclassification Worker")
+    print("=" * 70)
+
+    connector = MongoDBConnector()
+    if args.uri:
+        connector.uri = args.uri
+    if args.database:
+        connector.database_name = args.database
+
+    while True:
+        if not connector.connect():
+            return
+        try:
+            run_worker(connector, args.checkpoint_every, args.max_events, args.reset)
+            break
+        except KeyboardInterrupt:
+            print("\nStopping worker")
+            break
+        except PyMongoError as e:
+            # Transient failure: reconnect and resume from the stored token
+            print(f"✗ Change stream error: {e}. Retrying in 5s...")
+            args.reset = False
+            time.sleep(5)
+        finally:
+            connector.disconnect()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""
+Record/replay server for the search API
+
+Serves /backend/search/products from responses saved on disk, so relevance
+evaluations (scripts/evaluate_relevance.py --environment recorded) are
+repeatable and do not load a shared environment.
+
+Each response is stored as <sha1 of the sorted query parameters>.json in
+--dir. In --record mode a missing response is fetched from --upstream
+(lowerEnv by default) and saved first; in replay mode it is a 404.
+
+Usage:
+    python scripts/recorded_search_server.py --record      # first run, against lowerEnv
+    python scripts/recorded_search_server.py               # replay only
+"""
+
+import sys
+import os
+import json
+import hashlib
+import argparse
+
+import requests
+from flask import Flask, Response, jsonify, request
+
+# Add parent directory to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from utils.product_fetcher import SEARCH_URLS
+
+RECORDINGS_DIR = os.path.join(os.path.dirname(__file__), '..', 'data', 'recorded_responses')
+
+app = Flask(__name__)
+settings = {'dir': RECORDINGS_DIR, 'record': False, 'upstream': SEARCH_URLS['lowerEnv']}
+session = requests.Session()
+
+
+def recording_key(args):
+    """Stable key of a request's query parameters (repeated parameters keep their order)"""
+    items = sorted((key, tuple(args.getlist(key))) for key in args.keys())
+    return hashlib.sha1(json.dumps(items).encode('utf-8')).hexdigest()
+
+
+@app.route('/backend/search/products')
+def search_products():
+    path = os.path.join(settings['dir'], recording_key(request.args) + '.json')
+    if os.path.exists(path):
+        with open(path, 'rb') as f:
+            return Response(f.read(), mimetype='application/json')
+
+    if not settings['record']:
+        return jsonify({'error': 'No recorded response for this request'}), 404
+
+    upstream = session.get(settings['upstream'], params=list(request.args.items(multi=True)), timeout=30)
+    if upstream.status_code != 200:
+        return Response(upstream.content, status=upstream.status_code, mimetype='application/json')
+    tmp = f"{path}.tmp"
+    with open(tmp, 'wb') as f:
+        f.write(upstream.content)
+    os.replace(tmp, path)
+    return Response(upstream.content, mimetype='application/json')
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Replay (and record) search API responses')
+    parser.add_argument('--port', type=int, default=9095)
+    parser.add_argument('--dir', default=RECORDINGS_DIR, help='Directory of recorded responses')
+    parser.add_argument('--record', action='store_true', help='Fetch and save responses that are not recorded yet')
+    parser.add_argument('--upstream', default=SEARCH_URLS['lowerEnv'], help='Search endpoint to record from')
+    args = parser.parse_args()
+
+    os.makedirs(args.dir, exist_ok=True)
+    settings.update({'dir': args.dir, 'record': args.record, 'upstream': args.upstream})
+    mode = f"recording from {args.upstream}" if args.record else "replay only"
+    print(f"Starting recorded search server on port {args.port} ({mode}, {os.path.abspath(args.dir)})")
+    app.run(debug=False, host='localhost', port=args.port, threaded=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,95 @@
+"""
+Thumbnail server for the product comparison grid
+
+Serves resized product images from the disk LRU cache in
+utils/thumbnail_cache.py:
+
+    GET /thumbnail?url=<image url>&w=<width>   JPEG thumbnail (w: 150 or 300)
+    GET /health                                 liveness check used by the UI
+
+Only images on ALLOWED_IMAGE_HOSTS are fetched. Thumbnails are immutable for
+a given (url, width), so responses are cacheable by the browser for a year.
+
+The UI only links thumbnails when THUMBNAIL_PUBLIC_URL holds an address
+reviewers' browsers can reach, so bind to an interface they can reach too
+(--host 0.0.0.0, or THUMBNAIL_BIND_HOST; see start_all.sh).
+
+Usage:
+    python scripts/thumbnail_server.py [--host 0.0.0.0] [--port 8091] [--cache-dir DIR] [--max-mb 512]
+"""
+
+import sys
+import os
+import argparse
+
+import requests
+from flask import Flask, Response, jsonify, request
+
+# Add parent directory to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from utils.thumbnail_cache import (
+    DEFAULT_WIDTH, THUMBNAIL_CACHE_BYTES, THUMBNAIL_DIR, THUMBNAIL_WIDTHS, ThumbnailCache, is_allowed_image_url
+)
+
+CACHE_CONTROL = 'public, max-age=31536000, immutable'
+
+app = Flask(__name__)
+# Pooled connections to the image CDN, shared by all request threads
+session = requests.Session()
+cache = None
+
+
+@app.route('/health')
+def health():
+    return jsonify({'status': 'ok'})
+
+
+@app.route('/thumbnail')
+def thumbnail():
+    image_url = request.args.get('url', '')
+    try:
+        width = int(request.args.get('w', DEFAULT_WIDTH))
+    except ValueError:
+        return jsonify({'error': 'w must be an integer'}), 400
+    if width not in THUMBNAIL_WIDTHS:
+        return jsonify({'error': f'w must be one of {list(THUMBNAIL_WIDTHS)}'}), 400
+    if not is_allowed_image_url(image_url):
+        return jsonify({'error': 'Image host not allowed'}), 403
+
+    try:
+        data, key = cache.get(image_url, width, session)
+    except Exception as e:
+        print(f"✗ Thumbnail failed for {image_url}: {e}", file=sys.stderr, flush=True)
+        return jsonify({'error': 'Could not fetch image'}), 502
+
+    if request.if_none_match.contains(key):
+        response = Response(status=304)
+    else:
+        response = Response(data, mimetype='image/jpeg')
+    response.set_etag(key)
+    response.headers['Cache-Control'] = CACHE_CONTROL
+    # The UI is served from another port
+    response.headers['Access-Control-Allow-Origin'] = '*'
+    return response
+
+
+def main():
+    global cache
+
+    parser = argparse.ArgumentParser(description='Serve cached product image thumbnails')
+    parser.add_argument('--host', default=os.environ.get('THUMBNAIL_BIND_HOST', '127.0.0.1'),
+                        help='Interface to bind (browsers must reach it at THUMBNAIL_PUBLIC_URL)')
+    parser.add_argument('--port', type=int, default=8091)
+    parser.add_argument('--cache-dir', default=THUMBNAIL_DIR)
+    parser.add_argument('--max-mb', type=int, default=THUMBNAIL_CACHE_BYTES // (1024 * 1024),
+                        help='Disk cache size before least recently used thumbnails are evicted')
+    args = parser.parse_args()
+
+    cache = ThumbnailCache(args.cache_dir, args.max_mb * 1024 * 1024)
+    print(f"Starting thumbnail server on {args.host}:{args.port} (cache: {os.path.abspath(args.cache_dir)})")
+    app.run(debug=False, host=args.host, port=args.port, threaded=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -9,6 +9,9 @@ echo ""
 echo "Stopping existing processes..."
 pkill -f "python.*model_predict.py" 2>/dev/null
 pkill -f "streamlit.*app.py" 2>/dev/null
+pkill -f "python.*reclassify_worker.py" 2>/dev/null
+pkill -f "python.*thumbnail_server.py" 2>/dev/null
+pkill -f "python.*comparison_snapshotter.py" 2>/dev/null
 sleep 2
 
 # Start Model API
@@ -26,6 +29,35 @@ else
     exit 1
 fi
 
+# Start termType reclassification worker
+echo ""
+echo "Starting reclassification worker..."
+python scripts/reclassify_worker.py > worker.log 2>&1 &
+WORKER_PID=$!
+echo "  Worker PID: $WORKER_PID"
+
+# Start comparison snapshotter (after edits and nightly)
+echo ""
+echo "Starting comparison snapshotter..."
+python scripts/comparison_snapshotter.py > snapshotter.log 2>&1 &
+SNAPSHOTTER_PID=$!
+echo "  Snapshotter PID: $SNAPSHOTTER_PID"
+
+# Start product image thumbnail server
+# THUMBNAIL_PUBLIC_URL is the address reviewers' browsers load thumbnails from
+# (e.g. http://sensei.internal:8091); unset, the UI keeps the original image URLs
+export THUMBNAIL_PUBLIC_URL="${THUMBNAIL_PUBLIC_URL:-}"
+if [ -n "$THUMBNAIL_PUBLIC_URL" ]; then
+    THUMBNAIL_BIND_HOST="${THUMBNAIL_BIND_HOST:-0.0.0.0}"
+else
+    THUMBNAIL_BIND_HOST="${THUMBNAIL_BIND_HOST:-127.0.0.1}"
+fi
+echo ""
+echo "Starting thumbnail server ($THUMBNAIL_BIND_HOST:8091)..."
+python scripts/thumbnail_server.py --host "$THUMBNAIL_BIND_HOST" --port 8091 > thumbnails.log 2>&1 &
+THUMBNAIL_PID=$!
+echo "  Thumbnail server PID: $THUMBNAIL_PID"
+
 # Start Streamlit UI
 echo ""
 echo "Starting Streamlit UI (port 8501)..."
@@ -50,11 +82,15 @@ echo ""
 echo "🔗 Access Points:"
 echo "   Model API: http://localhost:8090"
 echo "   Streamlit UI: http://localhost:8501"
+echo "   Thumbnails: ${THUMBNAIL_PUBLIC_URL:-http://localhost:8091 (not linked from the UI; set THUMBNAIL_PUBLIC_URL)}"
 echo ""
 echo "📝 Logs:"
 echo "   Model: model.log"
 echo "   Streamlit: streamlit.log"
+echo "   Worker: worker.log"
+echo "   Thumbnails: thumbnails.log"
+echo "   Snapshotter: snapshotter.log"
 echo ""
-echo "⏹️  To stop: pkill -f 'model_predict.py|streamlit.*app.py'"
+echo "⏹️  To stop: pkill -f 'model_predict.py|streamlit.*app.py|reclassify_worker.py|thumbnail_server.py|comparison_snapshotter.py'"
 echo ""
 
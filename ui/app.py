@@ -7,11 +7,9 @@ import pandas as pd
 import plotly.graph_objects as go
 import sys
 import os
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timezone, timedelta
 
-# IST timezone offset
-IST_OFFSET = timedelta(hours=5, minutes=30)
-
 def to_ist(dt):
     """Convert UTC datetime to IST"""
     if dt is None:
@@ -36,8 +34,29 @@ def format_ist_datetime(dt):
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 from utils.db_connector import get_db_connection
-from utils.product_fetcher import fetch_products
+from utils.ist import IST_OFFSET, now_ist
+from utils.product_comparison import comparison_params, fetch_comparison, invalidate_comparisons
+from utils.thumbnail_cache import thumbnail_url
+from utils.comparison_snapshots import SNAPSHOT_LIMIT, delete_snapshots, get_current_snapshot, save_live_snapshot
+from utils.trend_store import INITIAL_TREND_STATS, append_daily_point, get_days_window
+from utils.downsampling import MAX_CHART_POINTS, downsample
+from utils.term_queries import (
+    COMPARISON_PROJECTION, EDIT_PROJECTION, build_term_filter, get_term, invalidate_term_counts, load_term_page
+)
+from utils.bulk_edits import (
+    RESULT_ADDED, RESULT_UPDATED, apply_bulk_changes, changes_for_filter, read_changes_csv, summarize_results
+)
+from utils.edit_events import get_edit_events, log_edit_event
+from utils.dashboard_metrics import (
+    BOOST_LABELS, TERM_METRICS_TTL, get_metrics, is_refreshing, refresh_metrics_async
+)
+from utils.term_edits import (
+    EDIT_CONFLICT, EDIT_NOOP, EDIT_OK, EditResult, add_category, remove_category, update_boost, version_of
+)
+from utils.term_search import LOADS_FILE, get_term_search_index, load_term_loads, normalize_term
+from utils.taxonomy import C3_CATEGORIES_FILE, CategoryIndex, category_cooccurrence, load_c3_categories
 import requests
+from requests.adapters import HTTPAdapter
 import json
 
 
@@ -48,9 +67,6 @@ st.set_page_config(
     layout="wide"
 )
 
-# IST timezone offset (UTC + 5:30)
-IST_OFFSET = timedelta(hours=5, minutes=30)
-
 def utc_to_ist(dt):
     """
     Convert UTC datetime from database to IST
@@ -68,268 +84,196 @@ def utc_to_ist(dt):
         return dt + IST_OFFSET
     return dt
 
-def now_ist():
-    """Get current time in IST"""
-    return datetime.now(timezone.utc).replace(tzinfo=None) + IST_OFFSET
-
 # Initialize session state
-if 'db_connector' not in st.session_state:
-    st.session_state.db_connector = None
-if 'c3_categories' not in st.session_state:
-    st.session_state.c3_categories = None
 if 'current_page' not in st.session_state:
     st.session_state.current_page = 0
+if 'page_tokens' not in st.session_state:
+    # page_tokens[i] is the keyset token that loads page i
+    st.session_state.page_tokens = [None]
 if 'search_query' not in st.session_state:
     st.session_state.search_query = ""
 
 
-@st.cache_data
-def load_c3_categories():
-    """Load all C3 categories from CSV"""
-    csv_path = "/Users/daxeshparmar/PycharmProjects/semantic-sensei/data/c3_categories.csv"
-    df = pd.read_csv(csv_path)
-    # Create a dict for easy lookup
-    categories = {}
-    for _, row in df.iterrows():
-        categories[row['C3Code']] = row['C3Name']
-    return categories
+# Process-wide resources: created once per server process and shared by every
+# session (st.cache_resource), instead of once per browser session.
+# Data caches (st.cache_data) carry TTLs; per-term ones also take the term's
+# cache version, which writes bump (see bump_term_cache).
+
+# Seconds cached trend series and edit events are reused
+TRENDS_TTL = 300
+EDIT_EVENTS_TTL = 60
+COOCCURRENCE_TTL = 300
+DASHBOARD_TTL = 30
+# Edit markers beyond this many lose their text labels (hover still shows them)
+MAX_EDIT_LABELS = 20
+
+
+def _connector_healthy(connector):
+    # Pings at most every HEALTH_CHECK_INTERVAL seconds; a failed check recreates the connector
+    return connector is not None and connector.is_healthy()
+
+
+@st.cache_resource(validate=_connector_healthy, show_spinner=False)
+def get_shared_db():
+    """MongoDB connector shared by all sessions"""
+    return get_db_connection()
+
+
+@st.cache_resource(max_entries=1, show_spinner=False)
+def _category_index(mtime):
+    return CategoryIndex(load_c3_categories())
+
+
+def get_category_index():
+    """Sorted, searchable C3 taxonomy shared by all sessions (reloaded when the CSV changes)"""
+    return _category_index(os.path.getmtime(C3_CATEGORIES_FILE))
+
+
+def get_c3_categories():
+    """C3 code -> name (do not mutate; see get_category_index)"""
+    return get_category_index().categories
+
+
+@st.cache_resource(max_entries=1, show_spinner=False)
+def _term_loads(mtime):
+    return load_term_loads()
+
+
+def get_term_loads():
+    """Normalized search keyword -> Loads, shared by all sessions (reloaded when the CSV changes)"""
+    return _term_loads(os.path.getmtime(LOADS_FILE))
+
+
+@st.cache_resource(show_spinner=False)
+def get_http_session():
+    """Pooled keep-alive HTTP session for the catalog and model APIs, shared by all sessions"""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=16)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
 
 
 def get_db():
     """Get database connection"""
-    if st.session_state.db_connector is None:
-        st.session_state.db_connector = get_db_connection()
-    return st.session_state.db_connector
+    return get_shared_db()
+
+
+@st.cache_resource(show_spinner=False)
+def _term_cache_versions():
+    return {}
+
 
+def term_cache_version(term):
+    """Version of a term's cached trend series and edit events (an argument of those caches)"""
+    return _term_cache_versions().get(term, 0)
 
-def get_terms(skip=0, limit=10, query="", status_filter="in_progress", trend_filter="all"):
-    """Get terms from database with pagination"""
+
+def bump_term_cache(term):
+    """
+    Invalidate one term's cached trend series and edit events in this process
+
+    st.cache_data's clear() drops the entries of every term; a new version
+    makes only this term's next reads miss. Other processes catch up when
+    their entries expire (TRENDS_TTL, EDIT_EVENTS_TTL).
+    """
+    versions = _term_cache_versions()
+    versions[term] = versions.get(term, 0) + 1
+
+
+def get_terms(page_token=None, limit=10, query="", status_filter="in_progress", trend_filter="all", sort="updated"):
+    """
+    Get one page of terms for the term table
+    
+    Returns:
+        Tuple of (row view models from utils.term_queries, total count, token for the next page)
+    """
     connector = get_db()
     if not connector:
-        return [], 0
+        return [], 0, None
     
-    collection = connector.get_collection('search_term_categories')
-    trends_collection = connector.get_collection('search_term_trends')
-    
-    # Build filter query for search terms
-    filter_query = {}
-    
-    if query:
-        # Case-insensitive search
-        filter_query['searchTerm'] = {'$regex': query, '$options': 'i'}
-    
-    # Add status filter
-    if status_filter:
-        filter_query['status'] = status_filter
-    
-    # Optimize: If trend filter is specified, get matching terms from trends collection first
-    if trend_filter != "all":
-        # Get all terms with the specified trend type
-        trend_query = {'trendType': trend_filter}
-        matching_trend_terms = trends_collection.find(trend_query, {'searchTerm': 1})
-        trend_term_list = [doc['searchTerm'] for doc in matching_trend_terms]
-        
-        # Add to filter query
-        if trend_term_list:
-            filter_query['searchTerm'] = {'$in': trend_term_list}
-            if query:
-                # Combine with search query using $and
-                filter_query = {
-                    '$and': [
-                        {'searchTerm': {'$in': trend_term_list}},
-                        {'searchTerm': {'$regex': query, '$options': 'i'}}
-                    ]
-                }
-                if status_filter:
-                    filter_query['$and'].append({'status': status_filter})
-        else:
-            # No matching trends, return empty
-            return [], 0
-    
-    # Get total count efficiently
-    total = collection.count_documents(filter_query)
-    
-    # Get only the required page of results
-    results = list(collection.find(filter_query).sort('updatedDate', -1).skip(skip).limit(limit))
-    
-    return results, total
+    return load_term_page(connector.db, page_token, limit, query, status_filter, trend_filter, sort)
 
 
-def get_term_data(term):
-    """Get full data for a specific term"""
+def get_term_data(term, projection=None, primary=False):
+    """Get data for a specific term (full document unless a projection is given; see get_term for primary)"""
     connector = get_db()
     if not connector:
         return None
     
-    collection = connector.get_collection('search_term_categories')
-    return collection.find_one({'searchTerm': term})
+    return get_term(connector.db, term, projection, primary)
 
 
 def log_edit_history(term, action_type, details):
-    """Log an edit to the term's history"""
+    """Log an edit to the term's history (append-only edit_events collection)"""
     connector = get_db()
     if not connector:
         return False
     
-    collection = connector.get_collection('search_term_categories')
-    
-    edit_entry = {
-        'timestamp': now_ist(),
-        'action': action_type,
-        'details': details
-    }
-    
-    collection.update_one(
-        {'searchTerm': term},
-        {'$push': {'editHistory': edit_entry}}
-    )
+    log_edit_event(connector.db, term, action_type, details, now_ist())
+    bump_term_cache(term)
     
     return True
 
 
-def update_boost_value(term, category_code, new_boost):
-    """Update boost value for a model category"""
+def _finish_edit(term, result):
+    """Book-keeping after an edit; returns the EditResult unchanged"""
+    if result.status == EDIT_OK:
+        # This session's own write must not look like a concurrent change
+        st.session_state[f"edit_seen_version_{term}"] = version_of(result.doc) + 1
+        invalidate_comparisons(term)
+        # The edit logged an edit event
+        bump_term_cache(term)
+        if result.auto_locked:
+            invalidate_term_counts()
+    elif result.status == EDIT_CONFLICT:
+        # The dialog now shows the fresh document; a retry is checked against it
+        st.session_state[f"edit_seen_version_{term}"] = version_of(result.doc)
+    return result
+
+
+def update_boost_value(term, category_code, new_boost, expected_version=None):
+    """Update boost value for a model category (one atomic update, see utils.term_edits)"""
     connector = get_db()
     if not connector:
-        return False
+        return EditResult(EDIT_NOOP, None, False)
     
-    collection = connector.get_collection('search_term_categories')
-    
-    # Get current boost value for logging
-    term_data = collection.find_one({'searchTerm': term})
-    old_boost = None
-    category_name = None
-    for cat in term_data.get('modelIdentifiedCategories', []):
-        if cat['code'] == category_code:
-            old_boost = cat.get('boostValue', 100)
-            category_name = cat['name']
-            break
-    
-    result = collection.update_one(
-        {
-            'searchTerm': term,
-            'modelIdentifiedCategories.code': category_code
-        },
-        {
-            '$set': {
-                'modelIdentifiedCategories.$.boostValue': new_boost,
-                'updatedDate': now_ist()
-            }
-        }
-    )
-    
-    if result.modified_count > 0:
-        # Log the edit
-        log_edit_history(term, 'boost_update', 
-                        f"Updated boost for '{category_name}' from {old_boost} to {new_boost}")
-        # Check if term should be auto-locked
-        check_and_auto_lock(term)
-    
-    return result.modified_count > 0
+    return _finish_edit(term, update_boost(connector.db, term, category_code, new_boost, now_ist(), expected_version))
 
 
-def reclassify_term_type(term):
-    """Reclassify a term's type after categories change"""
+def add_model_category(term, category_code, category_name, boost_value, expected_version=None):
+    """Add a new model category to a term (one atomic update, see utils.term_edits)"""
     connector = get_db()
     if not connector:
-        return
-    
-    collection = connector.get_collection('search_term_categories')
-    term_data = collection.find_one({'searchTerm': term})
+        return EditResult(EDIT_NOOP, None, False)
     
-    if not term_data:
-        return
-    
-    # Classify based on intersection
-    catalog_codes = set(cat['code'] for cat in term_data.get('catalogCategories', []) if 'code' in cat)
-    model_codes = set(cat['code'] for cat in term_data.get('modelIdentifiedCategories', []) if 'code' in cat)
-    intersection = catalog_codes & model_codes
-    
-    term_type = 'boostingConfiguration' if intersection else 'filterConfiguration'
-    
-    # Update if changed
-    current_type = term_data.get('termType')
-    if current_type != term_type:
-        collection.update_one(
-            {'searchTerm': term},
-            {
-                '$set': {
-                    'termType': term_type,
-                    'termTypeClassifiedDate': now_ist()
-                }
-            }
-        )
+    return _finish_edit(term, add_category(connector.db, term, category_code, category_name, boost_value, now_ist(), expected_version))
 
 
-def add_model_category(term, category_code, category_name, boost_value):
-    """Add a new model category to a term"""
+def remove_model_category(term, category_code, expected_version=None):
+    """Remove a model category from a term (one atomic update, see utils.term_edits)"""
     connector = get_db()
     if not connector:
-        return False
-    
-    collection = connector.get_collection('search_term_categories')
-    
-    new_category = {
-        'code': category_code,
-        'name': category_name,
-        'score': 0,  # Manual entries have 0 score
-        'boostValue': boost_value
-    }
-    
-    result = collection.update_one(
-        {'searchTerm': term},
-        {
-            '$push': {'modelIdentifiedCategories': new_category},
-            '$set': {'updatedDate': now_ist()}
-        }
-    )
-    
-    if result.modified_count > 0:
-        # Log the edit
-        log_edit_history(term, 'category_added', 
-                        f"Added category '{category_name}' (boost: {boost_value})")
-        # Reclassify term type
-        reclassify_term_type(term)
-        # Check if term should be auto-locked
-        check_and_auto_lock(term)
+        return EditResult(EDIT_NOOP, None, False)
     
-    return result.modified_count > 0
+    return _finish_edit(term, remove_category(connector.db, term, category_code, now_ist(), expected_version))
 
 
-def remove_model_category(term, category_code):
-    """Remove a model category from a term"""
-    connector = get_db()
-    if not connector:
-        return False
-    
-    collection = connector.get_collection('search_term_categories')
+def show_edit_conflict(result, category_code=None):
+    """Explain a version conflict using the fresh document from the failed edit"""
+    if result.doc is None:
+        st.error("✗ This term was deleted by another editor")
+        return
     
-    # Get category name for logging
-    term_data = collection.find_one({'searchTerm': term})
-    category_name = None
-    for cat in term_data.get('modelIdentifiedCategories', []):
+    message = "⚠️ Another editor changed this term since you opened it. Nothing was saved."
+    for cat in result.doc.get('modelIdentifiedCategories', []):
         if cat['code'] == category_code:
-            category_name = cat['name']
+            message += f" '{cat['name']}' now has boost {cat.get('boostValue', 100)}."
             break
-    
-    result = collection.update_one(
-        {'searchTerm': term},
-        {
-            '$pull': {'modelIdentifiedCategories': {'code': category_code}},
-            '$set': {'updatedDate': now_ist()}
-        }
-    )
-    
-    if result.modified_count > 0 and category_name:
-        # Log the edit
-        log_edit_history(term, 'category_removed', 
-                        f"Removed category '{category_name}'")
-        # Reclassify term type
-        reclassify_term_type(term)
-        # Check if term should be auto-locked
-        check_and_auto_lock(term)
-    
-    return result.modified_count > 0
+    else:
+        if category_code:
+            message += " That category is no longer in the AI categories."
+    st.warning(message + " Review the current values below and try again.")
 
 
 def delete_term(term):
@@ -342,7 +286,14 @@ def delete_term(term):
     
     result = collection.delete_one({'searchTerm': term})
     
-    return result.deleted_count > 0
+    if result.deleted_count > 0:
+        get_term_search_index(connector.db).remove_term(term)
+        invalidate_term_counts()
+        invalidate_comparisons(term)
+        delete_snapshots(connector.db, term)
+        bump_term_cache(term)
+        return True
+    return False
 
 
 def promote_to_main_algo(term):
@@ -360,11 +311,13 @@ def promote_to_main_algo(term):
             '$set': {
                 'status': 'locked',
                 'updatedDate': now_ist()
-            }
+            },
+            '$inc': {'version': 1}
         }
     )
     
     if result.modified_count > 0:
+        invalidate_term_counts()
         # Log the promotion
         log_edit_history(term, 'promoted_to_main', 
                         'Manually promoted to main algorithm (control migrated)')
@@ -373,8 +326,13 @@ def promote_to_main_algo(term):
     return False
 
 
-def fetch_catalog_categories_for_live_entry(search_term):
-    """Fetch catalog categories from Blibli API"""
+def fetch_catalog_categories_for_live_entry(search_term, session=requests):
+    """
+    Fetch catalog categories from Blibli API
+    
+    Args:
+        session: HTTP session to use (get_http_session(); resolve it on the script thread)
+    """
     from scrapper.fetchTermToCategoryMapping import HEADERS, COOKIES, SEARCH_API_URL, extract_c3_categories
     
     try:
@@ -390,7 +348,7 @@ def fetch_catalog_categories_for_live_entry(search_term):
             'firstLoad': 'true'
         }
         
-        response = requests.get(SEARCH_API_URL, params=params, headers=HEADERS, cookies=COOKIES, timeout=10)
+        response = session.get(SEARCH_API_URL, params=params, headers=HEADERS, cookies=COOKIES, timeout=10)
         response.raise_for_status()
         
         data = response.json()
@@ -421,10 +379,10 @@ def fetch_catalog_categories_for_live_entry(search_term):
         return [], str(e)
 
 
-def fetch_model_predictions(search_term):
-    """Call the model API to get predictions"""
+def fetch_model_predictions(search_term, session=requests):
+    """Call the model API to get predictions (session: see fetch_catalog_categories_for_live_entry)"""
     try:
-        response = requests.post(
+        response = session.post(
             'http://localhost:8090/search',
             json={'search_term': search_term},
             timeout=30
@@ -466,7 +424,6 @@ def save_live_entry(search_term, catalog_categories, model_categories):
         return False, "Database connection failed"
     
     collection = connector.get_collection('search_term_categories')
-    trends_collection = connector.get_collection('search_term_trends')
     
     # Check if term already exists
     existing = collection.find_one({'searchTerm': search_term})
@@ -484,23 +441,24 @@ def save_live_entry(search_term, catalog_categories, model_categories):
     # Use IST time
     current_time = now_ist()
     
+    normalized_term = normalize_term(search_term)
+    loads = get_term_loads().get(normalized_term, 0)
+    
     # Create new entry
     entry_data = {
         'searchTerm': search_term,
+        'searchTermNormalized': normalized_term,
+        'loads': loads,
         'catalogCategories': catalog_categories,
         'modelIdentifiedCategories': model_categories,
         'termType': term_type,
         'termTypeClassifiedDate': current_time,
         'status': 'in_progress',
+        'version': 0,
+        # Placeholder until append_daily_point materializes the real values
+        **INITIAL_TREND_STATS,
         'createdDate': current_time,
-        'updatedDate': current_time,
-        'editHistory': [
-            {
-                'timestamp': current_time,
-                'action': 'created',
-                'details': f'Live entry generated from UI (Type: {term_type})'
-            }
-        ]
+        'updatedDate': current_time
     }
     
     # Create simple trends data (just initial values)
@@ -508,128 +466,209 @@ def save_live_entry(search_term, catalog_categories, model_categories):
     initial_ctr = round(random.uniform(0.15, 0.35), 3)
     initial_cvr = round(initial_ctr * random.uniform(0.3, 0.6), 3)
     
-    trends_data = {
-        'searchTerm': search_term,
-        'ctr': [initial_ctr],
-        'cvr': [initial_cvr],
-        'timestamps': [current_time.strftime('%Y-%m-%d')],
-        'trendType': 'neutral',
-        'lastUpdated': current_time
-    }
-    
     try:
         collection.insert_one(entry_data)
-        trends_collection.insert_one(trends_data)
+        log_edit_event(connector.db, search_term, 'created', f'Live entry generated from UI (Type: {term_type})', current_time)
+        # Stores the first point, then creates the trend summary and materialized trend fields
+        append_daily_point(connector.db, search_term, current_time.strftime('%Y-%m-%d'), initial_ctr, initial_cvr)
+        # Searchable right away in this process; other processes pick it up on their next refresh
+        get_term_search_index(connector.db).add_term(search_term, loads)
+        invalidate_term_counts()
+        bump_term_cache(search_term)
         return True, "Entry saved successfully"
     except Exception as e:
         return False, str(e)
 
 
-def calculate_trend_status(term):
-    """Get trend status from stored trends data"""
-    connector = get_db()
-    if not connector:
-        return "Neutral", 0
-    
-    trends_collection = connector.get_collection('search_term_trends')
-    trends_data = trends_collection.find_one({'searchTerm': term})
-    
-    if not trends_data:
-        return "Neutral", 0
-    
-    # Get stored trend type
-    trend_type = trends_data.get('trendType', 'neutral')
-    
-    # Calculate actual percentage change from CTR data
-    ctr = trends_data.get('ctr', [])
-    if len(ctr) >= 5:
-        recent_ctrs = ctr[-5:]  # Last 5 days
-        first_ctr = recent_ctrs[0]
-        last_ctr = recent_ctrs[-1]
-        
-        if first_ctr > 0:
-            pct_change = ((last_ctr - first_ctr) / first_ctr) * 100
-        else:
-            pct_change = 0
-    else:
-        pct_change = 0
-    
-    # Map trend_type to display format
+def format_trend_status(trend_type):
+    """Map a stored trend type to its display label"""
     if trend_type == "improvement":
-        return "Improvement", pct_change
+        return "Improvement"
     elif trend_type == "underperforming":
-        return "Underperforming", pct_change
+        return "Underperforming"
     else:
-        return "Neutral", pct_change
+        return "Neutral"
 
 
-def check_upward_trend_days(term):
-    """Check how many consecutive days of upward trend"""
-    trends_data = get_trends_data(term)
-    
-    if not trends_data or 'trends' not in trends_data:
-        return 0
+@st.cache_data(ttl=TRENDS_TTL, show_spinner=False)
+def get_trends_data(term, days=None, version=0):
+    """
+    Get CTR/CVR trends data for a term
     
-    trends = trends_data['trends']
-    if len(trends) < 2:
-        return 0
+    Args:
+        days: Only read the last N days of history (None for all of it)
+        version: term_cache_version(term); only part of the cache key
     
-    # Count consecutive days with increasing CTR
-    consecutive_days = 0
-    for i in range(len(trends) - 1, 0, -1):
-        if trends[i]['ctr'] > trends[i-1]['ctr']:
-            consecutive_days += 1
-        else:
-            break
+    Returns:
+        Dict with parallel 'timestamps', 'ctr' and 'cvr' lists, or None if there is no data
+    """
+    connector = get_db()
+    if not connector:
+        return None
     
-    return consecutive_days
+    series = get_days_window(connector.db, term, days)
+    return series if series['timestamps'] else None
 
 
-def check_and_auto_lock(term):
-    """Check if term should be auto-locked based on 5-day upward trend"""
+@st.cache_data(ttl=EDIT_EVENTS_TTL, show_spinner=False)
+def load_edit_events(term, start_date=None, end_date=None, version=0):
+    """Edit events of a term within a window (see utils.edit_events.get_edit_events; version as in get_trends_data)"""
     connector = get_db()
     if not connector:
-        return False
-    
-    collection = connector.get_collection('search_term_categories')
+        return []
     
-    # Check if already locked
-    term_data = collection.find_one({'searchTerm': term})
-    if term_data and term_data.get('status') == 'locked':
-        return False
-    
-    # Check for 5-day upward trend
-    upward_days = check_upward_trend_days(term)
-    
-    if upward_days >= 5:
-        # Auto-lock the term
-        result = collection.update_one(
-            {'searchTerm': term},
-            {
-                '$set': {
-                    'status': 'locked',
-                    'updatedDate': now_ist()
-                }
-            }
-        )
-        
-        if result.modified_count > 0:
-            # Log the auto-lock
-            log_edit_history(term, 'auto_locked', 
-                           f"Auto-locked after {upward_days} days of upward trend")
-            return True
-    
-    return False
+    return get_edit_events(connector.db, term, start_date, end_date)
 
 
-def get_trends_data(term):
-    """Get CTR/CVR trends data for a term"""
+@st.cache_data(ttl=COOCCURRENCE_TTL, show_spinner=False)
+def load_category_cooccurrence(term):
+    """Category counts of terms similar to term (see utils.taxonomy.category_cooccurrence)"""
     connector = get_db()
     if not connector:
+        return {}
+    
+    return category_cooccurrence(connector.db, term)
+
+
+def category_picker(key, term=None, blank=False, label_visibility="visible"):
+    """
+    Category search box plus a selectbox of its top matches
+    
+    Only the matches reach the browser, not the whole taxonomy. With an
+    empty search the categories most used by terms similar to term are
+    suggested.
+    
+    Returns:
+        Selected C3 code, or None
+    """
+    index = get_category_index()
+    cooccurrence = load_category_cooccurrence(term) if term else None
+    query = st.text_input(
+        "Search Categories",
+        placeholder="🔍 Search categories by name or code",
+        key=f"{key}_query",
+        label_visibility=label_visibility
+    )
+    options = index.search(query, cooccurrence=cooccurrence)
+    if not options:
+        st.caption("No matching categories")
         return None
+    return st.selectbox(
+        "Select Category",
+        options=([""] if blank else []) + options,
+        format_func=lambda code: index.label(code) if code else "",
+        key=key,
+        label_visibility=label_visibility
+    ) or None
+
+
+# Concurrent lookups for batch live entry generation
+LIVE_ENTRY_WORKERS = 4
+
+
+def parse_live_entry_terms(text):
+    """Split comma-separated live entry input into unique, non-empty terms (input order kept)"""
+    terms = []
+    for term in (text or "").split(","):
+        term = term.strip()
+        if term and term not in terms:
+            terms.append(term)
+    return terms
+
+
+def fetch_live_entry_batch(search_terms, on_update=None):
+    """
+    Run the catalog and model lookups of several terms as one pipelined batch
+    
+    Every lookup is queued on a small thread pool at once, so catalog calls of
+    later terms overlap the (slower) model calls of earlier ones instead of
+    each term waiting for the previous one.
     
-    collection = connector.get_collection('search_term_trends')
-    return collection.find_one({'searchTerm': term})
+    Args:
+        on_update: Called from the calling thread with the results dict after each finished lookup
+    
+    Returns:
+        Dict of term -> {'catalog_categories', 'catalog_error', 'catalog_done',
+        'model_categories', 'model_error', 'model_done'}, in input order
+    """
+    results = {
+        term: {
+            'catalog_categories': [], 'catalog_error': None, 'catalog_done': False,
+            'model_categories': [], 'model_error': None, 'model_done': False
+        }
+        for term in search_terms
+    }
+    session = get_http_session()
+    with ThreadPoolExecutor(max_workers=LIVE_ENTRY_WORKERS) as pool:
+        futures = {}
+        for term in search_terms:
+            futures[pool.submit(fetch_catalog_categories_for_live_entry, term, session)] = (term, 'catalog')
+            futures[pool.submit(fetch_model_predictions, term, session)] = (term, 'model')
+        
+        for future in as_completed(futures):
+            term, lookup = futures[future]
+            result = results[term]
+            if lookup == 'catalog':
+                result['catalog_categories'], result['catalog_error'] = future.result()
+            else:
+                result['model_categories'], _, result['model_error'] = future.result()
+            result[f'{lookup}_done'] = True
+            if on_update:
+                on_update(results)
+    return results
+
+
+def live_entry_batch_summary(results):
+    """One status row per term of a batch lookup"""
+    def status(result, lookup):
+        if not result[f'{lookup}_done']:
+            return "⏳"
+        if result[f'{lookup}_error']:
+            return f"❌ {result[f'{lookup}_error']}"
+        return f"✅ {len(result[f'{lookup}_categories'])}"
+    
+    return pd.DataFrame([
+        {
+            'Search Term': term,
+            'Catalog Categories': status(result, 'catalog'),
+            'Model Categories': status(result, 'model'),
+        }
+        for term, result in results.items()
+    ])
+
+
+def show_catalog_lookup(catalog_categories, catalog_error):
+    """Render the outcome of a catalog category lookup"""
+    if catalog_error:
+        st.error(f"❌ Catalog API Error: {catalog_error}")
+    elif catalog_categories:
+        st.success(f"✅ Found {len(catalog_categories)} catalog categories")
+        with st.expander("📚 Catalog Categories", expanded=False):
+            for cat in catalog_categories:
+                st.markdown(f"• **{cat['name']}** `{cat['code']}`")
+    else:
+        st.warning("⚠️ No catalog categories found")
+
+
+def show_model_lookup(model_categories, model_error):
+    """Render the outcome of a model prediction lookup"""
+    if model_error:
+        st.error(f"❌ Model API Error: {model_error}")
+        st.info("💡 Make sure the model API is running: `python model/fetchDetailsFromModel.py`")
+    elif model_categories:
+        st.success(f"✅ Model predicted {len(model_categories)} categories")
+    else:
+        st.warning("⚠️ No model predictions received")
+
+
+def set_live_entry(search_term, catalog_categories, model_categories):
+    """Load fetched lookups into the live entry editor"""
+    st.session_state.live_entry_data = {
+        'search_term': search_term,
+        'catalog_categories': catalog_categories if catalog_categories else [],
+        'model_categories': model_categories if model_categories else [],
+        'fetched': True
+    }
 
 
 @st.dialog("🚀 Generate Live Entry", width="large")
@@ -655,14 +694,13 @@ def show_live_entry_generator():
         }
     
     # Load C3 categories for dropdown
-    if st.session_state.c3_categories is None:
-        st.session_state.c3_categories = load_c3_categories()
-    c3_categories = st.session_state.c3_categories
+    c3_categories = get_c3_categories()
     
-    # Input for search term
+    # Input for search term(s)
     search_term = st.text_input(
         "Enter Search Term",
         placeholder="e.g., apple iphone, nike shoes, samsung tv",
+        help="Separate several terms with commas to look them all up as one batch",
         key="live_entry_search_term",
         on_change=None
     )
@@ -671,49 +709,77 @@ def show_live_entry_generator():
     generate_clicked = st.button("🔍 Generate Predictions", type="primary", use_container_width=True)
     
     if generate_clicked or (search_term and search_term != st.session_state.get('last_search_term', '')):
-        if not search_term or len(search_term.strip()) == 0:
+        search_terms = parse_live_entry_terms(search_term)
+        if not search_terms:
             st.error("Please enter a search term")
             return
         
-        search_term = search_term.strip()
-        
-        # Step 1: Fetch catalog categories
-        st.markdown("### Step 1: Fetching Catalog Categories...")
-        with st.spinner("Calling Blibli API..."):
-            catalog_categories, catalog_error = fetch_catalog_categories_for_live_entry(search_term)
-        
-        if catalog_error:
-            st.error(f"❌ Catalog API Error: {catalog_error}")
-        elif catalog_categories:
-            st.success(f"✅ Found {len(catalog_categories)} catalog categories")
-            with st.expander("📚 Catalog Categories", expanded=False):
-                for cat in catalog_categories:
-                    st.markdown(f"• **{cat['name']}** `{cat['code']}`")
-        else:
-            st.warning("⚠️ No catalog categories found")
-        
-        # Step 2: Fetch model predictions
-        st.markdown("### Step 2: Getting AI Model Predictions...")
-        with st.spinner("Calling Model API at localhost:8090..."):
-            model_categories, token_details, model_error = fetch_model_predictions(search_term)
-        
-        if model_error:
-            st.error(f"❌ Model API Error: {model_error}")
-            st.info("💡 Make sure the model API is running: `python model/fetchDetailsFromModel.py`")
-        elif model_categories:
-            st.success(f"✅ Model predicted {len(model_categories)} categories")
+        if len(search_terms) == 1:
+            search_term = search_terms[0]
+            
+            # Both lookups start at once; the catalog (fast facet call) is shown as soon as
+            # it arrives while the model prediction is still running
+            st.markdown("### Step 1: Fetching Catalog Categories...")
+            catalog_slot = st.empty()
+            st.markdown("### Step 2: Getting AI Model Predictions...")
+            model_slot = st.empty()
+            catalog_slot.info("⏳ Calling Blibli API...")
+            model_slot.info("⏳ Calling Model API at localhost:8090...")
+            
+            session = get_http_session()
+            with ThreadPoolExecutor(max_workers=2) as pool:
+                catalog_future = pool.submit(fetch_catalog_categories_for_live_entry, search_term, session)
+                model_future = pool.submit(fetch_model_predictions, search_term, session)
+                
+                catalog_categories, catalog_error = catalog_future.result()
+                with catalog_slot.container():
+                    show_catalog_lookup(catalog_categories, catalog_error)
+                
+                model_categories, token_details, model_error = model_future.result()
+                with model_slot.container():
+                    show_model_lookup(model_categories, model_error)
+            
+            st.session_state.live_entry_batch = None
+            set_live_entry(search_term, catalog_categories, model_categories)
         else:
-            st.warning("⚠️ No model predictions received")
+            st.markdown(f"### Steps 1 & 2: Looking up {len(search_terms)} terms...")
+            progress = st.progress(0.0)
+            status_slot = st.empty()
+            
+            def show_progress(results):
+                done = sum(r['catalog_done'] + r['model_done'] for r in results.values())
+                progress.progress(done / (2 * len(results)), text=f"{done} of {2 * len(results)} lookups finished")
+                status_slot.dataframe(live_entry_batch_summary(results), use_container_width=True, hide_index=True)
+            
+            batch = fetch_live_entry_batch(search_terms, on_update=show_progress)
+            st.session_state.live_entry_batch = batch
+            st.session_state.pop('live_entry_batch_term', None)
+            first = batch[search_terms[0]]
+            set_live_entry(search_terms[0], first['catalog_categories'], first['model_categories'])
         
-        # Store data in session state
-        st.session_state.live_entry_data = {
-            'search_term': search_term,
-            'catalog_categories': catalog_categories if catalog_categories else [],
-            'model_categories': model_categories if model_categories else [],
-            'fetched': True
-        }
         st.session_state.last_search_term = search_term
     
+    # Batch lookups: pick the term to review and save (one at a time)
+    batch = st.session_state.get('live_entry_batch')
+    if batch:
+        st.markdown("---")
+        st.markdown("### Batch Results")
+        st.dataframe(live_entry_batch_summary(batch), use_container_width=True, hide_index=True)
+        terms = list(batch)
+        current = st.session_state.live_entry_data['search_term']
+        selected_term = st.selectbox(
+            "Term to review",
+            options=terms,
+            index=terms.index(current) if current in terms else 0,
+            key="live_entry_batch_term"
+        )
+        if selected_term != current:
+            # Keep unsaved edits of the term being left
+            if current in batch:
+                batch[current]['model_categories'] = st.session_state.live_entry_data['model_categories']
+            result = batch[selected_term]
+            set_live_entry(selected_term, result['catalog_categories'], result['model_categories'])
+    
     # Step 3: Edit Categories (shown if data is fetched)
     if st.session_state.live_entry_data['fetched']:
         st.markdown("---")
@@ -762,13 +828,13 @@ def show_live_entry_generator():
                         min_value=0,
                         value=cat.get('boostValue', 100),
                         step=10,
-                        key=f"live_boost_{idx}",
+                        key=f"live_boost_{data['search_term']}_{idx}",
                         label_visibility="collapsed"
                     )
                     cat['boostValue'] = new_boost
                 
                 with col4:
-                    if st.button("🗑️", key=f"live_remove_{idx}", help="Remove category"):
+                    if st.button("🗑️", key=f"live_remove_{data['search_term']}_{idx}", help="Remove category"):
                         categories_to_remove.append(idx)
                 
                 updated_categories.append(cat)
@@ -784,21 +850,14 @@ def show_live_entry_generator():
         col1, col2, col3 = st.columns([3, 1.5, 0.8])
         
         with col1:
-            category_options = [""] + [f"{code} - {name}" for code, name in sorted(c3_categories.items(), key=lambda x: x[1])]
-            selected_category = st.selectbox(
-                "Select Category",
-                options=category_options,
-                key="live_add_category",
-                label_visibility="collapsed"
-            )
+            selected_code = category_picker("live_add_category", data.get('search_term'), blank=True, label_visibility="collapsed")
         
         with col2:
             add_boost = st.number_input("Boost", min_value=0, value=100, step=10, key="live_add_boost", label_visibility="collapsed")
         
         with col3:
             if st.button("➕ Add", key="live_add_btn", use_container_width=True):
-                if selected_category:
-                    selected_code = selected_category.split(" - ")[0]
+                if selected_code:
                     selected_name = c3_categories[selected_code]
                     
                     # Check if already exists
@@ -813,7 +872,6 @@ def show_live_entry_generator():
                         # Update session state without closing dialog
                         st.session_state.live_entry_data = data
                         st.success(f"✅ Added {selected_name}")
-                        # Use st.rerun() to refresh but keep dialog open
                     else:
                         st.warning("⚠️ Category already exists")
         
@@ -838,7 +896,19 @@ def show_live_entry_generator():
                 if success:
                     st.success(f"✅ {message}")
                     st.balloons()
+                    # Continue with the next term of a batch, if any
+                    batch = st.session_state.get('live_entry_batch')
+                    if batch:
+                        batch.pop(data['search_term'], None)
+                        st.session_state.pop('live_entry_batch_term', None)
+                        if batch:
+                            next_term = next(iter(batch))
+                            set_live_entry(next_term, batch[next_term]['catalog_categories'], batch[next_term]['model_categories'])
+                            # A rerun closes the dialog; the main page reopens it on the next term
+                            st.session_state.live_entry_reopen = True
+                            st.rerun()
                     # Clear session state
+                    st.session_state.live_entry_batch = None
                     st.session_state.live_entry_data = {
                         'search_term': '',
                         'catalog_categories': [],
@@ -851,6 +921,10 @@ def show_live_entry_generator():
                     st.error(f"❌ {message}")
 
 
+# Products fetched per side of a comparison (the search API returns 40 per page)
+COMPARISON_DEPTHS = [40, 100, 200]
+
+
 @st.dialog("Product Comparison", width="large")
 def show_product_comparison_dialog(term):
     """Dialog for showing side-by-side product comparison"""
@@ -870,7 +944,7 @@ def show_product_comparison_dialog(term):
         st.session_state.comparison_term = term
     
     # Environment selector - always shown
-    col_env1, col_env2 = st.columns([3, 1])
+    col_env1, col_depth, col_env2 = st.columns([2, 1, 1])
     with col_env1:
         environment = st.selectbox(
             "🌍 Select Environment",
@@ -881,6 +955,14 @@ def show_product_comparison_dialog(term):
         )
         st.session_state.comparison_environment = environment
     
+    with col_depth:
+        depth = st.selectbox(
+            "📏 Products per side",
+            options=COMPARISON_DEPTHS,
+            help="Deeper comparisons fetch several result pages concurrently",
+            key=f"comparison_depth_{term}"
+        )
+    
     with col_env2:
         # Add spacing to align button with selectbox
         st.markdown("<div style='margin-top: 26px;'></div>", unsafe_allow_html=True)
@@ -900,25 +982,14 @@ def show_product_comparison_dialog(term):
         st.error("❌ Database connection failed")
         return
     
-    collection = connector.get_collection('search_term_categories')
-    term_data = collection.find_one({'searchTerm': term})
+    term_data = get_term_data(term, COMPARISON_PROJECTION)
     
     if not term_data:
         st.error(f"Term '{term}' not found in database")
         return
     
-    # Extract model category codes
-    model_categories = term_data.get('modelIdentifiedCategories', [])
-    
-    # Apply boost value filtering (only categories with boost > 0)
-    active_categories = [cat for cat in model_categories if cat.get('boostValue', 100) > 0]
-    category_codes = [cat['code'] for cat in active_categories]
-    
-    # Build boost parameter for lowerEnv (format: c1:100,c2:101,c3:103)
-    boost_param = None
-    if environment == "lowerEnv" and active_categories:
-        boost_pairs = [f"{cat['code']}:{cat.get('boostValue', 100)}" for cat in active_categories]
-        boost_param = ",".join(boost_pairs)
+    # Active AI categories (boost > 0), their codes and the lowerEnv boost parameter (c1:100,c2:101,c3:103)
+    active_categories, category_codes, include_search_term_in_ai, boost_param = comparison_params(term_data, environment)
     
     # Show active AI categories (always expanded)
     if active_categories:
@@ -933,33 +1004,39 @@ def show_product_comparison_dialog(term):
         
         st.markdown("<div style='margin: 15px 0;'></div>", unsafe_allow_html=True)
     
-    # Determine term type for AI category request
-    term_type = term_data.get('termType', 'filterConfiguration')
-    
-    # Fetch products for both scenarios
-    with st.spinner("🔄 Fetching products..."):
-        # Control: With searchTerm, no category filter
-        control_products, control_error = fetch_products(
-            term, 
-            category_codes=None, 
-            limit=40, 
-            include_search_term=True,
-            environment=environment,
-            boost_param=None
-        )
-        
-        # AI Categories: Behavior depends on termType
-        # - boostingConfiguration: Include searchTerm with category filters (boost existing results)
-        # - filterConfiguration: Only category filters, no searchTerm (pure category filtering)
-        include_search_term_in_ai = (term_type == 'boostingConfiguration')
-        ai_products, ai_error = fetch_products(
-            term, 
-            category_codes=category_codes, 
-            limit=40, 
-            include_search_term=include_search_term_in_ai,
-            environment=environment,
-            boost_param=boost_param
-        )
+    # Terms under review have a precomputed snapshot (utils.comparison_snapshots); it is
+    # only used while it matches the current AI categories and boosts
+    snapshot = None
+    if depth == SNAPSHOT_LIMIT:
+        snapshot = get_current_snapshot(connector.db, term, term_data, environment)
+    if snapshot:
+        col_snap, col_live = st.columns([3, 1])
+        with col_live:
+            # True for this run only; the next rerun shows the snapshot this refresh stores
+            if st.button("🔄 Refresh live", use_container_width=True, key=f"refresh_live_{term}"):
+                # Skip the shared comparison cache, whose entry can be older than the snapshot
+                invalidate_comparisons(term)
+                snapshot = None
+        if snapshot:
+            with col_snap:
+                st.caption(f"📸 Snapshot from {snapshot['createdDate'].strftime('%Y-%m-%d %H:%M IST')}")
+    
+    if snapshot:
+        control_products, control_error = snapshot['control'], None
+        ai_products, ai_error = snapshot['ai'], None
+    else:
+        # Fetch products for both scenarios concurrently (cached across sessions, see utils.product_comparison)
+        with st.spinner("🔄 Fetching products..."):
+            (control_products, control_error), (ai_products, ai_error) = fetch_comparison(
+                term,
+                category_codes,
+                include_search_term_in_ai,
+                environment=environment,
+                boost_param=boost_param,
+                limit=depth
+            )
+        if depth == SNAPSHOT_LIMIT and not control_error and not ai_error:
+            save_live_snapshot(connector.db, term, term_data, environment, control_products, ai_products, now_ist())
     
     # Display any errors
     if control_error:
@@ -1042,7 +1119,7 @@ def show_product_comparison_dialog(term):
                         product = control_products[i + j]
                         with cols[j]:
                             if product['image']:
-                                st.markdown(f'<img src="{product["image"]}" class="product-image" />', unsafe_allow_html=True)
+                                st.markdown(f'<img src="{thumbnail_url(product["image"])}" class="product-image" loading="lazy" />', unsafe_allow_html=True)
                             else:
                                 st.markdown('<div style="width: 100%; height: 150px; background-color: #e9ecef; display: flex; align-items: center; justify-content: center; border-radius: 5px; margin-bottom: 8px;">📦</div>', unsafe_allow_html=True)
                             
@@ -1084,7 +1161,7 @@ def show_product_comparison_dialog(term):
                         product = ai_products[i + j]
                         with cols[j]:
                             if product['image']:
-                                st.markdown(f'<img src="{product["image"]}" class="product-image" />', unsafe_allow_html=True)
+                                st.markdown(f'<img src="{thumbnail_url(product["image"])}" class="product-image" loading="lazy" />', unsafe_allow_html=True)
                             else:
                                 st.markdown('<div style="width: 100%; height: 150px; background-color: #e9ecef; display: flex; align-items: center; justify-content: center; border-radius: 5px; margin-bottom: 8px;">📦</div>', unsafe_allow_html=True)
                             
@@ -1105,8 +1182,17 @@ def show_trends_dialog(term):
     """Dialog for showing CTR/CVR trends"""
     st.subheader(f"📈 Performance Trends: **{term}**")
     
+    # Only read the window that is being charted
+    window_days = st.selectbox(
+        "Time Window",
+        options=[30, 90, 365, None],
+        index=1,
+        format_func=lambda x: "All history" if x is None else f"Last {x} days",
+        key=f"trend_window_{term}"
+    )
+    
     # Get trends data
-    trends_data = get_trends_data(term)
+    trends_data = get_trends_data(term, days=window_days, version=term_cache_version(term))
     
     if not trends_data:
         st.warning("No trends data available for this term")
@@ -1120,102 +1206,98 @@ def show_trends_dialog(term):
         st.warning("Incomplete trends data")
         return
     
-    # Get edit history for markers
-    term_data = get_term_data(term)
-    edit_history = term_data.get('editHistory', []) if term_data else []
+    # Get edit history for markers (only the events inside the charted window)
+    window_start = timestamps[0] if window_days is not None else None
+    edit_history = load_edit_events(term, window_start, timestamps[-1], term_cache_version(term))
     
-    # Create dual-axis chart
+    # Create dual-axis chart; long histories are downsampled to the chart's resolution
+    # (statistics below still use every point)
     fig = go.Figure()
+    show_point_markers = len(timestamps) <= MAX_CHART_POINTS
     
     # Add CTR line
+    ctr_x, ctr_y = downsample(timestamps, ctr)
     fig.add_trace(go.Scatter(
-        x=timestamps,
-        y=ctr,
+        x=ctr_x,
+        y=ctr_y,
         name='CTR (Click-Through Rate)',
-        mode='lines+markers',
+        mode='lines+markers' if show_point_markers else 'lines',
         line=dict(color='#1971c2', width=3),
         marker=dict(size=8),
         yaxis='y'
     ))
     
     # Add CVR line
+    cvr_x, cvr_y = downsample(timestamps, cvr)
     fig.add_trace(go.Scatter(
-        x=timestamps,
-        y=cvr,
+        x=cvr_x,
+        y=cvr_y,
         name='CVR (Conversion Rate)',
-        mode='lines+markers',
+        mode='lines+markers' if show_point_markers else 'lines',
         line=dict(color='#28a745', width=3),
         marker=dict(size=8),
         yaxis='y'
     ))
     
-    # Add edit history markers and annotations
-    edit_markers_x = []
-    edit_markers_y = []
-    edit_labels = []
-    
+    # Edit markers: one point per edited day (several edits on a day share it)
+    date_index = {date: i for i, date in enumerate(timestamps)}
+    edits_by_day = {}
     for edit in edit_history:
         edit_time = edit.get('timestamp')
         if edit_time:
             # Convert timestamp to string format for matching
             if isinstance(edit_time, datetime):
                 edit_time_str = edit_time.strftime('%Y-%m-%d')
+                edit_time_display = utc_to_ist(edit_time).strftime('%Y-%m-%d %H:%M IST')
             else:
                 edit_time_str = str(edit_time)
+                edit_time_display = str(edit_time)
             
             # Check if this timestamp exists in our trends data
-            if edit_time_str in timestamps:
-                idx = timestamps.index(edit_time_str)
-                
-                # Add vertical line for each edit
-                fig.add_vline(
-                    x=edit_time_str,
-                    line_dash="dash",
-                    line_color="#ff6b35",
-                    line_width=2,
-                    opacity=0.7
-                )
-                
-                # Prepare annotation
-                action = edit.get('action', 'Edit')
-                action_icon = {
-                    'boost_update': '⚡',
-                    'category_added': '➕',
-                    'category_removed': '➖',
-                    'auto_locked': '🔒',
-                    'created': '🆕'
-                }.get(action, '✏️')
-                
-                # Add scatter point for the edit
-                edit_markers_x.append(edit_time_str)
-                edit_markers_y.append(ctr[idx])
-                edit_labels.append(f"{action_icon} {action}")
-    
-    # Add edit markers as scatter points with detailed hover
-    if edit_markers_x:
-        # Create detailed hover text for each edit
+            if edit_time_str in date_index:
+                edits_by_day.setdefault(edit_time_str, []).append((edit, edit_time_display))
+    
+    if edits_by_day:
+        edit_days = sorted(edits_by_day)
+        
+        # All vertical edit lines as one trace instead of one layout shape per edit
+        line_x, line_y = [], []
+        for day in edit_days:
+            line_x += [day, day, None]
+            line_y += [0, 1, None]
+        fig.add_trace(go.Scatter(
+            x=line_x,
+            y=line_y,
+            mode='lines',
+            line=dict(color='#ff6b35', width=2, dash='dash'),
+            opacity=0.7,
+            hoverinfo='skip',
+            showlegend=False
+        ))
+        
+        edit_labels = []
         hover_texts = []
-        for edit in edit_history:
-            edit_time = edit.get('timestamp')
-            if edit_time:
-                if isinstance(edit_time, datetime):
-                    ist_time = utc_to_ist(edit_time)
-                    edit_time_str = ist_time.strftime('%Y-%m-%d')
-                    edit_time_display = ist_time.strftime('%Y-%m-%d %H:%M IST')
-                else:
-                    edit_time_str = str(edit_time)
-                    edit_time_display = str(edit_time)
-                
-                if edit_time_str in timestamps:
-                    action = edit.get('action', 'Edit')
-                    details = edit.get('details', 'No details')
-                    hover_text = f"<b>{action}</b><br>{details}<br>Date: {edit_time_display}"
-                    hover_texts.append(hover_text)
+        for day in edit_days:
+            day_edits = edits_by_day[day]
+            action = day_edits[-1][0].get('action', 'Edit')
+            action_icon = {
+                'boost_update': '⚡',
+                'category_added': '➕',
+                'category_removed': '➖',
+                'auto_locked': '🔒',
+                'created': '🆕'
+            }.get(action, '✏️')
+            edit_labels.append(f"{action_icon} {action}" + (f" +{len(day_edits) - 1}" if len(day_edits) > 1 else ""))
+            hover_texts.append("<br><br>".join(
+                f"<b>{edit.get('action', 'Edit')}</b><br>{edit.get('details', 'No details')}<br>Date: {display}"
+                for edit, display in day_edits
+            ))
         
+        # Add edit markers as scatter points with detailed hover; labels only while they stay readable
         fig.add_trace(go.Scatter(
-            x=edit_markers_x,
-            y=edit_markers_y,
-            mode='markers+text',
+            x=edit_days,
+            y=[ctr[date_index[day]] for day in edit_days],
+            mode='markers+text' if len(edit_days) <= MAX_EDIT_LABELS else 'markers',
             name='Edits',
             marker=dict(
                 size=12,
@@ -1307,16 +1389,24 @@ def edit_term_dialog(term):
     st.subheader(f"🧠 AI Category Management: **{term}**")
     
     # Get fresh data
-    term_data = get_term_data(term)
+    # Primary read: the version shown here is what the next edit is checked against
+    term_data = get_term_data(term, EDIT_PROJECTION, primary=True)
     
     if not term_data:
         st.error("Term data not found")
         return
     
+    # Optimistic concurrency: edits are checked against the version shown on the previous
+    # render, since this rerun has already reloaded the document
+    seen_key = f"edit_seen_version_{term}"
+    current_version = version_of(term_data)
+    expected_version = st.session_state.get(seen_key, current_version)
+    if expected_version != current_version:
+        st.info("🔄 This term was changed by another editor; the values below are the latest.")
+    st.session_state[seen_key] = current_version
+    
     # Load C3 categories
-    if st.session_state.c3_categories is None:
-        st.session_state.c3_categories = load_c3_categories()
-    c3_categories = st.session_state.c3_categories
+    c3_categories = get_c3_categories()
     
     # Create tabs
     tab1, tab2 = st.tabs(["⚡ Optimize Boost Weights", "➕ Manage AI Categories"])
@@ -1356,10 +1446,13 @@ def edit_term_dialog(term):
                 with col4:
                     if new_boost != cat['boostValue']:
                         if st.button("💾 Save", key=f"save_{term}_{cat['code']}_{idx}", help="Save changes", use_container_width=True):
-                            if update_boost_value(term, cat['code'], new_boost):
+                            result = update_boost_value(term, cat['code'], new_boost, expected_version)
+                            if result.status == EDIT_OK:
                                 st.success(f"✓ Boost value updated to {new_boost}")
                                 st.balloons()
                                 st.rerun()
+                            elif result.status == EDIT_CONFLICT:
+                                show_edit_conflict(result, cat['code'])
                             else:
                                 st.error("✗ Failed to update")
                     else:
@@ -1376,16 +1469,10 @@ def edit_term_dialog(term):
         with col1:
             st.markdown("### ➕ Add Category")
             
-            # Category selection
-            category_options = [f"{code} - {name}" for code, name in sorted(c3_categories.items(), key=lambda x: x[1])]
-            selected_category = st.selectbox(
-                "Select Category",
-                options=category_options,
-                key=f"add_cat_{term}"
-            )
+            # Category selection (top matches only, suggestions from similar terms)
+            selected_code = category_picker(f"add_cat_{term}", term)
             
-            if selected_category:
-                selected_code = selected_category.split(" - ")[0]
+            if selected_code:
                 selected_name = c3_categories[selected_code]
                 
                 # Check if already exists
@@ -1398,10 +1485,13 @@ def edit_term_dialog(term):
                     st.caption("💡 Enter any integer value (e.g., 50, 100, 200, 500, etc.)")
                     
                     if st.button("➕ Add Category", type="primary", use_container_width=True, key=f"add_btn_{term}"):
-                        if add_model_category(term, selected_code, selected_name, boost):
+                        result = add_model_category(term, selected_code, selected_name, boost, expected_version)
+                        if result.status == EDIT_OK:
                             st.success(f"✓ Successfully added '{selected_name}' with boost value {boost}")
                             st.balloons()
                             st.rerun()
+                        elif result.status == EDIT_CONFLICT:
+                            show_edit_conflict(result)
                         else:
                             st.error("✗ Failed to add category")
         
@@ -1424,9 +1514,12 @@ def edit_term_dialog(term):
                     
                     with col_btn:
                         if st.button("🗑️ Remove", key=f"remove_{term}_{cat['code']}", help="Remove category", use_container_width=True, type="secondary"):
-                            if remove_model_category(term, cat['code']):
+                            result = remove_model_category(term, cat['code'], expected_version)
+                            if result.status == EDIT_OK:
                                 st.success(f"✓ Removed '{cat['name']}' from AI categories")
                                 st.rerun()
+                            elif result.status == EDIT_CONFLICT:
+                                show_edit_conflict(result, cat['code'])
                             else:
                                 st.error("✗ Failed to remove")
                     
@@ -1461,6 +1554,173 @@ def edit_term_dialog(term):
                 st.error("✗ Failed to delete term")
 
 
+@st.dialog("Bulk Edit Boosts & Categories", width="large")
+def show_bulk_edit_dialog():
+    """Dialog for applying boost/category changes to many terms at once"""
+    st.subheader("🧰 Bulk Edit")
+    st.caption("Changes are validated against the C3 taxonomy. Locked terms are skipped and every row gets a result.")
+    
+    connector = get_db()
+    if not connector:
+        st.error("❌ Database connection failed")
+        return
+    
+    c3_categories = get_c3_categories()
+    
+    mode = st.radio(
+        "Source",
+        options=["csv", "filter"],
+        format_func=lambda x: "📄 Upload CSV (term, code, boost)" if x == "csv" else "🔎 All terms matching a filter",
+        horizontal=True,
+        key="bulk_edit_mode"
+    )
+    
+    changes = []
+    if mode == "csv":
+        uploaded = st.file_uploader("Changes CSV", type=["csv"], key="bulk_edit_csv")
+        st.caption("💡 Columns: term, code, boost. A code the term does not have yet is added as a manual category.")
+        if uploaded is not None:
+            try:
+                changes = read_changes_csv(uploaded.getvalue())
+            except ValueError as e:
+                st.error(f"❌ {e}")
+                return
+    else:
+        col1, col2 = st.columns(2)
+        with col1:
+            code = category_picker("bulk_edit_code")
+            boost = st.number_input("New Boost Value", min_value=0, value=150, step=10, key="bulk_edit_boost")
+        with col2:
+            status = st.selectbox(
+                "Status",
+                options=["in_progress", "all"],
+                format_func=lambda x: "🔄 In Progress" if x == "in_progress" else "📋 All Statuses",
+                key="bulk_edit_status"
+            )
+            trend = st.selectbox(
+                "Trend",
+                options=["all", "improvement", "underperforming", "neutral"],
+                key="bulk_edit_trend"
+            )
+        if st.button("🔎 Find Matching Terms", use_container_width=True, key="bulk_edit_find", disabled=code is None):
+            filter_query = build_term_filter(None, None if status == "all" else status, trend)
+            st.session_state.bulk_edit_filter_changes = changes_for_filter(connector.db, filter_query, code, boost)
+        changes = st.session_state.get('bulk_edit_filter_changes', [])
+    
+    if not changes:
+        st.info("👆 Provide changes to preview")
+        return
+    
+    preview = apply_bulk_changes(connector.db, changes, c3_categories, now_ist(), dry_run=True)
+    counts = summarize_results(preview)
+    st.markdown(f"**{len(changes)} change(s)** — ✅ {counts.get('valid', 0)} valid, ❌ {counts.get('invalid', 0)} invalid")
+    if counts.get('invalid'):
+        st.dataframe(pd.DataFrame([r for r in preview if r['status'] == 'invalid']), use_container_width=True, hide_index=True)
+    
+    if counts.get('valid') and st.button("💾 Apply Changes", type="primary", use_container_width=True, key="bulk_edit_apply"):
+        with st.spinner("Applying changes..."):
+            results = apply_bulk_changes(connector.db, changes, c3_categories, now_ist())
+        invalidate_term_counts()
+        for term in {r['term'] for r in results if r['status'] in (RESULT_UPDATED, RESULT_ADDED)}:
+            invalidate_comparisons(term)
+            bump_term_cache(term)
+        st.session_state.pop('bulk_edit_filter_changes', None)
+        
+        counts = summarize_results(results)
+        st.success("✓ Bulk edit finished: " + ", ".join(f"{status}: {count}" for status, count in sorted(counts.items())))
+        results_df = pd.DataFrame(results)
+        st.dataframe(results_df, use_container_width=True, hide_index=True)
+        st.download_button(
+            "⬇️ Download Results",
+            data=results_df.to_csv(index=False),
+            file_name="bulk_edit_results.csv",
+            mime="text/csv",
+            key="bulk_edit_download"
+        )
+
+
+@st.cache_data(ttl=DASHBOARD_TTL, show_spinner=False)
+def load_dashboard_metrics():
+    """
+    Stored dashboard metrics (see utils.dashboard_metrics)
+    
+    Starts a background refresh when the term metrics are stale; edit
+    volume is brought up to date by the same refresh.
+    """
+    connector = get_db()
+    if not connector:
+        return None, []
+    
+    now = now_ist()
+    terms, edits_per_day = get_metrics(connector.db)
+    if terms is None or (now - terms['computedDate']).total_seconds() >= TERM_METRICS_TTL:
+        refresh_metrics_async(connector.db, now)
+    return terms, edits_per_day
+
+
+def counts_frame(counts, label):
+    """DataFrame of a {value: count} dict, largest first"""
+    return pd.DataFrame(
+        sorted(counts.items(), key=lambda item: -item[1]), columns=[label, "Terms"]
+    ).set_index(label)
+
+
+@st.dialog("Dashboard", width="large")
+def show_dashboard_dialog():
+    """Term and edit metrics, read from the precomputed dashboard documents"""
+    st.subheader("📈 Dashboard")
+    
+    terms, edits_per_day = load_dashboard_metrics()
+    if terms is None:
+        st.info("⏳ Metrics are being computed for the first time. Reopen the dashboard in a minute.")
+        return
+    
+    caption = f"Computed {terms['computedDate'].strftime('%Y-%m-%d %H:%M IST')}"
+    if is_refreshing():
+        caption += " · refreshing in the background"
+    st.caption(caption)
+    
+    by_status = terms['byStatus']
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        st.metric("Terms", f"{terms['total']:,}")
+    with col2:
+        st.metric("🔄 In Progress", f"{by_status.get('in_progress', 0):,}")
+    with col3:
+        st.metric("🔒 Locked", f"{by_status.get('locked', 0):,}")
+    with col4:
+        st.metric("📝 Edits (last day)", f"{edits_per_day[-1][1]:,}" if edits_per_day else "0")
+    
+    col1, col2 = st.columns(2)
+    with col1:
+        st.markdown("**Trend**")
+        st.bar_chart(counts_frame(terms['byTrend'], "Trend"))
+    with col2:
+        st.markdown("**Term Type**")
+        st.bar_chart(counts_frame(terms['byTermType'], "Term Type"))
+    
+    col1, col2 = st.columns(2)
+    with col1:
+        st.markdown("**Boost Values** (AI categories)")
+        boosts = terms['boostDistribution']
+        st.bar_chart(pd.DataFrame(
+            {"Categories": [boosts.get(label, 0) for label in BOOST_LABELS]}, index=BOOST_LABELS
+        ))
+    with col2:
+        st.markdown("**Edits per Day**")
+        if edits_per_day:
+            st.bar_chart(pd.DataFrame(edits_per_day, columns=["Day", "Edits"]).set_index("Day"))
+        else:
+            st.caption("No edits yet")
+    
+    st.markdown("**Top AI Categories**")
+    st.dataframe(
+        pd.DataFrame(terms['topCategories']).rename(columns={'code': 'Code', 'name': 'Name', 'count': 'Terms'}),
+        use_container_width=True,
+        hide_index=True
+    )
+
+
 # Main UI - Display Logo and Title
 st.markdown("""
 <style>
@@ -1640,7 +1900,7 @@ function scrollToTop() {
 if True:  # Keep existing logic structure
     # Original Category Manager Page
     # Top action bar with live entry generator
-    col_action1, col_action2 = st.columns([6, 2])
+    col_action1, col_action_dashboard, col_action_bulk, col_action2 = st.columns([4, 1.5, 1.5, 2])
     
     with col_action1:
         st.markdown("""
@@ -1649,15 +1909,24 @@ if True:  # Keep existing logic structure
         </div>
         """, unsafe_allow_html=True)
     
+    with col_action_dashboard:
+        if st.button("📈 Dashboard", use_container_width=True):
+            show_dashboard_dialog()
+    
+    with col_action_bulk:
+        if st.button("🧰 Bulk Edit", use_container_width=True):
+            show_bulk_edit_dialog()
+    
     with col_action2:
-        if st.button("🚀 Generate New Entry", use_container_width=True, type="primary"):
+        # Also reopened after saving one term of a batch (live_entry_reopen)
+        if st.button("🚀 Generate New Entry", use_container_width=True, type="primary") or st.session_state.pop('live_entry_reopen', False):
             show_live_entry_generator()
     
     st.divider()
     
     # Search bar and filters at top with improved design
     st.markdown('<div class="fade-in">', unsafe_allow_html=True)
-    col1, col2, col3, col4 = st.columns([2.5, 1.75, 1.75, 1])
+    col1, col2, col3, col_sort, col4 = st.columns([2.5, 1.5, 1.5, 1.5, 1])
 
     with col1:
         search_input = st.text_input(
@@ -1690,9 +1959,27 @@ if True:  # Keep existing logic structure
             label_visibility="collapsed"
         )
 
+    with col_sort:
+        # Score orders need scripts/evaluate_relevance.py; searches are ranked by the search index
+        sort_order = st.selectbox(
+            "Sort by",
+            options=["updated", "loads", "overlap", "purity"],
+            format_func=lambda x: "🕒 Recently Updated" if x == "updated" else "🔥 Most Searched" if x == "loads" else "🔀 Lowest Overlap (RBO)" if x == "overlap" else "🎯 Lowest Category Purity",
+            index=0,
+            key="sort_order",
+            help="Search results are ranked by match, then Loads",
+            label_visibility="collapsed"
+        )
+
     with col4:
         if st.button("🔄 Refresh", use_container_width=True):
-            st.cache_data.clear()
+            # Only the list's own caches; trends and edit events expire by TTL
+            invalidate_term_counts()
+            connector = get_db()
+            if connector:
+                index = get_term_search_index(connector.db)
+                if index.ready:
+                    index.refresh(connector.db)
             st.rerun()
 
     st.markdown('</div>', unsafe_allow_html=True)
@@ -1706,11 +1993,26 @@ if True:  # Keep existing logic structure
 
     # Main content area
     page_size = 10
-    skip = st.session_state.current_page * page_size
 
     # Get data with status and trend filters
     filter_status = None if status_filter == "all" else status_filter
-    terms, total = get_terms(skip=skip, limit=page_size, query=st.session_state.search_query, status_filter=filter_status, trend_filter=trend_filter)
+
+    # Page tokens only make sense for the filters they were issued for
+    filter_key = (st.session_state.search_query, filter_status, trend_filter, sort_order)
+    if st.session_state.get('page_filter_key') != filter_key:
+        st.session_state.page_filter_key = filter_key
+        st.session_state.current_page = 0
+        st.session_state.page_tokens = [None]
+
+    # The table and its trend filter read only the materialized trendStatus; terms
+    # without it (counted by the precomputed dashboard metrics) show as neutral
+    term_metrics, _ = load_dashboard_metrics()
+    unmaterialized = (term_metrics or {}).get('byTrend', {}).get('unknown', 0)
+    if unmaterialized:
+        st.warning(f"⚠️ {unmaterialized:,} terms have no materialized trend statistics and are shown as neutral. Run `python scripts/materialize_trend_stats.py` to compute them.")
+
+    page_token = st.session_state.page_tokens[st.session_state.current_page]
+    terms, total, next_token = get_terms(page_token=page_token, limit=page_size, query=st.session_state.search_query, status_filter=filter_status, trend_filter=trend_filter, sort=sort_order)
 
     if terms:
         # Add CSS for sticky header and compact display
@@ -1833,8 +2135,9 @@ if True:  # Keep existing logic structure
             else:
                 model_display = "—"
             
-            # Calculate trend status
-            trend_status, pct_change = calculate_trend_status(term)
+            # Trend status (loaded with the page, no extra query)
+            trend_status = format_trend_status(term_doc['trendStatus'])
+            pct_change = term_doc['pctChange5d']
             
             # Format trend status with color (single line, compact)
             if trend_status == "Underperforming":
@@ -1861,6 +2164,17 @@ if True:  # Keep existing logic structure
             with col4:
                 # Trend status badge
                 st.markdown(f"<div style='text-align: center;'>{trend_badge}</div>", unsafe_allow_html=True)
+                # Offline relevance scores (scripts/evaluate_relevance.py), when evaluated
+                scores = term_doc.get('relevanceScores') or {}
+                if scores.get('rbo') is not None:
+                    purity = scores.get('purity')
+                    purity_text = f" · Purity {purity:.0%}" if purity is not None else ""
+                    st.markdown(
+                        f"<div style='text-align: center; font-size: 0.75em; color: #666; margin-top: 4px;' "
+                        f"title='Rank-biased overlap of control vs AI results | share of control results in the AI categories'>"
+                        f"RBO {scores['rbo']:.2f}{purity_text}</div>",
+                        unsafe_allow_html=True
+                    )
         
             with col5:
                 # Format updatedDate in IST
@@ -1924,7 +2238,8 @@ if True:  # Keep existing logic structure
     
         col1, col2, col3, col4, col5 = st.columns([1, 1, 2, 1, 1])
     
-        total_pages = (total + page_size - 1) // page_size
+        # The total is cached for a short while, so never show fewer pages than were reached
+        total_pages = max((total + page_size - 1) // page_size, st.session_state.current_page + 1)
     
         with col1:
             if st.session_state.current_page > 0:
@@ -1946,8 +2261,9 @@ if True:  # Keep existing logic structure
             """, unsafe_allow_html=True)
     
         with col5:
-            if st.session_state.current_page < total_pages - 1:
+            if next_token is not None:
                 if st.button("Next ➡️", use_container_width=True, key="next_page"):
+                    st.session_state.page_tokens = st.session_state.page_tokens[:st.session_state.current_page + 1] + [next_token]
                     st.session_state.current_page += 1
                     # Scroll to top after page change
                     st.markdown("""
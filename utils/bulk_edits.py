@@ -0,0 +1,273 @@
+"""
+Bulk boost and category edits across many terms
+
+Changes are (term, code, boost) rows, either uploaded as a CSV or derived
+from a filter ("every in-progress term with Sepatu Lari gets boost 150").
+apply_bulk_changes works in chunks of BATCH_SIZE terms; per chunk it costs:
+
+- one read of the chunk's terms (current categories, status and version)
+- one unordered bulk_write with one versioned pipeline update per term, all
+  rows of a term folded into it, so termType and auto-lock are recomputed
+  exactly as for single edits (see utils/term_edits.py)
+- one insert_many into edit_events for the audit entries
+
+and every input row gets a result: updated, added, unchanged, invalid,
+not_found, locked or conflict. A term edited by someone else between the read
+and the write fails its version check and is reported as a conflict instead
+of being overwritten.
+
+Reads go to the primary, and each chunk's updates stamp the chunk's run id
+into the term's bulkEditIds (the last BULK_RUN_IDS_KEPT runs). When some
+version checks fail, the terms carrying the run id are exactly the ones
+this chunk wrote, whatever other editors did afterwards.
+"""
+
+import io
+
+import pandas as pd
+from bson import ObjectId
+from pymongo import ReadPreference, UpdateOne
+
+from utils.edit_events import build_edit_event, log_edit_events
+from utils.term_edits import auto_lock_event, edit_pipeline, versioned, version_of, was_auto_locked
+
+TERMS_COLLECTION = 'search_term_categories'
+
+# Terms read, written and audited per round
+BATCH_SIZE = 1000
+# Bulk run ids remembered per term (see _stamp_run)
+BULK_RUN_IDS_KEPT = 10
+
+CSV_COLUMNS = ('term', 'code', 'boost')
+
+# dry runs report valid rows as RESULT_VALID
+RESULT_VALID = 'valid'
+RESULT_UPDATED = 'updated'
+RESULT_ADDED = 'added'
+RESULT_UNCHANGED = 'unchanged'
+RESULT_INVALID = 'invalid'
+RESULT_NOT_FOUND = 'not_found'
+RESULT_LOCKED = 'locked'
+RESULT_CONFLICT = 'conflict'
+
+
+def read_changes_csv(data):
+    """
+    Parse an uploaded CSV of changes
+
+    Args:
+        data: Bytes, text or a file-like object with term, code and boost columns
+            (header names are case-insensitive)
+
+    Returns:
+        List of change dicts with row (1-based data row), term, code and boost
+    """
+    if isinstance(data, bytes):
+        data = io.BytesIO(data)
+    elif isinstance(data, str):
+        data = io.StringIO(data)
+    df = pd.read_csv(data, dtype=str, keep_default_na=False)
+    df.columns = [col.strip().lower() for col in df.columns]
+    missing = [col for col in CSV_COLUMNS if col not in df.columns]
+    if missing:
+        raise ValueError(f"CSV is missing column(s): {', '.join(missing)}")
+
+    return [
+        {'row': i + 1, 'term': term.strip(), 'code': code.strip(), 'boost': boost.strip()}
+        for i, (term, code, boost) in enumerate(zip(df['term'], df['code'], df['boost']))
+    ]
+
+
+def changes_for_filter(db, filter_query, code, boost):
+    """
+    One change per term matching filter_query that already has the category
+
+    Args:
+        filter_query: Term filter, e.g. from utils.term_queries.build_term_filter
+    """
+    query = {'modelIdentifiedCategories.code': code}
+    if filter_query:
+        query = {'$and': [filter_query, query]}
+    cursor = db[TERMS_COLLECTION].find(query, {'_id': 0, 'searchTerm': 1}).batch_size(BATCH_SIZE)
+    return [
+        {'row': i + 1, 'term': doc['searchTerm'], 'code': code, 'boost': boost}
+        for i, doc in enumerate(cursor)
+    ]
+
+
+def _result(change, status, message=''):
+    return {
+        'row': change['row'],
+        'term': change['term'],
+        'code': change['code'],
+        'boost': change['boost'],
+        'status': status,
+        'message': message,
+    }
+
+
+def validate_changes(changes, taxonomy):
+    """
+    Check changes against the taxonomy
+
+    Args:
+        taxonomy: Dict of C3 code -> name
+
+    Returns:
+        Tuple of (valid changes with boost as int and the category name added,
+        results for the invalid rows)
+    """
+    valid = []
+    invalid = []
+    for change in changes:
+        if not change['term']:
+            invalid.append(_result(change, RESULT_INVALID, 'Missing term'))
+            continue
+        if change['code'] not in taxonomy:
+            invalid.append(_result(change, RESULT_INVALID, f"Unknown category code '{change['code']}'"))
+            continue
+        try:
+            boost = int(float(change['boost']))
+        except (TypeError, ValueError):
+            invalid.append(_result(change, RESULT_INVALID, f"Boost '{change['boost']}' is not a number"))
+            continue
+        if boost < 0:
+            invalid.append(_result(change, RESULT_INVALID, 'Boost must not be negative'))
+            continue
+        valid.append({**change, 'boost': boost, 'name': taxonomy[change['code']]})
+    return valid, invalid
+
+
+def _apply_to_categories(categories, term_changes):
+    """Fold a term's changes into its category list; returns (new list, per-change outcome)"""
+    categories = [dict(cat) for cat in categories]
+    by_code = {cat['code']: cat for cat in categories}
+    outcomes = []
+    for change in term_changes:
+        cat = by_code.get(change['code'])
+        if cat is None:
+            cat = {'code': change['code'], 'name': change['name'], 'score': 0, 'boostValue': change['boost']}
+            categories.append(cat)
+            by_code[change['code']] = cat
+            outcomes.append((RESULT_ADDED, f"Added category '{change['name']}' (boost: {change['boost']})"))
+        elif cat.get('boostValue', 100) == change['boost']:
+            outcomes.append((RESULT_UNCHANGED, f"Boost is already {change['boost']}"))
+        else:
+            message = f"Updated boost for '{cat['name']}' from {cat.get('boostValue', 100)} to {change['boost']}"
+            cat['boostValue'] = change['boost']
+            outcomes.append((RESULT_UPDATED, message))
+    return categories, outcomes
+
+
+def _stamp_run(run_id):
+    """Pipeline stage recording run_id in the term's recent bulkEditIds"""
+    return {'$set': {'bulkEditIds': {'$slice': [
+        {'$concatArrays': [{'$ifNull': ['$bulkEditIds', []]}, [run_id]]},
+        -BULK_RUN_IDS_KEPT
+    ]}}}
+
+
+def _apply_batch(db, by_term, now):
+    """Apply the validated changes of one chunk of terms; returns their results"""
+    # Versions read from a lagging secondary would fail their own version check
+    collection = db[TERMS_COLLECTION].with_options(read_preference=ReadPreference.PRIMARY)
+    run_id = ObjectId()
+
+    docs = {
+        doc['searchTerm']: doc
+        for doc in collection.find(
+            {'searchTerm': {'$in': list(by_term)}},
+            {'searchTerm': 1, 'modelIdentifiedCategories': 1, 'status': 1, 'upwardDays': 1, 'version': 1}
+        )
+    }
+
+    results = []
+    ops = []
+    pending = {}
+    for term, term_changes in by_term.items():
+        doc = docs.get(term)
+        if doc is None:
+            results.extend(_result(change, RESULT_NOT_FOUND, 'Term not found') for change in term_changes)
+            continue
+        if doc.get('status') == 'locked':
+            results.extend(_result(change, RESULT_LOCKED, 'Locked - Control Migrated') for change in term_changes)
+            continue
+
+        categories, outcomes = _apply_to_categories(doc.get('modelIdentifiedCategories', []), term_changes)
+        if all(status == RESULT_UNCHANGED for status, _ in outcomes):
+            results.extend(_result(c, status, msg) for c, (status, msg) in zip(term_changes, outcomes))
+            continue
+
+        ops.append(UpdateOne(
+            versioned({'searchTerm': term}, version_of(doc)),
+            edit_pipeline({'$literal': categories}, now) + [_stamp_run(run_id)]
+        ))
+        pending[term] = (doc, term_changes, outcomes)
+
+    if ops:
+        write = collection.bulk_write(ops, ordered=False)
+        conflicted = set()
+        if write.matched_count < len(ops):
+            # Some version checks failed: the terms this run wrote carry its id, the rest
+            # were changed (or deleted) by someone else between the read and the write
+            conflicted = set(pending)
+            for applied in collection.find(
+                {'searchTerm': {'$in': list(pending)}, 'bulkEditIds': run_id}, {'searchTerm': 1}
+            ):
+                conflicted.discard(applied['searchTerm'])
+
+        events = []
+        for term, (doc, term_changes, outcomes) in pending.items():
+            if term in conflicted:
+                results.extend(
+                    _result(change, RESULT_CONFLICT, 'Changed by another editor during the bulk edit; not applied')
+                    for change in term_changes
+                )
+                continue
+            for change, (status, message) in zip(term_changes, outcomes):
+                results.append(_result(change, status, message))
+                if status == RESULT_UPDATED:
+                    events.append(build_edit_event(term, 'boost_update', f"{message} (bulk edit)", now))
+                elif status == RESULT_ADDED:
+                    events.append(build_edit_event(term, 'category_added', f"{message} (bulk edit)", now))
+            if was_auto_locked(doc):
+                events.append(auto_lock_event(term, doc, now))
+        log_edit_events(db, events)
+
+    return results
+
+
+def apply_bulk_changes(db, changes, taxonomy, now, dry_run=False):
+    """
+    Validate and apply bulk changes
+
+    Args:
+        changes: Change dicts from read_changes_csv or changes_for_filter
+        taxonomy: Dict of C3 code -> name
+        now: Timestamp for updatedDate and the audit entries
+        dry_run: Only validate (valid rows are reported as RESULT_VALID)
+
+    Returns:
+        List of per-row result dicts (row, term, code, boost, status, message), in row order
+    """
+    valid, results = validate_changes(changes, taxonomy)
+    if dry_run:
+        results.extend(_result(change, RESULT_VALID) for change in valid)
+        return sorted(results, key=lambda result: result['row'])
+
+    by_term = {}
+    for change in valid:
+        by_term.setdefault(change['term'], []).append(change)
+    terms = list(by_term)
+    for start in range(0, len(terms), BATCH_SIZE):
+        batch = {term: by_term[term] for term in terms[start:start + BATCH_SIZE]}
+        results.extend(_apply_batch(db, batch, now))
+    return sorted(results, key=lambda result: result['row'])
+
+
+def summarize_results(results):
+    """Count results per status"""
+    counts = {}
+    for result in results:
+        counts[result['status']] = counts.get(result['status'], 0) + 1
+    return counts
@@ -0,0 +1,191 @@
+"""
+Precomputed product comparison snapshots
+
+Opening the comparison dialog used to query the search backend live every
+time. For terms under active review (ACTIVE_REVIEW_DAYS) the snapshotter
+(scripts/comparison_snapshotter.py) stores a compact summary of both sides
+in comparison_snapshots, one document per (searchTerm, environment):
+
+    {
+        'searchTerm': 'adidas',
+        'environment': 'production',
+        'categoryCodes': ['c1', 'c2'],       # the AI request the snapshot was taken with
+        'includeSearchTerm': False,
+        'boostParam': None,
+        'control': [{'id', 'name', 'price', 'rating', 'image'}, ...],
+        'ai': [...],
+        'createdDate': datetime
+    }
+
+image is the source URL the thumbnail server keys its cache on (see
+utils/thumbnail_cache.py). Snapshots are refreshed after every boost or
+category edit and nightly. The dialog shows a snapshot only while its
+request parameters still match the term's current AI categories, so a
+snapshot taken before an edit is never shown as current.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from pymongo import ASCENDING, DESCENDING, UpdateOne
+
+from utils.product_comparison import comparison_params
+from utils.product_fetcher import fetch_products
+
+SNAPSHOTS_COLLECTION = 'comparison_snapshots'
+TERMS_COLLECTION = 'search_term_categories'
+
+# Products stored per side
+SNAPSHOT_LIMIT = 40
+# In-progress terms updated within this many days are snapshotted
+ACTIVE_REVIEW_DAYS = 14
+MAX_ACTIVE_TERMS = 500
+
+SNAPSHOT_TERM_PROJECTION = {'searchTerm': 1, 'termType': 1, 'modelIdentifiedCategories': 1}
+
+_executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix='snapshot-fetch')
+
+
+def ensure_snapshot_indexes(db):
+    """Create the index snapshot reads and upserts rely on (idempotent)"""
+    db[SNAPSHOTS_COLLECTION].create_index(
+        [('searchTerm', ASCENDING), ('environment', ASCENDING)],
+        unique=True,
+        name='searchTerm_environment_unique'
+    )
+
+
+def summarize_products(products):
+    """Compact per-product summary stored in a snapshot"""
+    return [
+        {
+            'id': product['id'],
+            'name': product['name'],
+            'price': product['price'],
+            'rating': product['rating'],
+            'image': product['image'],
+        }
+        for product in products
+    ]
+
+
+def _request_fields(term_doc, environment):
+    _, category_codes, include_search_term, boost_param = comparison_params(term_doc, environment)
+    return {
+        'categoryCodes': category_codes,
+        'includeSearchTerm': include_search_term,
+        'boostParam': boost_param,
+    }
+
+
+def build_snapshot(term, environment, request_fields, control_products, ai_products, now):
+    """Snapshot document from already fetched results"""
+    return {
+        'searchTerm': term,
+        'environment': environment,
+        **request_fields,
+        'control': summarize_products(control_products),
+        'ai': summarize_products(ai_products),
+        'createdDate': now,
+    }
+
+
+def save_snapshots(db, snapshots):
+    """Upsert snapshot documents (one unordered bulk write)"""
+    if snapshots:
+        db[SNAPSHOTS_COLLECTION].bulk_write([
+            UpdateOne(
+                {'searchTerm': snap['searchTerm'], 'environment': snap['environment']},
+                {'$set': snap},
+                upsert=True
+            )
+            for snap in snapshots
+        ], ordered=False)
+
+
+def save_live_snapshot(db, term, term_doc, environment, control_products, ai_products, now):
+    """Store results the dialog fetched live, so the next open is instant"""
+    save_snapshots(db, [build_snapshot(
+        term, environment, _request_fields(term_doc, environment),
+        control_products[:SNAPSHOT_LIMIT], ai_products[:SNAPSHOT_LIMIT], now
+    )])
+
+
+def get_current_snapshot(db, term, term_doc, environment):
+    """
+    Snapshot of a term, or None when missing or taken with other AI categories/boosts
+
+    Args:
+        term_doc: The term's current termType and modelIdentifiedCategories
+    """
+    snapshot = db[SNAPSHOTS_COLLECTION].find_one(
+        {'searchTerm': term, 'environment': environment}, {'_id': 0}
+    )
+    if snapshot is None:
+        return None
+    current = _request_fields(term_doc, environment)
+    if any(snapshot.get(field) != value for field, value in current.items()):
+        return None
+    return snapshot
+
+
+def delete_snapshots(db, term):
+    """Drop every snapshot of a term (when the term is deleted)"""
+    db[SNAPSHOTS_COLLECTION].delete_many({'searchTerm': term})
+
+
+def active_review_terms(db, now, limit=MAX_ACTIVE_TERMS):
+    """Term documents under active review: in progress and updated recently, newest first"""
+    return list(db[TERMS_COLLECTION].find(
+        {'status': 'in_progress', 'updatedDate': {'$gte': now - timedelta(days=ACTIVE_REVIEW_DAYS)}},
+        SNAPSHOT_TERM_PROJECTION
+    ).sort('updatedDate', DESCENDING).limit(limit))
+
+
+def refresh_snapshots(db, term_docs, environment, now, limiter=None, batch_size=100):
+    """
+    Fetch and store snapshots of many terms
+
+    Both sides of every term are fetched concurrently (limiter, a
+    utils.rate_limiter.RateLimiter, caps the request rate); snapshots are
+    written with one bulk upsert per batch_size terms. Terms with a failed
+    fetch keep their previous snapshot.
+
+    Returns:
+        Tuple of (refreshed count, list of (term, error message))
+    """
+    def fetch(term, category_codes, include_search_term, boost_param):
+        if limiter is not None:
+            limiter.acquire()
+        return fetch_products(
+            term,
+            category_codes=category_codes,
+            limit=SNAPSHOT_LIMIT,
+            include_search_term=include_search_term,
+            environment=environment,
+            boost_param=boost_param
+        )
+
+    refreshed = 0
+    failures = []
+    for start in range(0, len(term_docs), batch_size):
+        pending = []
+        for doc in term_docs[start:start + batch_size]:
+            fields = _request_fields(doc, environment)
+            term = doc['searchTerm']
+            control = _executor.submit(fetch, term, None, True, None)
+            ai = _executor.submit(fetch, term, fields['categoryCodes'], fields['includeSearchTerm'], fields['boostParam'])
+            pending.append((term, fields, control, ai))
+
+        snapshots = []
+        for term, fields, control, ai in pending:
+            (control_products, control_error), (ai_products, ai_error) = control.result(), ai.result()
+            error = control_error or ai_error
+            if error:
+                failures.append((term, error['message']))
+                continue
+            snapshots.append(build_snapshot(term, environment, fields, control_products, ai_products, now))
+        save_snapshots(db, snapshots)
+        refreshed += len(snapshots)
+
+    return refreshed, failures
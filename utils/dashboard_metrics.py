@@ -0,0 +1,219 @@
+"""
+Precomputed dashboard metrics
+
+The analytics panel reads two small documents from dashboard_metrics instead
+of counting terms on every render:
+
+    {'_id': 'terms',                            # one $facet pass over all terms
+     'total': 1000000,
+     'byStatus': {'in_progress': 990000, 'locked': 10000},
+     'byTermType': {...}, 'byTrend': {...},     # trend bucket = materialized trendStatus
+     'boostDistribution': {'100': 52000, '150-199': 1200, ...},
+     'topCategories': [{'code', 'name', 'count'}, ...],
+     'computedDate': datetime}
+
+    {'_id': 'edit_volume',
+     'days': {'2024-11-03': 42, ...},           # edit events per IST day
+     'lastEventId': ObjectId}
+
+The term facets are recomputed when older than TERM_METRICS_TTL. Edit volume
+is maintained incrementally: each refresh finds the days of the edit events
+inserted since lastEventId and recounts just those days (see
+update_edit_volume). refresh_metrics_async runs refreshes on a background
+thread, so readers never wait for a pass over the collection.
+"""
+
+import threading
+from datetime import datetime, timedelta
+
+from bson import ObjectId
+
+from utils.edit_events import EDIT_EVENTS_COLLECTION
+from utils.trend_store import TERMS_COLLECTION
+
+METRICS_COLLECTION = 'dashboard_metrics'
+TERM_METRICS_ID = 'terms'
+EDIT_VOLUME_ID = 'edit_volume'
+
+# Seconds before the term facets are recomputed
+TERM_METRICS_TTL = 300
+# Categories listed in topCategories
+TOP_CATEGORIES = 10
+# Boost value buckets: [0, 1) is "0", [100, 101) is "100", the rest are ranges
+BOOST_BOUNDARIES = [0, 1, 50, 100, 101, 150, 200, 500, 1000]
+BOOST_OVERFLOW = '1000+'
+# Categories without a boostValue are boosted by this much (as everywhere else)
+DEFAULT_BOOST = 100
+# Seconds before lastEventId re-read on every edit volume update (late commits, clock skew)
+EDIT_VOLUME_OVERLAP = 120
+
+_refresh_lock = threading.Lock()
+
+
+def boost_bucket_label(lower, upper):
+    """Label of the boost bucket [lower, upper)"""
+    if upper - lower == 1:
+        return str(lower)
+    return f"{lower}-{upper - 1}"
+
+
+BOOST_LABELS = [
+    boost_bucket_label(lower, upper) for lower, upper in zip(BOOST_BOUNDARIES, BOOST_BOUNDARIES[1:])
+] + [BOOST_OVERFLOW]
+
+
+def _count_by(field):
+    return [{'$group': {'_id': {'$ifNull': [f'${field}', 'unknown']}, 'count': {'$sum': 1}}}]
+
+
+def term_metrics_pipeline(top_categories=TOP_CATEGORIES):
+    """Single-pass $facet pipeline behind the 'terms' metrics document"""
+    return [
+        {'$project': {'status': 1, 'termType': 1, 'trendStatus': 1, 'modelIdentifiedCategories': 1}},
+        {'$facet': {
+            'total': [{'$count': 'count'}],
+            'byStatus': _count_by('status'),
+            'byTermType': _count_by('termType'),
+            'byTrend': _count_by('trendStatus'),
+            'boostDistribution': [
+                {'$unwind': '$modelIdentifiedCategories'},
+                {'$bucket': {
+                    'groupBy': {'$ifNull': ['$modelIdentifiedCategories.boostValue', DEFAULT_BOOST]},
+                    'boundaries': BOOST_BOUNDARIES,
+                    'default': BOOST_OVERFLOW,
+                    'output': {'count': {'$sum': 1}}
+                }},
+            ],
+            'topCategories': [
+                {'$unwind': '$modelIdentifiedCategories'},
+                {'$group': {
+                    '_id': '$modelIdentifiedCategories.code',
+                    'name': {'$first': '$modelIdentifiedCategories.name'},
+                    'count': {'$sum': 1}
+                }},
+                {'$sort': {'count': -1, '_id': 1}},
+                {'$limit': top_categories},
+            ],
+        }},
+    ]
+
+
+def compute_term_metrics(db, now):
+    """Run the facet pass and store the 'terms' metrics document"""
+    facets = next(db[TERMS_COLLECTION].aggregate(term_metrics_pipeline(), allowDiskUse=True))
+
+    boost_labels = dict(zip(BOOST_BOUNDARIES, BOOST_LABELS))
+    doc = {
+        'total': facets['total'][0]['count'] if facets['total'] else 0,
+        'byStatus': {str(row['_id']): row['count'] for row in facets['byStatus']},
+        'byTermType': {str(row['_id']): row['count'] for row in facets['byTermType']},
+        'byTrend': {str(row['_id']): row['count'] for row in facets['byTrend']},
+        # Non-numeric boosts land in the default bucket too
+        'boostDistribution': {
+            boost_labels.get(row['_id'], BOOST_OVERFLOW): row['count'] for row in facets['boostDistribution']
+        },
+        'topCategories': [
+            {'code': row['_id'], 'name': row.get('name') or row['_id'], 'count': row['count']}
+            for row in facets['topCategories']
+        ],
+        'computedDate': now,
+    }
+    db[METRICS_COLLECTION].replace_one({'_id': TERM_METRICS_ID}, doc, upsert=True)
+    return doc
+
+
+def update_edit_volume(db, now):
+    """
+    Recount the days of edit events inserted since the last update
+
+    Event ids are generated by the writing client, so an event can commit
+    with an id below lastEventId. Each update therefore re-reads
+    EDIT_VOLUME_OVERLAP seconds before it, and instead of adding to the
+    counts it recounts every day the events read fall on (an index count on
+    timestamp). Reading an event twice, or two refreshes running at once,
+    never counts it twice.
+
+    Returns:
+        Number of days recounted
+    """
+    collection = db[METRICS_COLLECTION]
+    current = collection.find_one({'_id': EDIT_VOLUME_ID}, {'lastEventId': 1}) or {}
+    last_event_id = current.get('lastEventId')
+
+    pipeline = []
+    if last_event_id is not None:
+        since = last_event_id.generation_time - timedelta(seconds=EDIT_VOLUME_OVERLAP)
+        pipeline.append({'$match': {'_id': {'$gt': ObjectId.from_datetime(since)}}})
+    pipeline += [
+        {'$group': {
+            '_id': {'$dateToString': {'format': '%Y-%m-%d', 'date': '$timestamp'}},
+            'lastId': {'$max': '$_id'}
+        }},
+    ]
+    days = list(db[EDIT_EVENTS_COLLECTION].aggregate(pipeline))
+    if not days:
+        return 0
+
+    counts = {}
+    for row in days:
+        if not row['_id']:
+            continue
+        start = datetime.strptime(row['_id'], '%Y-%m-%d')
+        counts[f"days.{row['_id']}"] = db[EDIT_EVENTS_COLLECTION].count_documents(
+            {'timestamp': {'$gte': start, '$lt': start + timedelta(days=1)}}
+        )
+    collection.update_one(
+        {'_id': EDIT_VOLUME_ID},
+        {'$set': {**counts, 'updatedDate': now}, '$max': {'lastEventId': max(row['lastId'] for row in days)}},
+        upsert=True
+    )
+    return len(counts)
+
+
+def refresh_metrics(db, now, force=False):
+    """Update edit volume, and the term facets when stale (or force)"""
+    update_edit_volume(db, now)
+    terms = db[METRICS_COLLECTION].find_one({'_id': TERM_METRICS_ID}, {'computedDate': 1})
+    if force or terms is None or (now - terms['computedDate']).total_seconds() >= TERM_METRICS_TTL:
+        compute_term_metrics(db, now)
+
+
+def refresh_metrics_async(db, now, force=False):
+    """
+    refresh_metrics on a background thread
+
+    At most one refresh runs per process; a call while one is running is
+    dropped. Returns True when a refresh was started.
+    """
+    if not _refresh_lock.acquire(blocking=False):
+        return False
+
+    def run():
+        try:
+            refresh_metrics(db, now, force)
+        finally:
+            _refresh_lock.release()
+
+    threading.Thread(target=run, daemon=True).start()
+    return True
+
+
+def is_refreshing():
+    """Whether a background refresh is running in this process"""
+    return _refresh_lock.locked()
+
+
+def get_metrics(db, days=30):
+    """
+    Stored metrics for the dashboard (two point reads)
+
+    Returns:
+        Tuple of (terms metrics document or None, list of (day, edits) for
+        the last `days` days with edits, oldest first)
+    """
+    collection = db[METRICS_COLLECTION]
+    terms = collection.find_one({'_id': TERM_METRICS_ID})
+    volume = collection.find_one({'_id': EDIT_VOLUME_ID}, {'days': 1}) or {}
+    edits_per_day = sorted(volume.get('days', {}).items())[-days:]
+    return terms, edits_per_day
+
@@ -1,9 +1,16 @@
 """
 MongoDB connection utility
+
+All entry points share one lazily created MongoClient per process (see
+get_mongo_client). MongoClient is thread-safe and pools its connections, so
+reusing it avoids a fresh connection handshake and server selection on every
+function call.
 """
 
 from pymongo import MongoClient
 from pymongo.errors import ConnectionFailure, ServerSelectionTimeoutError
+import threading
+import time
 import sys
 import os
 
@@ -12,60 +19,145 @@ sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')
 
 from config.database import MONGODB_CONFIG, COLLECTIONS
 
+_client = None
+_client_lock = threading.Lock()
+
+# Seconds a health check result is reused (see MongoDBConnector.is_healthy)
+HEALTH_CHECK_INTERVAL = 30
+
+
+def _client_options():
+    """MongoClient keyword options built from MONGODB_CONFIG"""
+    return {
+        'maxPoolSize': MONGODB_CONFIG.get('max_pool_size', 50),
+        'minPoolSize': MONGODB_CONFIG.get('min_pool_size', 0),
+        'maxIdleTimeMS': MONGODB_CONFIG.get('max_idle_time_ms'),
+        'connectTimeoutMS': MONGODB_CONFIG.get('connect_timeout_ms'),
+        'socketTimeoutMS': MONGODB_CONFIG.get('socket_timeout_ms'),
+        'serverSelectionTimeoutMS': MONGODB_CONFIG.get('server_selection_timeout_ms'),
+        'readPreference': MONGODB_CONFIG.get('read_preference', 'primary'),
+        'retryWrites': MONGODB_CONFIG.get('retry_writes', True),
+        'retryReads': MONGODB_CONFIG.get('retry_reads', True),
+    }
+
+
+def create_mongo_client(uri=None):
+    """Create a new MongoClient with the configured pool settings"""
+    options = {k: v for k, v in _client_options().items() if v is not None}
+    return MongoClient(uri or MONGODB_CONFIG['uri'], **options)
+
+
+def get_mongo_client():
+    """Return the process-wide MongoClient, creating it on first use"""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = create_mongo_client()
+    return _client
+
+
+def get_database(name=None):
+    """Return a Database handle on the process-wide client"""
+    return get_mongo_client()[name or MONGODB_CONFIG['database']]
+
+
+def close_mongo_client():
+    """Close the process-wide client (only needed at process shutdown)"""
+    global _client
+    with _client_lock:
+        if _client is not None:
+            _client.close()
+            _client = None
+
 
 class MongoDBConnector:
     """MongoDB connection manager"""
-    
+
     def __init__(self):
         self.client = None
         self.db = None
         self.uri = MONGODB_CONFIG['uri']
         self.database_name = MONGODB_CONFIG['database']
-    
+        self._owns_client = False
+        self._healthy = False
+        self._checked_at = None
+
     def connect(self):
-        """Establish connection to MongoDB"""
+        """
+        Attach to MongoDB
+
+        Uses the shared process-wide client for the configured URI; a custom
+        self.uri (e.g. a local replica set) gets its own dedicated client.
+        No round-trip is made here, use ping() for an explicit health check.
+        """
         try:
-            print("Connecting to MongoDB...")
-            self.client = MongoClient(self.uri)
-            
-            # Test the connection
-            self.client.admin.command('ping')
-            
+            if self.uri == MONGODB_CONFIG['uri']:
+                self.client = get_mongo_client()
+                self._owns_client = False
+            else:
+                print("Connecting to MongoDB...")
+                self.client = create_mongo_client(self.uri)
+                self._owns_client = True
+
             self.db = self.client[self.database_name]
-            print(f"✓ Successfully connected to MongoDB database: {self.database_name}")
             return True
-            
+
+        except Exception as e:
+            print(f"✗ Unexpected error connecting to MongoDB: {e}")
+            return False
+
+    def ping(self):
+        """Health check: round-trip to the server, returns True if it answers"""
+        if self.client is None:
+            return False
+        try:
+            self.client.admin.command('ping')
+            return True
         except ConnectionFailure as e:
             print(f"✗ Failed to connect to MongoDB: {e}")
             return False
         except ServerSelectionTimeoutError as e:
             print(f"✗ MongoDB server selection timeout: {e}")
             return False
-        except Exception as e:
-            print(f"✗ Unexpected error connecting to MongoDB: {e}")
-            return False
-    
+
+    def is_healthy(self, max_age=HEALTH_CHECK_INTERVAL):
+        """
+        Health check for long-lived connectors: ping() at most every max_age seconds
+
+        Lets callers that validate a shared connector on every use (e.g. the
+        Streamlit resource cache) avoid a round-trip per access.
+        """
+        now = time.monotonic()
+        if self._checked_at is None or now - self._checked_at >= max_age:
+            self._healthy = self.ping()
+            self._checked_at = now
+        return self._healthy
+
     def disconnect(self):
-        """Close MongoDB connection"""
-        if self.client:
+        """Release the connection (the shared client stays open for reuse)"""
+        if self.client and self._owns_client:
             self.client.close()
             print("✓ MongoDB connection closed")
-    
+        self.client = None
+        self.db = None
+
     def get_collection(self, collection_name):
         """Get a MongoDB collection"""
         if self.db is None:
             raise Exception("Database not connected. Call connect() first.")
         return self.db[collection_name]
-    
+
     def test_connection(self):
         """Test MongoDB connection and list collections"""
-        if self.connect():
+        if self.connect() and self.ping():
             try:
+                print(f"✓ Successfully connected to MongoDB database: {self.database_name}")
                 # List all collections
                 collections = self.db.list_collection_names()
                 print(f"\nAvailable collections ({len(collections)}):")
                 for col in collections:
-                    count = self.db[col].count_documents({})
+                    count = self.db[col].estimated_document_count()
                     print(f"  - {col}: {count} documents")
                 return True
             except Exception as e:
@@ -89,7 +181,6 @@ if __name__ == "__main__":
     print("=" * 60)
     print("Testing MongoDB Connection")
     print("=" * 60)
-    
+
     connector = MongoDBConnector()
     connector.test_connection()
-
@@ -0,0 +1,61 @@
+"""
+Server-side downsampling of time series for charts
+
+A chart a few hundred pixels wide cannot show more points than it has
+pixels, but the browser still has to receive and draw every one of them.
+lttb_indices picks the points to keep with Largest-Triangle-Three-Buckets,
+which preserves peaks and dips far better than taking every n-th point.
+"""
+
+import numpy as np
+
+# Points kept per series (about one per horizontal pixel of the trends chart)
+MAX_CHART_POINTS = 500
+
+
+def lttb_indices(values, threshold=MAX_CHART_POINTS):
+    """
+    Indices of the points to keep, by Largest-Triangle-Three-Buckets
+
+    Points are assumed evenly spaced (one per day). The first and last
+    points are always kept.
+
+    Returns:
+        Sorted NumPy array of at most threshold indices (all indices when
+        the series is already short enough)
+    """
+    n = len(values)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+
+    y = np.asarray(values, dtype=float)
+    x = np.arange(n, dtype=float)
+    every = (n - 2) / (threshold - 2)
+
+    selected = np.empty(threshold, dtype=np.int64)
+    selected[0] = 0
+    selected[-1] = n - 1
+    a = 0
+    for i in range(threshold - 2):
+        start = int(i * every) + 1
+        end = int((i + 1) * every) + 1
+        # Average of the next bucket (the last point for the final bucket)
+        next_end = min(int((i + 2) * every) + 1, n)
+        avg_x = x[end:next_end].mean()
+        avg_y = y[end:next_end].mean()
+
+        areas = np.abs(
+            (x[a] - avg_x) * (y[start:end] - y[a]) - (x[a] - x[start:end]) * (avg_y - y[a])
+        )
+        a = start + int(areas.argmax())
+        selected[i + 1] = a
+
+    return selected
+
+
+def downsample(timestamps, values, threshold=MAX_CHART_POINTS):
+    """(timestamps, values) reduced to at most threshold points with LTTB"""
+    if len(values) <= threshold:
+        return timestamps, values
+    keep = lttb_indices(values, threshold)
+    return [timestamps[i] for i in keep], [values[i] for i in keep]
@@ -0,0 +1,103 @@
+"""
+Append-only audit log of term edits
+
+Each edit is its own document in edit_events instead of an element of the
+term's editHistory array:
+
+    {
+        'searchTerm': 'adidas',
+        'timestamp': datetime(2024, 11, 3, 14, 5),  # IST, like the rest of the UI
+        'action': 'boost_update',
+        'details': "Updated boost for 'Sneakers' from 100 to 150"
+    }
+
+Term documents therefore stay the same size however often they are edited,
+and readers fetch only the events in the range they display through the
+(searchTerm, timestamp) index.
+"""
+
+from datetime import datetime, timedelta
+
+from pymongo import ASCENDING
+
+from utils.ist import now_ist
+
+EDIT_EVENTS_COLLECTION = 'edit_events'
+
+
+def ensure_edit_event_indexes(db):
+    """Create the indexes edit event reads rely on (idempotent)"""
+    db[EDIT_EVENTS_COLLECTION].create_index(
+        [('searchTerm', ASCENDING), ('timestamp', ASCENDING)],
+        name='searchTerm_timestamp'
+    )
+    # Per-day edit counts (utils.dashboard_metrics.update_edit_volume)
+    db[EDIT_EVENTS_COLLECTION].create_index([('timestamp', ASCENDING)], name='timestamp')
+
+
+def build_edit_event(term, action, details, timestamp):
+    """Edit event document"""
+    return {
+        'searchTerm': term,
+        'timestamp': timestamp,
+        'action': action,
+        'details': details
+    }
+
+
+def log_edit_event(db, term, action, details, timestamp=None):
+    """Append one edit event (timestamped now, in IST, unless given)"""
+    db[EDIT_EVENTS_COLLECTION].insert_one(
+        build_edit_event(term, action, details, timestamp or now_ist())
+    )
+
+
+def log_edit_events(db, events):
+    """Append many edit event documents (see build_edit_event)"""
+    if events:
+        db[EDIT_EVENTS_COLLECTION].insert_many(events, ordered=False)
+
+
+def replace_edit_events(db, term, events):
+    """
+    Replace every event of a term
+
+    Only for the sample/demo data scripts; the application itself never
+    rewrites the audit log.
+    """
+    db[EDIT_EVENTS_COLLECTION].delete_many({'searchTerm': term})
+    log_edit_events(db, events)
+
+
+def _day_start(value):
+    if isinstance(value, str):
+        return datetime.strptime(value, '%Y-%m-%d')
+    return value
+
+
+def get_edit_events(db, term, start_date=None, end_date=None):
+    """
+    Edit events of a term, oldest first
+
+    Args:
+        start_date / end_date: Inclusive bounds as datetimes or 'YYYY-MM-DD'
+            strings (a date string bound covers that whole day); None for open
+
+    Returns:
+        List of event dicts (timestamp, action, details)
+    """
+    query = {'searchTerm': term}
+    time_range = {}
+    if start_date is not None:
+        time_range['$gte'] = _day_start(start_date)
+    if end_date is not None:
+        if isinstance(end_date, str):
+            time_range['$lt'] = _day_start(end_date) + timedelta(days=1)
+        else:
+            time_range['$lte'] = end_date
+    if time_range:
+        query['timestamp'] = time_range
+
+    return list(db[EDIT_EVENTS_COLLECTION].find(
+        query, {'_id': 0, 'timestamp': 1, 'action': 1, 'details': 1}
+    ).sort('timestamp', ASCENDING))
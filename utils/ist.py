@@ -0,0 +1,15 @@
+"""
+IST timestamps
+
+Every stored date in this project is a naive datetime in IST (UTC+5:30),
+the same convention as the UI and the worker scripts.
+"""
+
+from datetime import datetime, timezone, timedelta
+
+IST_OFFSET = timedelta(hours=5, minutes=30)
+
+
+def now_ist():
+    """Get current time in IST (naive)"""
+    return datetime.now(timezone.utc).replace(tzinfo=None) + IST_OFFSET
@@ -0,0 +1,249 @@
+"""
+Resumable batched migrations for maintenance scripts
+
+A migration walks its collection in _id order one batch at a time and applies
+either a pipeline update to the batch's _id range (server-side, one round-trip
+per batch) or a list of bulk_write requests built from the fetched batch.
+
+Progress is recorded in the schema_migrations collection after every batch:
+a rerun resumes after the last finished batch, and a completed migration is
+skipped unless it is marked repeatable.
+
+Migrations with existing_documents_only set only touch documents inserted
+before the migration first started. The cutoff _id is stored with its
+progress and kept by --force reruns, so documents written later (already in
+the new format) are never migrated.
+"""
+
+import time
+import argparse
+from datetime import datetime, timezone
+
+from bson import ObjectId
+
+from utils.ist import IST_OFFSET, now_ist
+
+MIGRATIONS_COLLECTION = 'schema_migrations'
+
+
+class Migration:
+    """
+    Base class for a resumable batched migration
+
+    Subclasses set name and collection_name and override either pipeline()
+    or build_ops() (checked when the subclass is defined). The filter should exclude documents that are already
+    migrated so a batch replayed after a crash is a no-op.
+    """
+
+    name = None
+    collection_name = None
+    description = ''
+    filter = {}
+    projection = None
+    batch_size = 500
+    # Repeatable migrations are backfills that may run again after completing
+    repeatable = False
+    # Only migrate documents inserted before the first run started (see cutoff_id)
+    existing_documents_only = False
+    _cutoff_id = None
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        if cls.pipeline is Migration.pipeline and cls.build_ops is Migration.build_ops:
+            raise TypeError(f"Migration {cls.__name__} must override pipeline() or build_ops()")
+
+    def pipeline(self):
+        """Pipeline update applied to each _id range, or None to use build_ops()"""
+        return None
+
+    def build_ops(self, docs):
+        """
+        Return bulk_write requests for a batch of fetched documents
+
+        self.db is set while the migration runs, for migrations that also
+        write to other collections.
+        """
+        return []
+
+    def _batch_filter(self, last_id):
+        clauses = [self.filter]
+        if self._cutoff_id is not None:
+            clauses.append({'_id': {'$lte': self._cutoff_id}})
+        if last_id is not None:
+            clauses.append({'_id': {'$gt': last_id}})
+        if len(clauses) == 1:
+            return dict(self.filter)
+        return {'$and': clauses}
+
+    def cutoff_id(self, control, state):
+        """
+        _id bound of an existing_documents_only migration, recorded on first use
+
+        Migrations run before the cutoff was recorded use their stored start
+        (or completion) time, so a forced rerun still skips later documents.
+        """
+        if state.get('cutoffId') is not None:
+            return state['cutoffId']
+        started = state.get('startedDate') or state.get('completedDate')
+        if started is not None:
+            # Stored times are naive IST
+            cutoff = (started - IST_OFFSET).replace(tzinfo=timezone.utc)
+        else:
+            cutoff = datetime.now(timezone.utc)
+        cutoff_id = ObjectId.from_datetime(cutoff)
+        control.update_one({'_id': self.name}, {'$set': {'cutoffId': cutoff_id}}, upsert=True)
+        return cutoff_id
+
+    def run(self, db, dry_run=False, throttle_ms=0, force=False):
+        """
+        Run (or resume) the migration
+
+        Args:
+            db: pymongo Database
+            dry_run: Only count the documents that would be processed
+            throttle_ms: Sleep between batches to limit load on the cluster
+            force: Restart from the beginning even if completed or partially run
+
+        Returns:
+            Dict with processed and modified counts
+        """
+        self.db = db
+        collection = db[self.collection_name]
+        control = db[MIGRATIONS_COLLECTION]
+
+        state = control.find_one({'_id': self.name}) or {}
+        if state.get('status') == 'completed' and not (self.repeatable or force):
+            print(f"⏭️  {self.name}: already completed on {state.get('completedDate')}")
+            return {'processed': 0, 'modified': 0}
+        if self.existing_documents_only:
+            self._cutoff_id = state.get('cutoffId') if dry_run else self.cutoff_id(control, state)
+
+        resume = state.get('status') == 'running' and not force
+        last_id = state.get('lastId') if resume else None
+        processed = state.get('processed', 0) if resume else 0
+        modified = state.get('modified', 0) if resume else 0
+
+        if dry_run:
+            pending = collection.count_documents(self._batch_filter(last_id))
+            print(f"🔍 {self.name}: {pending} documents to process (dry run)")
+            return {'processed': pending, 'modified': 0}
+
+        if resume and last_id is not None:
+            print(f"↻ {self.name}: resuming after _id {last_id} ({processed} already processed)")
+        else:
+            control.update_one(
+                {'_id': self.name},
+                {
+                    '$set': {
+                        'status': 'running',
+                        'description': self.description,
+                        'lastId': None,
+                        'processed': 0,
+                        'modified': 0,
+                        'startedDate': now_ist()
+                    },
+                    '$unset': {'completedDate': ''}
+                },
+                upsert=True
+            )
+
+        pipeline = self.pipeline()
+        if pipeline is None and type(self).build_ops is Migration.build_ops:
+            raise TypeError(f"Migration {self.name}: pipeline() returned None and build_ops() is not overridden")
+        projection = {'_id': 1} if pipeline is not None else self.projection
+
+        while True:
+            batch = list(
+                collection.find(self._batch_filter(last_id), projection)
+                .sort('_id', 1)
+                .limit(self.batch_size)
+            )
+            if not batch:
+                break
+
+            first_id, batch_last_id = batch[0]['_id'], batch[-1]['_id']
+            if pipeline is not None:
+                result = collection.update_many(
+                    {'$and': [self.filter, {'_id': {'$gte': first_id, '$lte': batch_last_id}}]},
+                    pipeline
+                )
+                modified += result.modified_count
+            else:
+                ops = self.build_ops(batch)
+                if ops:
+                    modified += collection.bulk_write(ops, ordered=False).modified_count
+
+            processed += len(batch)
+            last_id = batch_last_id
+            control.update_one(
+                {'_id': self.name},
+                {'$set': {'lastId': last_id, 'processed': processed, 'modified': modified}}
+            )
+            print(f"  {self.name}: {processed} processed, {modified} modified")
+
+            if throttle_ms:
+                time.sleep(throttle_ms / 1000)
+
+        control.update_one(
+            {'_id': self.name},
+            {'$set': {'status': 'completed', 'completedDate': now_ist()}}
+        )
+        print(f"✅ {self.name}: completed ({processed} processed, {modified} modified)")
+        return {'processed': processed, 'modified': modified}
+
+
+def mark_completed(db, migration):
+    """Record a migration as completed without touching any documents"""
+    db[MIGRATIONS_COLLECTION].update_one(
+        {'_id': migration.name},
+        {
+            '$set': {
+                'status': 'completed',
+                'description': migration.description,
+                'completedDate': now_ist()
+            }
+        },
+        upsert=True
+    )
+    print(f"✓ {migration.name}: marked as completed")
+
+
+def run_migrations(migrations, description=None, argv=None):
+    """
+    Command-line entry point shared by the maintenance scripts
+
+    Parses --dry-run, --throttle-ms, --batch-size, --force and --mark-completed
+    and runs each migration in order.
+    """
+    from utils.db_connector import get_db_connection
+
+    parser = argparse.ArgumentParser(description=description)
+    parser.add_argument('--dry-run', action='store_true', help='Only count documents to process')
+    parser.add_argument('--throttle-ms', type=int, default=0, help='Sleep between batches (ms)')
+    parser.add_argument('--batch-size', type=int, help='Documents per batch')
+    parser.add_argument('--force', action='store_true', help='Restart even if already completed')
+    parser.add_argument('--mark-completed', action='store_true',
+                        help='Record the migrations as completed without running them')
+    args = parser.parse_args(argv)
+
+    connector = get_db_connection()
+    if not connector:
+        print("✗ Failed to connect to MongoDB")
+        return False
+
+    try:
+        for migration in migrations:
+            if args.batch_size:
+                migration.batch_size = args.batch_size
+            if args.mark_completed:
+                mark_completed(connector.db, migration)
+            else:
+                migration.run(
+                    connector.db,
+                    dry_run=args.dry_run,
+                    throttle_ms=args.throttle_ms,
+                    force=args.force
+                )
+        return True
+    finally:
+        connector.disconnect()
@@ -0,0 +1,132 @@
+"""
+Cached, concurrent product fetches for the Product Comparison dialog
+
+The dialog used to call fetch_products twice in a row on every open and every
+rerun, so showing a comparison cost two sequential search API round-trips
+each time. fetch_comparison issues the control and AI requests concurrently
+and keeps both responses in a process-wide TTL cache shared by every
+Streamlit session:
+
+- opening a comparison costs one (parallel) round-trip
+- reopening it, or any rerun of the dialog, costs none until COMPARISON_TTL
+- concurrent sessions asking for the same comparison share one in-flight request
+
+Entries are keyed by (term, category_codes, include_search_term, environment,
+boost_param, page, limit). Failed fetches are never cached. Edits that change
+a term's AI categories or boosts call invalidate_comparisons(term), so a
+comparison never shows results from before the edit.
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from utils.product_fetcher import BOOST_ENVIRONMENTS, fetch_products
+
+# Seconds a comparison response stays cached
+COMPARISON_TTL = 600
+COMPARISON_CACHE_SIZE = 512
+# Concurrent search API requests across all sessions
+MAX_FETCH_WORKERS = 8
+
+_cache = {}
+_cache_lock = threading.Lock()
+_executor = ThreadPoolExecutor(max_workers=MAX_FETCH_WORKERS, thread_name_prefix='product-fetch')
+
+
+def comparison_params(term_doc, environment="production"):
+    """
+    Request parameters of a term's AI side
+
+    Only categories with boost > 0 are applied. boostingConfiguration terms
+    keep the searchTerm (boost existing results); filterConfiguration terms
+    filter by the categories alone.
+
+    Returns:
+        Tuple of (active categories, their codes, include_search_term_in_ai,
+        boost_param or None; "c1:100,c2:101" for lowerEnv/recorded)
+    """
+    active_categories = [cat for cat in term_doc.get('modelIdentifiedCategories', []) if cat.get('boostValue', 100) > 0]
+    category_codes = [cat['code'] for cat in active_categories]
+    boost_param = None
+    if environment in BOOST_ENVIRONMENTS and active_categories:
+        boost_param = ",".join(f"{cat['code']}:{cat.get('boostValue', 100)}" for cat in active_categories)
+    include_search_term_in_ai = term_doc.get('termType', 'filterConfiguration') == 'boostingConfiguration'
+    return active_categories, category_codes, include_search_term_in_ai, boost_param
+
+
+def _cache_key(term, category_codes, include_search_term, environment, boost_param, page, limit):
+    return (term, tuple(category_codes or ()), include_search_term, environment, boost_param, page, limit)
+
+
+def _evict(now):
+    """Drop expired entries, then the oldest ones, until there is room (caller holds the lock)"""
+    if len(_cache) < COMPARISON_CACHE_SIZE:
+        return
+    for key in [key for key, (_, expires) in _cache.items() if expires <= now]:
+        del _cache[key]
+    while len(_cache) >= COMPARISON_CACHE_SIZE:
+        del _cache[next(iter(_cache))]
+
+
+def _forget_failure(key, future):
+    """Done-callback: errors are not cached, the next open retries"""
+    if future.exception() is None and future.result()[1] is None:
+        return
+    with _cache_lock:
+        entry = _cache.get(key)
+        if entry is not None and entry[0] is future:
+            del _cache[key]
+
+
+def _fetch(term, category_codes, include_search_term, environment, boost_param, page, limit):
+    """Future for one fetch_products call, served from the cache when possible"""
+    key = _cache_key(term, category_codes, include_search_term, environment, boost_param, page, limit)
+    now = time.monotonic()
+    with _cache_lock:
+        entry = _cache.get(key)
+        if entry is not None and entry[1] > now:
+            return entry[0]
+        future = _executor.submit(
+            fetch_products, term,
+            category_codes=category_codes,
+            page=page,
+            limit=limit,
+            include_search_term=include_search_term,
+            environment=environment,
+            boost_param=boost_param
+        )
+        _evict(now)
+        _cache[key] = (future, now + COMPARISON_TTL)
+    future.add_done_callback(lambda f: _forget_failure(key, f))
+    return future
+
+
+def fetch_comparison(term, category_codes, include_search_term_in_ai, environment="production",
+                     boost_param=None, page=1, limit=40):
+    """
+    Fetch the control and AI category results of a term concurrently
+
+    Args:
+        category_codes: Active AI category codes (AI request only)
+        include_search_term_in_ai: Whether the AI request keeps the searchTerm
+            (boostingConfiguration) or filters by categories only
+        boost_param: lowerEnv boost parameter (AI request only)
+
+    Returns:
+        Tuple of (control, ai), each a (products_list, error) tuple as returned by fetch_products
+    """
+    # Control: with searchTerm, no category filter
+    control = _fetch(term, None, True, environment, None, page, limit)
+    ai = _fetch(term, category_codes, include_search_term_in_ai, environment, boost_param, page, limit)
+    return control.result(), ai.result()
+
+
+def invalidate_comparisons(term=None):
+    """Drop cached comparisons of a term (after boost/category edits), or all of them"""
+    with _cache_lock:
+        if term is None:
+            _cache.clear()
+            return
+        for key in [key for key in _cache if key[0] == term]:
+            del _cache[key]
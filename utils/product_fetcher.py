@@ -1,10 +1,23 @@
 """
 Utility for fetching products from Blibli API
+
+Search API pages are requested over pooled, keep-alive sessions (one per
+environment, with the static headers and cookies set once). iter_products
+requests several pages concurrently and yields products page by page, in
+ranking order and deduplicated by product id, so a deep comparison (e.g. the
+top 200) costs about one page of latency instead of one per page.
 """
 
-import requests
-import urllib.parse
+import itertools
+import math
+import os
+import threading
 import traceback
+import urllib.parse
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from requests.adapters import HTTPAdapter
 
 # Blibli API Configuration - UPDATE COOKIES WHEN THEY EXPIRE
 BLIBLI_HEADERS = {
@@ -46,6 +59,199 @@ BLIBLI_COOKIES = {
 }
 
 
+# "recorded" replays saved lowerEnv responses (scripts/recorded_search_server.py)
+RECORDED_SEARCH_URL = os.environ.get('RECORDED_SEARCH_URL', 'http://localhost:9095')
+
+SEARCH_URLS = {
+    'production': 'https://www.blibli.com/backend/search/products',
+    'lowerEnv': 'http://localhost:9090/backend/search/products',
+    'recorded': f'{RECORDED_SEARCH_URL}/backend/search/products',
+}
+REFERERS = {
+    'production': ('https://www.blibli.com/cari/', 'https://www.blibli.com/'),
+    'lowerEnv': ('http://localhost:9090/backend/cari/', 'http://localhost:9090/backend/'),
+    'recorded': (f'{RECORDED_SEARCH_URL}/backend/cari/', f'{RECORDED_SEARCH_URL}/backend/'),
+}
+# Environments that take a boostParam (and get no production cookies)
+BOOST_ENVIRONMENTS = ('lowerEnv', 'recorded')
+BASE_PARAMS = {
+    'start': 0,
+    'merchantSearch': 'true',
+    'multiCategory': 'true',
+    'channelId': 'web',
+    'showFacet': 'false',
+    'isMobileBCA': 'false',
+    'isJual': 'false',
+    'firstLoad': 'true',
+}
+
+# Products the search API returns per page
+PAGE_SIZE = 40
+# Pages of one search fetched in parallel
+MAX_PAGE_WORKERS = 4
+REQUEST_TIMEOUT = 10
+
+_sessions = {}
+_session_lock = threading.Lock()
+_executor = ThreadPoolExecutor(max_workers=4 * MAX_PAGE_WORKERS, thread_name_prefix='search-page')
+
+
+def get_session(environment="production"):
+    """Return the process-wide pooled session of an environment (cookies only for production)"""
+    session = _sessions.get(environment)
+    if session is None:
+        with _session_lock:
+            session = _sessions.get(environment)
+            if session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=4, pool_maxsize=4 * MAX_PAGE_WORKERS)
+                session.mount('http://', adapter)
+                session.mount('https://', adapter)
+                session.headers.update(BLIBLI_HEADERS)
+                if environment == "production":
+                    session.cookies.update(BLIBLI_COOKIES)
+                _sessions[environment] = session
+    return session
+
+
+def _search_params(search_term, category_codes, page, include_search_term, environment, boost_param):
+    """Query parameters of one search API page (requests encodes them)"""
+    params = {**BASE_PARAMS, 'page': page}
+    # Control request includes the searchTerm, the filterConfiguration model request does not
+    if include_search_term:
+        params['searchTerm'] = search_term
+    # Multiple categories are passed as category=code1&category=code2
+    if category_codes:
+        params['category'] = list(category_codes)
+    if environment in BOOST_ENVIRONMENTS and boost_param:
+        params['boostParam'] = boost_param
+    return params
+
+
+def _parse_product(product):
+    """Product dict (name, image, price, rating, id, categories, url) from a search API item, or None"""
+    # Skip if product is not a dict
+    if not isinstance(product, dict):
+        return None
+    
+    # Safely extract product name
+    name = product.get('name', 'N/A')
+    
+    # Safely extract image
+    image = ''
+    images = product.get('images', [])
+    if isinstance(images, list) and len(images) > 0:
+        if isinstance(images[0], dict):
+            image = images[0].get('full', '')
+        elif isinstance(images[0], str):
+            image = images[0]
+    
+    # Safely extract price - use actual Blibli API field names
+    price = 0
+    price_data = product.get('price', {})
+    if isinstance(price_data, dict):
+        # Blibli API uses: salePrice, minPrice, listPrice
+        price = (price_data.get('salePrice') or 
+                price_data.get('minPrice') or 
+                price_data.get('listPrice') or 
+                price_data.get('offered') or 0)
+    elif isinstance(price_data, (int, float)):
+        price = price_data
+    
+    # Safely extract rating
+    rating = 0
+    review_data = product.get('review', {})
+    if isinstance(review_data, dict):
+        rating = review_data.get('rating', 0)
+    elif isinstance(review_data, (int, float)):
+        rating = review_data
+    
+    return {
+        'name': name,
+        'image': image,
+        'price': price,
+        'rating': rating,
+        'id': product.get('id', ''),
+        'url': f"https://www.blibli.com{product.get('url', '')}"
+    }
+
+
+def fetch_page(search_term, page=1, category_codes=None, include_search_term=True, environment="production", boost_param=None):
+    """
+    Fetch and parse one search API page
+
+    Returns:
+        List of product dicts (raises on HTTP or decoding errors)
+    """
+    if include_search_term:
+        referer = REFERERS[environment][0] + urllib.parse.quote(search_term)
+    else:
+        referer = REFERERS[environment][1]
+    
+    response = get_session(environment).get(
+        SEARCH_URLS[environment],
+        params=_search_params(search_term, category_codes, page, include_search_term, environment, boost_param),
+        headers={'referer': referer},
+        timeout=REQUEST_TIMEOUT
+    )
+    response.raise_for_status()
+    
+    data = response.json()
+    items = (data.get('data') or {}).get('products') or []
+    return [p for p in map(_parse_product, items) if p is not None]
+
+
+def iter_products(search_term, category_codes=None, limit=PAGE_SIZE, start_page=1, include_search_term=True,
+                  environment="production", boost_param=None):
+    """
+    Yield up to limit products, fetching their pages concurrently
+
+    The pages needed for limit are requested at once (up to
+    MAX_PAGE_WORKERS in flight) and products are yielded as soon as their page
+    and every earlier page arrived, so the ranking order is kept. Products
+    repeated on a later page are skipped, and more pages are requested while
+    deduplication leaves products missing. Fetching stops at the first page
+    without new products (end of the results); closing the generator early
+    cancels the pages not started yet.
+
+    Raises:
+        The error of the first failed page, after yielding every earlier product
+    """
+    page_numbers = itertools.count(start_page)
+    pending = []
+    seen = set()
+    
+    def top_up():
+        # Keep enough pages in flight for the products still missing
+        wanted = min(MAX_PAGE_WORKERS, math.ceil((limit - len(seen)) / PAGE_SIZE))
+        while len(pending) < wanted:
+            pending.append(_executor.submit(
+                fetch_page, search_term, next(page_numbers), category_codes, include_search_term, environment, boost_param
+            ))
+    
+    try:
+        top_up()
+        while pending:
+            products = pending.pop(0).result()
+            new = 0
+            for product in products:
+                key = product['id'] or product['url']
+                if key in seen:
+                    continue
+                seen.add(key)
+                new += 1
+                yield product
+                if len(seen) >= limit:
+                    return
+            if not new:
+                # Past the last page of results
+                return
+            top_up()
+    finally:
+        for future in pending:
+            future.cancel()
+
+
 def fetch_products(search_term, category_codes=None, page=1, limit=20, include_search_term=True, environment="production", boost_param=None):
     """
     Fetch products from Blibli API or Lower Env API
@@ -53,118 +259,34 @@ def fetch_products(search_term, category_codes=None, page=1, limit=20, include_s
     Args:
         search_term: The search query
         category_codes: Optional list of category codes to filter by
-        page: Page number (default 1)
-        limit: Number of results per page (default 20)
+        page: First page number (default 1)
+        limit: Number of products to return (default 20); more than PAGE_SIZE
+            fetches the following pages concurrently
         include_search_term: Whether to include searchTerm in request (default True)
-        environment: "production" or "lowerEnv" (default "production")
-        boost_param: Boost parameter string for lowerEnv (e.g., "c1:100,c2:101")
+        environment: "production", "lowerEnv" or "recorded" (default "production")
+        boost_param: Boost parameter string for lowerEnv/recorded (e.g., "c1:100,c2:101")
     
     Returns:
         Tuple of (products_list, error_message)
         - products_list: List of product dictionaries with name, image, price, rating
-        - error_message: None if successful, error string if failed
+          (the products fetched before an error, if any)
+        - error_message: None if successful, error dict (message, details) if failed
     """
+    products = []
     try:
-        # Choose base URL based on environment
-        if environment == "lowerEnv":
-            # Lower Env API endpoint
-            url = f"http://localhost:9090/backend/search/products?page={page}&start=0&merchantSearch=true&multiCategory=true&channelId=web&showFacet=false&isMobileBCA=false&isJual=false&firstLoad=true"
-        else:
-            # Production Blibli API
-            url = f"https://www.blibli.com/backend/search/products?page={page}&start=0&merchantSearch=true&multiCategory=true&channelId=web&showFacet=false&isMobileBCA=false&isJual=false&firstLoad=true"
-        
-        # Add searchTerm only if requested (Control request includes it, Model request excludes it)
-        if include_search_term:
-            encoded_term = urllib.parse.quote(search_term)
-            url += f"&searchTerm={encoded_term}"
-        
-        # If category codes provided, add them to the URL
-        # Multiple categories should be passed as: category=code1&category=code2&category=code3
-        if category_codes:
-            for code in category_codes:
-                url += f"&category={urllib.parse.quote(code)}"
-        
-        # Add boost parameter for lowerEnv
-        if environment == "lowerEnv" and boost_param:
-            encoded_boost = urllib.parse.quote(boost_param)
-            url += f"&boostParam={encoded_boost}"
-        
-        # Add dynamic referer header based on search term
-        headers = BLIBLI_HEADERS.copy()
-        if include_search_term:
-            encoded_term = urllib.parse.quote(search_term)
-            if environment == "lowerEnv":
-                headers['referer'] = f'http://localhost:9090/backend/cari/{encoded_term}'
-            else:
-                headers['referer'] = f'https://www.blibli.com/cari/{encoded_term}'
-        else:
-            if environment == "lowerEnv":
-                headers['referer'] = 'http://localhost:9090/backend/'
-            else:
-                headers['referer'] = 'https://www.blibli.com/'
-        
-        # Make the request (no cookies for lowerEnv)
-        if environment == "lowerEnv":
-            response = requests.get(url, headers=headers, timeout=10)
-        else:
-            response = requests.get(url, headers=headers, cookies=BLIBLI_COOKIES, timeout=10)
-        response.raise_for_status()
-        
-        data = response.json()
-        
-        # Extract products from response
-        products = []
-        if 'data' in data and 'products' in data['data']:
-            for product in data['data']['products'][:limit]:
-                # Skip if product is not a dict
-                if not isinstance(product, dict):
-                    continue
-                
-                # Safely extract product name
-                name = product.get('name', 'N/A')
-                
-                # Safely extract image
-                image = ''
-                images = product.get('images', [])
-                if isinstance(images, list) and len(images) > 0:
-                    if isinstance(images[0], dict):
-                        image = images[0].get('full', '')
-                    elif isinstance(images[0], str):
-                        image = images[0]
-                
-                # Safely extract price - use actual Blibli API field names
-                price = 0
-                price_data = product.get('price', {})
-                if isinstance(price_data, dict):
-                    # Blibli API uses: salePrice, minPrice, listPrice
-                    price = (price_data.get('salePrice') or 
-                            price_data.get('minPrice') or 
-                            price_data.get('listPrice') or 
-                            price_data.get('offered') or 0)
-                elif isinstance(price_data, (int, float)):
-                    price = price_data
-                
-                # Safely extract rating
-                rating = 0
-                review_data = product.get('review', {})
-                if isinstance(review_data, dict):
-                    rating = review_data.get('rating', 0)
-                elif isinstance(review_data, (int, float)):
-                    rating = review_data
-                
-                products.append({
-                    'name': name,
-                    'image': image,
-                    'price': price,
-                    'rating': rating,
-                    'id': product.get('id', ''),
-                    'url': f"https://www.blibli.com{product.get('url', '')}"
-                })
-        
+        # extend() keeps the products yielded before a failed page
+        products.extend(iter_products(
+            search_term,
+            category_codes=category_codes,
+            limit=limit,
+            start_page=page,
+            include_search_term=include_search_term,
+            environment=environment,
+            boost_param=boost_param
+        ))
         return products, None
         
     except Exception as e:
         error_msg = f"Error fetching products: {str(e)}"
         error_details = traceback.format_exc()
-        return [], {'message': error_msg, 'details': error_details}
-
+        return products, {'message': error_msg, 'details': error_details}
@@ -0,0 +1,31 @@
+"""
+Token bucket rate limiter shared by the threads of a batch job
+"""
+
+import threading
+import time
+
+
+class RateLimiter:
+    """Allow `rate` acquisitions per second on average, with bursts up to `burst`"""
+
+    def __init__(self, rate, burst=None):
+        self.rate = float(rate)
+        self.burst = float(burst or max(1, rate))
+        self._tokens = self.burst
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, tokens=1):
+        """Block until `tokens` requests may be sent"""
+        tokens = min(tokens, self.burst)
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.burst, self._tokens + (now - self._last) * self.rate)
+                self._last = now
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return
+                wait = (tokens - self._tokens) / self.rate
+            time.sleep(wait)
@@ -0,0 +1,196 @@
+"""
+Offline control-vs-AI relevance evaluation
+
+Scores how far a term's AI category configuration moves its search results
+away from the control results, without anyone opening the comparison
+dialog:
+
+- jaccard: overlap of the two product id sets (order ignored)
+- rbo: rank-biased overlap of the two rankings (extrapolated, p=RBO_P);
+  top positions weigh most, 1.0 means identical rankings
+- purity: share of the control results that belong to one of the term's
+  active modelIdentifiedCategories
+
+Search results carry no category field, so category membership comes from
+the search API's own category filter: a third request searches the term
+restricted to the AI categories (category=code, no boost). Filtering keeps
+the control ranking order, so every control product within the first
+`limit` that is in those categories is also within the first `limit` of the
+filtered search. The AI side needs no such check; its requests already
+filter by the same categories. purity is None, with purityNote giving the
+reason, when there are no control results to score.
+
+evaluate_terms fetches the sides of many terms concurrently under a shared
+rate limit and stores the scores on each term as relevanceScores, which the
+term table can sort by (see utils/term_queries.SORT_OPTIONS). Run it through
+scripts/evaluate_relevance.py.
+"""
+
+import math
+from concurrent.futures import ThreadPoolExecutor
+
+from pymongo import UpdateOne
+
+from utils.product_comparison import comparison_params
+from utils.product_fetcher import PAGE_SIZE, fetch_products
+
+TERMS_COLLECTION = 'search_term_categories'
+
+# Persistence of the rank-biased overlap: ~86% of the weight sits in the top 10
+RBO_P = 0.9
+
+# Fields evaluate_terms reads from each term
+EVALUATION_PROJECTION = {'searchTerm': 1, 'termType': 1, 'modelIdentifiedCategories': 1}
+
+
+def jaccard(a, b):
+    """|A ∩ B| / |A ∪ B| of two id collections (None when both are empty)"""
+    a, b = set(a), set(b)
+    if not a and not b:
+        return None
+    return len(a & b) / len(a | b)
+
+
+def rank_biased_overlap(a, b, p=RBO_P):
+    """
+    Extrapolated rank-biased overlap of two rankings (Webber et al., 2010)
+
+    Both rankings are cut to the shorter one's depth k:
+        RBO_ext = X_k/k * p^k + (1-p)/p * sum_{d=1..k} X_d/d * p^d
+    where X_d is the overlap of the top d of each ranking.
+
+    Returns:
+        Score in [0, 1], or None when either ranking is empty
+    """
+    k = min(len(a), len(b))
+    if k == 0:
+        return None
+    seen_a, seen_b = set(), set()
+    overlap = 0
+    weighted = 0.0
+    for d in range(1, k + 1):
+        x, y = a[d - 1], b[d - 1]
+        if x == y:
+            overlap += 1
+        else:
+            overlap += (x in seen_b) + (y in seen_a)
+        seen_a.add(x)
+        seen_b.add(y)
+        weighted += overlap / d * p ** d
+    return overlap / k * p ** k + (1 - p) / p * weighted
+
+
+def _product_ids(products):
+    return [product['id'] or product['url'] for product in products]
+
+
+def category_purity(ids, category_ids):
+    """Share of ids found in category_ids (None when ids is empty)"""
+    if not ids:
+        return None
+    category_ids = set(category_ids)
+    return sum(1 for product_id in ids if product_id in category_ids) / len(ids)
+
+
+def score_comparison(control_products, ai_products, category_products):
+    """
+    Relevance scores of one term's control and AI result lists
+
+    Args:
+        category_products: The term's results restricted to its AI
+            categories, at least as deep as control_products
+    """
+    control_ids = _product_ids(control_products)
+    ai_ids = _product_ids(ai_products)
+    scores = {
+        'jaccard': jaccard(control_ids, ai_ids),
+        'rbo': rank_biased_overlap(control_ids, ai_ids),
+        'purity': category_purity(control_ids, _product_ids(category_products)),
+        'controlCount': len(control_products),
+        'aiCount': len(ai_products),
+    }
+    if scores['purity'] is None:
+        scores['purityNote'] = 'no control results'
+    return scores
+
+
+def _fetch_side(term, category_codes, include_search_term, environment, boost_param, limit, limiter):
+    if limiter is not None:
+        limiter.acquire(math.ceil(limit / PAGE_SIZE))
+    return fetch_products(
+        term,
+        category_codes=category_codes,
+        limit=limit,
+        include_search_term=include_search_term,
+        environment=environment,
+        boost_param=boost_param
+    )
+
+
+def evaluate_terms(db, term_docs, environment="lowerEnv", limit=PAGE_SIZE, workers=16, limiter=None,
+                   now=None, batch_size=500, dry_run=False, on_result=None):
+    """
+    Evaluate and store the relevance scores of many terms
+
+    Every term costs three searches (control, AI and the category-filtered
+    control for purity), all run on one pool of
+    `workers` threads; limiter (a utils.rate_limiter.RateLimiter) caps the
+    search API requests per second across them. Scores are written with one
+    unordered bulk_write per batch_size terms.
+
+    Args:
+        term_docs: Iterable of term documents with EVALUATION_PROJECTION fields
+        now: evaluatedDate stored with the scores
+        on_result: Called with (term, scores or None, error message or None) per term
+
+    Returns:
+        Dict with evaluated, failed and skipped counts
+    """
+    collection = db[TERMS_COLLECTION]
+    counts = {'evaluated': 0, 'failed': 0, 'skipped': 0}
+
+    def run_batch(pool, batch):
+        pending = []
+        for doc in batch:
+            _, codes, include_ai, boost_param = comparison_params(doc, environment)
+            if not codes:
+                counts['skipped'] += 1
+                continue
+            term = doc['searchTerm']
+            control = pool.submit(_fetch_side, term, None, True, environment, None, limit, limiter)
+            ai = pool.submit(_fetch_side, term, codes, include_ai, environment, boost_param, limit, limiter)
+            # Category membership of the control results (see the module docstring)
+            in_categories = pool.submit(_fetch_side, term, codes, True, environment, None, limit, limiter)
+            pending.append((term, control, ai, in_categories))
+
+        ops = []
+        for term, control, ai, in_categories in pending:
+            (control_products, control_error), (ai_products, ai_error) = control.result(), ai.result()
+            category_products, category_error = in_categories.result()
+            error = control_error or ai_error or category_error
+            if error:
+                counts['failed'] += 1
+                if on_result:
+                    on_result(term, None, error['message'])
+                continue
+            scores = score_comparison(control_products, ai_products, category_products)
+            scores.update({'environment': environment, 'limit': limit, 'evaluatedDate': now})
+            ops.append(UpdateOne({'searchTerm': term}, {'$set': {'relevanceScores': scores}}))
+            counts['evaluated'] += 1
+            if on_result:
+                on_result(term, scores, None)
+
+        if ops and not dry_run:
+            collection.bulk_write(ops, ordered=False)
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        batch = []
+        for doc in term_docs:
+            batch.append(doc)
+            if len(batch) >= batch_size:
+                run_batch(pool, batch)
+                batch = []
+        if batch:
+            run_batch(pool, batch)
+
+    return counts
@@ -0,0 +1,167 @@
+"""
+C3 category taxonomy (data/c3_categories.csv)
+
+The category pickers used to sort and format every C3 entry on each render
+and ship the full list to the browser. CategoryIndex is built once per
+taxonomy instead:
+
+- codes sorted by name, for listing
+- bisect prefix lookups over codes, full names and each word of a name
+- a trigram index over names and codes for fuzzy matches (typos, partial
+  words)
+
+search() returns only the top matches. Ties are broken by how often a
+category is assigned to terms similar to the one being edited (see
+category_cooccurrence), so the likely picks come first.
+"""
+
+import os
+from bisect import bisect_left
+from collections import Counter
+
+import pandas as pd
+
+from utils.term_search import TERMS_COLLECTION, get_term_search_index, normalize_term
+
+C3_CATEGORIES_FILE = os.path.join(os.path.dirname(__file__), '..', 'data', 'c3_categories.csv')
+
+# Matches returned by CategoryIndex.search
+MAX_MATCHES = 20
+# Share of query trigrams a fuzzy match must contain
+FUZZY_MIN_SHARED = 0.5
+# Similar terms whose categories are counted for suggestions
+SIMILAR_TERMS = 200
+
+# Match strength: a code or name prefix beats a word prefix beats a fuzzy match
+_CODE_PREFIX = 3.0
+_NAME_PREFIX = 2.5
+_WORD_PREFIX = 2.0
+
+
+def load_c3_categories(csv_file=C3_CATEGORIES_FILE):
+    """Return a dict of C3 code -> C3 name"""
+    df = pd.read_csv(csv_file, usecols=['C3Code', 'C3Name'], dtype=str).dropna()
+    return dict(zip(df['C3Code'].str.strip(), df['C3Name'].str.strip()))
+
+
+def _trigrams(text):
+    padded = f" {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def _prefix_range(keys, prefix):
+    """Slice of the sorted (key, value) list whose keys start with prefix"""
+    start = bisect_left(keys, (prefix,))
+    end = bisect_left(keys, (prefix + '\uffff',))
+    return keys[start:end]
+
+
+class CategoryIndex:
+    """Sorted options and fuzzy search over C3 categories (names and codes)"""
+
+    def __init__(self, categories):
+        self.categories = categories
+        # Picker order, computed once
+        self.codes = sorted(categories, key=lambda code: (categories[code].lower(), code))
+
+        self._codes = sorted((code.lower(), code) for code in categories)
+        self._names = sorted((normalize_term(name), code) for code, name in categories.items())
+        self._words = sorted(
+            (word, code)
+            for code, name in categories.items()
+            for word in set(normalize_term(name).split())
+        )
+        self._postings = {}
+        for code, name in categories.items():
+            for gram in _trigrams(normalize_term(name)) | _trigrams(code.lower()):
+                self._postings.setdefault(gram, []).append(code)
+
+    def __len__(self):
+        return len(self.codes)
+
+    def label(self, code):
+        """Option label of a code ("code - name")"""
+        return f"{code} - {self.categories.get(code, code)}"
+
+    def search(self, query, limit=MAX_MATCHES, cooccurrence=None):
+        """
+        Top categories matching query by code or name
+
+        Args:
+            cooccurrence: Optional code -> count (category_cooccurrence);
+                ranks categories of equal match strength
+
+        Returns:
+            List of at most limit codes, best match first
+        """
+        q = normalize_term(query)
+        if not q:
+            return self.suggest(cooccurrence, limit)
+
+        scores = {}
+
+        def hit(code, score):
+            if score > scores.get(code, 0):
+                scores[code] = score
+
+        for _, code in _prefix_range(self._codes, q):
+            hit(code, _CODE_PREFIX)
+        for _, code in _prefix_range(self._names, q):
+            hit(code, _NAME_PREFIX)
+        for _, code in _prefix_range(self._words, q):
+            hit(code, _WORD_PREFIX)
+
+        grams = _trigrams(q)
+        shared = Counter(code for gram in grams for code in self._postings.get(gram, ()))
+        for code, count in shared.items():
+            similarity = count / len(grams)
+            if similarity >= FUZZY_MIN_SHARED:
+                hit(code, similarity)
+
+        cooccurrence = cooccurrence or {}
+        ranked = sorted(
+            scores,
+            key=lambda code: (-scores[code], -cooccurrence.get(code, 0), self.categories[code].lower())
+        )
+        return ranked[:limit]
+
+    def suggest(self, cooccurrence=None, limit=MAX_MATCHES):
+        """Categories most used by similar terms, padded with the first codes by name"""
+        suggested = [code for code, _ in Counter(cooccurrence or {}).most_common() if code in self.categories]
+        if len(suggested) < limit:
+            seen = set(suggested)
+            suggested += [code for code in self.codes[:limit] if code not in seen]
+        return suggested[:limit]
+
+
+def category_cooccurrence(db, term, limit=SIMILAR_TERMS):
+    """
+    How often each category is assigned to terms similar to term
+
+    Similar terms come from the in-process term search index (terms
+    containing any word of term); the term itself is left out.
+
+    Returns:
+        Dict of code -> number of similar terms carrying it
+    """
+    index = get_term_search_index(db)
+    if not index.ready:
+        return {}
+
+    words = sorted({word for word in normalize_term(term).split() if len(word) >= 3}, key=len, reverse=True)
+    similar = {}
+    for query in [term] + words:
+        for match in index.search(query, limit=limit):
+            if match != term:
+                similar.setdefault(match, None)
+        if len(similar) >= limit:
+            break
+    if not similar:
+        return {}
+
+    counts = db[TERMS_COLLECTION].aggregate([
+        {'$match': {'searchTerm': {'$in': list(similar)[:limit]}}},
+        {'$unwind': '$modelIdentifiedCategories'},
+        {'$group': {'_id': '$modelIdentifiedCategories.code', 'count': {'$sum': 1}}},
+    ])
+    return {doc['_id']: doc['count'] for doc in counts}
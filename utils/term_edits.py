@@ -0,0 +1,220 @@
+"""
+Atomic edit operations on AI (model) categories
+
+Each edit is a single find_one_and_update with a pipeline update that, in one
+server-side step:
+
+- applies the change to modelIdentifiedCategories
+- recomputes termType from the new catalog/model intersection
+- auto-locks the term when its materialized upwardDays reached
+  AUTO_LOCK_UPWARD_DAYS (see utils/trend_store.refresh_trend_stats)
+- bumps updatedDate and version
+
+and returns the pre-image, which supplies the old values for the audit
+entry. The audit events are then appended to edit_events with one insert, so
+an edit costs two round-trips instead of a read, a write, a history push, an
+auto-lock read, a trends read and a lock write.
+
+Concurrent editors are handled optimistically: every edit increments the
+term's version field, and an edit given expected_version only matches a
+document still at that version. A lost race therefore fails without writing
+anything, and the result carries the current document so the UI can show
+what changed and let the editor retry. Documents without a version field
+count as version 0.
+"""
+
+from collections import namedtuple
+
+from pymongo import ReturnDocument
+
+from utils.edit_events import EDIT_EVENTS_COLLECTION, build_edit_event
+from utils.term_queries import EDIT_PROJECTION, get_term
+
+TERMS_COLLECTION = 'search_term_categories'
+
+EDIT_OK = 'ok'
+# The term changed since the editor loaded it (version mismatch)
+EDIT_CONFLICT = 'conflict'
+# Nothing to change: term missing, category missing or already present, same boost
+EDIT_NOOP = 'noop'
+
+# status: one of the EDIT_* values
+# doc: the pre-image when status is EDIT_OK, else the current document (None if deleted)
+EditResult = namedtuple('EditResult', ['status', 'doc', 'auto_locked'])
+
+# Consecutive days of rising CTR after which an edited term is locked
+AUTO_LOCK_UPWARD_DAYS = 5
+
+# Fields read from the pre-image
+_PRE_IMAGE = {'modelIdentifiedCategories': 1, 'status': 1, 'upwardDays': 1, 'termType': 1, 'version': 1}
+
+
+def version_of(doc):
+    """Optimistic concurrency version of a term document"""
+    return doc.get('version') or 0
+
+
+def versioned(query, expected_version):
+    if expected_version is None:
+        return query
+    # None also matches documents written before the version field existed
+    return {**query, 'version': expected_version if expected_version else {'$in': [0, None]}}
+
+
+def _derived_fields(now):
+    """Pipeline stage recomputing termType, auto-lock status, updatedDate and version"""
+    is_boosting = {'$gt': [
+        {'$size': {'$setIntersection': [
+            {'$ifNull': ['$catalogCategories.code', []]},
+            {'$ifNull': ['$modelIdentifiedCategories.code', []]}
+        ]}},
+        0
+    ]}
+    return {'$set': {
+        'termType': {'$cond': [is_boosting, 'boostingConfiguration', 'filterConfiguration']},
+        'termTypeClassifiedDate': {'$literal': now},
+        'status': {'$cond': [
+            {'$gte': [{'$ifNull': ['$upwardDays', 0]}, AUTO_LOCK_UPWARD_DAYS]},
+            'locked',
+            {'$ifNull': ['$status', 'in_progress']}
+        ]},
+        'updatedDate': {'$literal': now},
+        'version': {'$add': [{'$ifNull': ['$version', 0]}, 1]},
+    }}
+
+
+def edit_pipeline(categories_expr, now):
+    """Pipeline update setting modelIdentifiedCategories and recomputing the derived fields"""
+    return [{'$set': {'modelIdentifiedCategories': categories_expr}}, _derived_fields(now)]
+
+
+def _apply(db, term, query, categories_expr, now, expected_version):
+    """
+    Run one atomic edit
+
+    Returns:
+        Tuple of (pre-image, None) on success, else (None, EditResult for the failure)
+    """
+    collection = db[TERMS_COLLECTION]
+    before = collection.find_one_and_update(
+        versioned(query, expected_version),
+        edit_pipeline(categories_expr, now),
+        projection=_PRE_IMAGE,
+        return_document=ReturnDocument.BEFORE
+    )
+    if before is not None:
+        return before, None
+
+    # Only a failed edit pays for this read: tell a conflict from a no-op (on the
+    # primary, so the version compared is the one the update just failed against)
+    current = get_term(db, term, EDIT_PROJECTION, primary=True)
+    if current is not None and expected_version is not None and version_of(current) != expected_version:
+        return None, EditResult(EDIT_CONFLICT, current, False)
+    return None, EditResult(EDIT_NOOP, current, False)
+
+
+def was_auto_locked(before):
+    """Whether applying an edit to this pre-image auto-locked the term"""
+    return before.get('status') != 'locked' and (before.get('upwardDays') or 0) >= AUTO_LOCK_UPWARD_DAYS
+
+
+def _find_category(before, category_code):
+    for cat in before.get('modelIdentifiedCategories', []):
+        if cat.get('code') == category_code:
+            return cat
+    return None
+
+
+def auto_lock_event(term, before, now):
+    """Audit event for an edit that auto-locked the term"""
+    return build_edit_event(term, 'auto_locked', f"Auto-locked after {before['upwardDays']} days of upward trend", now)
+
+
+def _log(db, term, before, action, details, now):
+    """Append the edit's audit events and build the successful EditResult"""
+    events = [build_edit_event(term, action, details, now)]
+    auto_locked = was_auto_locked(before)
+    if auto_locked:
+        events.append(auto_lock_event(term, before, now))
+    db[EDIT_EVENTS_COLLECTION].insert_many(events, ordered=True)
+    return EditResult(EDIT_OK, before, auto_locked)
+
+
+def update_boost(db, term, category_code, new_boost, now, expected_version=None):
+    """
+    Set the boost of one model category
+
+    Args:
+        expected_version: Version the editor loaded, or None to skip the check
+
+    Returns:
+        EditResult (EDIT_NOOP when the category is missing or already has that boost)
+    """
+    query = {
+        'searchTerm': term,
+        'modelIdentifiedCategories': {'$elemMatch': {'code': category_code, 'boostValue': {'$ne': new_boost}}}
+    }
+    categories = {'$map': {
+        'input': '$modelIdentifiedCategories',
+        'as': 'cat',
+        'in': {'$cond': [
+            {'$eq': ['$$cat.code', {'$literal': category_code}]},
+            {'$mergeObjects': ['$$cat', {'boostValue': {'$literal': new_boost}}]},
+            '$$cat'
+        ]}
+    }}
+    before, failure = _apply(db, term, query, categories, now, expected_version)
+    if failure:
+        return failure
+
+    cat = _find_category(before, category_code)
+    details = f"Updated boost for '{cat['name']}' from {cat.get('boostValue', 100)} to {new_boost}"
+    return _log(db, term, before, 'boost_update', details, now)
+
+
+def add_category(db, term, category_code, category_name, boost_value, now, expected_version=None):
+    """
+    Add a manual model category (score 0)
+
+    Returns:
+        EditResult (EDIT_NOOP when the term is missing or already has the category)
+    """
+    query = {'searchTerm': term, 'modelIdentifiedCategories.code': {'$ne': category_code}}
+    new_category = {
+        'code': category_code,
+        'name': category_name,
+        'score': 0,  # Manual entries have 0 score
+        'boostValue': boost_value
+    }
+    categories = {'$concatArrays': [
+        {'$ifNull': ['$modelIdentifiedCategories', []]},
+        [{'$literal': new_category}]
+    ]}
+    before, failure = _apply(db, term, query, categories, now, expected_version)
+    if failure:
+        return failure
+
+    details = f"Added category '{category_name}' (boost: {boost_value})"
+    return _log(db, term, before, 'category_added', details, now)
+
+
+def remove_category(db, term, category_code, now, expected_version=None):
+    """
+    Remove a model category
+
+    Returns:
+        EditResult (EDIT_NOOP when the category is missing)
+    """
+    query = {'searchTerm': term, 'modelIdentifiedCategories.code': category_code}
+    categories = {'$filter': {
+        'input': '$modelIdentifiedCategories',
+        'as': 'cat',
+        'cond': {'$ne': ['$$cat.code', {'$literal': category_code}]}
+    }}
+    before, failure = _apply(db, term, query, categories, now, expected_version)
+    if failure:
+        return failure
+
+    cat = _find_category(before, category_code)
+    details = f"Removed category '{cat['name']}'"
+    return _log(db, term, before, 'category_removed', details, now)
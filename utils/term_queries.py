@@ -0,0 +1,302 @@
+"""
+Page-level data loading for the term table
+
+Rendering a page of the term list used to cost one query for the page, one
+count and one trend lookup per row. load_term_page fetches everything a page
+displays in a fixed number of round-trips and returns a compact view model,
+so the cost of a page no longer grows with its size.
+"""
+
+import json
+import threading
+import time
+
+from pymongo import ASCENDING, DESCENDING, ReadPreference
+
+from utils.term_search import get_term_search_index, prefix_filter
+from utils.trend_store import TERMS_COLLECTION
+
+# Seconds a per-filter total stays cached
+COUNT_TTL = 60
+COUNT_CACHE_SIZE = 256
+
+_count_cache = {}
+_count_lock = threading.Lock()
+
+# Ranked search matches sent to MongoDB per $in: the first window is one
+# page plus the next page's worth; it doubles up to MAX_SEARCH_WINDOW while
+# the status and trend filters keep rejecting matches
+MAX_SEARCH_WINDOW = 500
+
+# Categories shown per row in the term table
+LIST_CATEGORY_LIMIT = 5
+
+# List view: only what the term table renders, with the category arrays cut
+# to the displayed rows; the full category lists stay on the server.
+# Aggregation $project syntax.
+LIST_PROJECTION = {
+    'searchTerm': 1,
+    'status': 1,
+    'termType': 1,
+    'catalogCategories': {'$slice': ['$catalogCategories', LIST_CATEGORY_LIMIT]},
+    'modelIdentifiedCategories': {'$slice': ['$modelIdentifiedCategories', LIST_CATEGORY_LIMIT]},
+    'updatedDate': 1,
+    'trendStatus': 1,
+    'pctChange5d': 1,
+    'relevanceScores': 1,
+    'loads': 1,
+}
+
+# Term table orders: (sort field, direction). Score orders only list terms
+# evaluated by scripts/evaluate_relevance.py.
+SORT_OPTIONS = {
+    'updated': ('updatedDate', DESCENDING),
+    # The search index ranking (Loads from data/non_performing_terms.csv)
+    'loads': ('loads', DESCENDING),
+    # Results the AI categories change most first
+    'overlap': ('relevanceScores.rbo', ASCENDING),
+    # Control results least inside the AI categories first
+    'purity': ('relevanceScores.purity', ASCENDING),
+}
+
+# Detail views: find_one projections for the dialogs (see get_term)
+EDIT_PROJECTION = {'status': 1, 'version': 1, 'catalogCategories': 1, 'modelIdentifiedCategories': 1}
+COMPARISON_PROJECTION = {'termType': 1, 'modelIdentifiedCategories': 1}
+
+
+def build_term_filter(search_clause=None, status_filter=None, trend_filter="all"):
+    """
+    Build the search_term_categories filter for the term table
+
+    The trend filter matches the trendStatus field materialized on each term
+    (scripts/materialize_trend_stats.py), so it is an indexed equality
+    instead of a list of every matching term pulled from search_term_trends.
+    New terms get it on insert (utils.trend_store.INITIAL_TREND_STATS).
+    """
+    clauses = []
+
+    if search_clause:
+        clauses.append(search_clause)
+
+    if status_filter:
+        clauses.append({'status': status_filter})
+
+    if trend_filter != "all":
+        clauses.append({'trendStatus': trend_filter})
+
+    if not clauses:
+        return {}
+    if len(clauses) == 1:
+        return clauses[0]
+    return {'$and': clauses}
+
+
+def _after_token(filter_query, page_token, sort_field='updatedDate', direction=DESCENDING):
+    """
+    Restrict filter_query to terms after a (sort value, _id) page token
+
+    Null or missing sort values sort below every value: they form the tail
+    of a descending order and the head of an ascending one, and {field: None}
+    matches both.
+    """
+    if page_token is None:
+        return filter_query
+    last_value, last_id = page_token
+    op = '$lt' if direction == DESCENDING else '$gt'
+    if last_value is None:
+        after = {sort_field: None, '_id': {op: last_id}}
+        if direction == ASCENDING:
+            after = {'$or': [after, {sort_field: {'$ne': None}}]}
+    else:
+        after = {'$or': [
+            {sort_field: {op: last_value}},
+            {sort_field: last_value, '_id': {op: last_id}},
+        ]}
+        if direction == DESCENDING:
+            after['$or'].append({sort_field: None})
+    return {'$and': [filter_query, after]} if filter_query else after
+
+
+def _sort_value(row, sort_field):
+    """Value of a (dotted) sort field in a row"""
+    value = row
+    for part in sort_field.split('.'):
+        value = (value or {}).get(part)
+    return value
+
+
+def _page_pipeline(filter_query, limit, sort_field='updatedDate', direction=DESCENDING):
+    """Page of terms in table order"""
+    return [
+        {'$match': filter_query},
+        {'$sort': {sort_field: direction, '_id': direction}},
+        {'$limit': limit},
+        {'$project': LIST_PROJECTION},
+    ]
+
+
+def to_row(doc):
+    """Compact view model for one term table row"""
+    return {
+        '_id': doc['_id'],
+        'searchTerm': doc['searchTerm'],
+        'status': doc.get('status', 'in_progress'),
+        'termType': doc.get('termType'),
+        'catalogCategories': doc.get('catalogCategories', []),
+        'modelIdentifiedCategories': doc.get('modelIdentifiedCategories', []),
+        'updatedDate': doc.get('updatedDate'),
+        'trendStatus': doc.get('trendStatus') or 'neutral',
+        'pctChange5d': doc.get('pctChange5d') or 0,
+        'relevanceScores': doc.get('relevanceScores'),
+        'loads': doc.get('loads'),
+    }
+
+
+def count_terms(db, filter_query):
+    """
+    Number of terms matching filter_query, cached per filter for COUNT_TTL seconds
+
+    The unfiltered total uses the collection metadata count instead of a scan.
+    """
+    key = json.dumps(filter_query, sort_keys=True, default=str)
+    now = time.monotonic()
+    cached = _count_cache.get(key)
+    if cached and cached[1] > now:
+        return cached[0]
+
+    collection = db[TERMS_COLLECTION]
+    total = collection.estimated_document_count() if not filter_query else collection.count_documents(filter_query)
+    with _count_lock:
+        if len(_count_cache) >= COUNT_CACHE_SIZE:
+            _count_cache.clear()
+        _count_cache[key] = (total, now + COUNT_TTL)
+    return total
+
+
+def _search_page(db, index, query, offset, limit, status_filter=None, trend_filter="all"):
+    """
+    One page of a search, in the index's ranking (see TermSearchIndex.search)
+
+    Walks the ranked matches from offset in windows and keeps those that
+    pass the status and trend filters, until limit + 1 rows are found. Each
+    window is one bounded $in query; nothing scans the collection.
+
+    Returns:
+        Tuple of (row dicts, total, next offset or None). The total is the
+        index's match count, an upper bound when filters apply (exact once a
+        first page reaches the last match).
+    """
+    filter_query = build_term_filter(None, status_filter, trend_filter)
+    collection = db[TERMS_COLLECTION]
+    start = offset
+    found = []
+    window = 2 * limit
+    while len(found) <= limit:
+        terms, total = index.search_window(query, offset, window)
+        if not terms:
+            break
+        in_window = {'searchTerm': {'$in': terms}}
+        docs = collection.aggregate([
+            {'$match': {'$and': [in_window, filter_query]} if filter_query else in_window},
+            {'$project': LIST_PROJECTION},
+        ])
+        by_term = {doc['searchTerm']: doc for doc in docs}
+        # (offset just past the row, row) in ranked order
+        found += [(offset + i + 1, to_row(by_term[term])) for i, term in enumerate(terms) if term in by_term]
+        offset += len(terms)
+        if offset >= total:
+            if start == 0:
+                # Every match was checked against the filters
+                total = len(found)
+            break
+        window = min(window * 2, MAX_SEARCH_WINDOW)
+
+    next_offset = None
+    if len(found) > limit:
+        found = found[:limit]
+        next_offset = found[-1][0]
+    return [row for _, row in found], total, next_offset
+
+
+def invalidate_term_counts():
+    """Drop cached counts (after inserts, deletes or status changes)"""
+    with _count_lock:
+        _count_cache.clear()
+
+
+def load_term_page(db, page_token=None, limit=10, query="", status_filter=None, trend_filter="all", sort="updated"):
+    """
+    Load one page of the term table
+
+    Pages are addressed by keyset tokens instead of skip: the default order
+    is (updatedDate, _id) descending and a token is the (updatedDate, _id) of
+    the previous page's last row, so every page is an index range scan
+    however deep it is. The other SORT_OPTIONS orders page the same way on
+    (field, _id); the relevance score orders only list terms that have the
+    score.
+
+    A search query is answered from the in-process search index instead
+    (see _search_page): results are in its ranking (containment, then
+    Loads) whatever the chosen order, and a page token is the offset into
+    the ranked matches. While the index is still loading after a restart,
+    the query is an index-backed prefix match in the chosen order.
+
+    One aggregation returns the page rows. The total comes from
+    count_terms, cached per filter.
+
+    Args:
+        page_token: None for the first page, else the next_token of the previous page
+
+    Returns:
+        Tuple of (list of row dicts, total matching terms, next_token or None)
+    """
+    search_clause = None
+    if query:
+        index = get_term_search_index(db)
+        if index.ready:
+            index.maybe_refresh(db)
+            offset = page_token if isinstance(page_token, int) else 0
+            return _search_page(db, index, query, offset, limit, status_filter, trend_filter)
+        search_clause = prefix_filter(query)
+        if isinstance(page_token, int):
+            page_token = None
+
+    filter_query = build_term_filter(search_clause, status_filter, trend_filter)
+    sort_field, direction = SORT_OPTIONS[sort]
+    if sort_field.startswith('relevanceScores.'):
+        scored = {sort_field: {'$type': 'number'}}
+        filter_query = {'$and': [filter_query, scored]} if filter_query else scored
+    total = count_terms(db, filter_query)
+    if total == 0:
+        return [], 0, None
+
+    pipeline = _page_pipeline(
+        _after_token(filter_query, page_token, sort_field, direction), limit + 1,
+        sort_field=sort_field, direction=direction
+    )
+    rows = [to_row(doc) for doc in db[TERMS_COLLECTION].aggregate(pipeline)]
+
+    # The extra row only tells whether there is a next page
+    next_token = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_token = (_sort_value(rows[-1], sort_field), rows[-1]['_id'])
+
+    return rows, total, next_token
+
+
+def get_term(db, term, projection=None, primary=False):
+    """
+    Fetch a single term for a detail view
+
+    Args:
+        projection: One of the *_PROJECTION detail projections, or None for the full document
+        primary: Read from the primary instead of the connection's read
+            preference (secondaryPreferred). Needed wherever the version is
+            later checked by an edit: a lagging secondary would return a
+            version older than the editor's own last write.
+    """
+    collection = db[TERMS_COLLECTION]
+    if primary:
+        collection = collection.with_options(read_preference=ReadPreference.PRIMARY)
+    return collection.find_one({'searchTerm': term}, projection)
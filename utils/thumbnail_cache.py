@@ -0,0 +1,217 @@
+"""
+Product image thumbnails with a disk LRU cache
+
+The comparison grid used to embed each product's full-size image URL, so
+every open of the dialog made the browser download up to 80 full-resolution
+images. The thumbnail server (scripts/thumbnail_server.py) serves them
+instead:
+
+- each image is fetched from its CDN once, resized to grid size and stored
+  as a small JPEG in THUMBNAIL_DIR
+- the cache is an LRU bounded by THUMBNAIL_CACHE_BYTES: a hit refreshes the
+  file's mtime and a write evicts the least recently used files
+- responses carry a one-year immutable Cache-Control, so the browser asks
+  for each thumbnail only once
+
+Only images on ALLOWED_IMAGE_HOSTS are fetched, so the server is not an open
+proxy.
+
+Thumbnail URLs are written into the page the reviewer's browser loads, so
+they use THUMBNAIL_PUBLIC_URL, the server's browser-reachable address (e.g.
+http://sensei.internal:8091). THUMBNAIL_SERVER_URL is only the address the
+app itself uses for health checks. thumbnail_url() falls back to the
+original URL when no public URL is configured or the server is not running.
+"""
+
+import hashlib
+import io
+import os
+import threading
+import time
+import urllib.parse
+
+import requests
+
+THUMBNAIL_DIR = os.path.join(os.path.dirname(__file__), '..', 'data', 'thumbnail_cache')
+# Address the app server checks the thumbnail server's health on
+THUMBNAIL_SERVER_URL = os.environ.get('THUMBNAIL_SERVER_URL', 'http://localhost:8091')
+# Address browsers load thumbnails from; unset serves the original image URLs
+THUMBNAIL_PUBLIC_URL = os.environ.get('THUMBNAIL_PUBLIC_URL', '').rstrip('/')
+
+# Bytes kept on disk before the least recently used thumbnails are evicted
+THUMBNAIL_CACHE_BYTES = 512 * 1024 * 1024
+# Allowed widths (the grid shows 150px images; 300 covers 2x displays)
+THUMBNAIL_WIDTHS = (150, 300)
+DEFAULT_WIDTH = 300
+JPEG_QUALITY = 80
+# Largest source image downloaded
+MAX_SOURCE_BYTES = 10 * 1024 * 1024
+FETCH_TIMEOUT = 10
+
+# Image CDNs of the search API responses (a host or any of its subdomains)
+ALLOWED_IMAGE_HOSTS = ('static-src.com', 'blibli.com')
+
+# Seconds a server health check result is reused by thumbnail_url
+HEALTH_CHECK_TTL = 60
+
+_health = {'ok': False, 'checked': 0}
+_health_lock = threading.Lock()
+
+
+def is_allowed_image_url(url):
+    """Whether url is an http(s) URL on one of ALLOWED_IMAGE_HOSTS"""
+    try:
+        parsed = urllib.parse.urlsplit(url)
+    except ValueError:
+        return False
+    host = (parsed.hostname or '').lower()
+    if parsed.scheme not in ('http', 'https') or not host:
+        return False
+    return any(host == allowed or host.endswith('.' + allowed) for allowed in ALLOWED_IMAGE_HOSTS)
+
+
+def _server_available():
+    """Health check of the thumbnail server, cached for HEALTH_CHECK_TTL seconds"""
+    now = time.monotonic()
+    if now - _health['checked'] < HEALTH_CHECK_TTL:
+        return _health['ok']
+    with _health_lock:
+        if now - _health['checked'] >= HEALTH_CHECK_TTL:
+            try:
+                _health['ok'] = requests.get(f"{THUMBNAIL_SERVER_URL}/health", timeout=0.5).ok
+            except requests.RequestException:
+                _health['ok'] = False
+            _health['checked'] = now
+    return _health['ok']
+
+
+def thumbnail_url(image_url, width=DEFAULT_WIDTH):
+    """
+    URL to embed for a product image
+
+    Returns the public thumbnail server URL for allowed images while the
+    server is up, else image_url unchanged.
+    """
+    if not THUMBNAIL_PUBLIC_URL or not image_url or not is_allowed_image_url(image_url) or not _server_available():
+        return image_url
+    return f"{THUMBNAIL_PUBLIC_URL}/thumbnail?" + urllib.parse.urlencode({'url': image_url, 'w': width})
+
+
+def thumbnail_key(image_url, width):
+    """Cache file name (and ETag) of a thumbnail"""
+    return hashlib.sha1(f"{width}|{image_url}".encode('utf-8')).hexdigest()
+
+
+def make_thumbnail(data, width):
+    """Resize image bytes to fit width x width and encode them as JPEG"""
+    from PIL import Image
+
+    with Image.open(io.BytesIO(data)) as image:
+        image.draft('RGB', (width, width))  # JPEG sources decode at a reduced scale
+        image = image.convert('RGB')
+        image.thumbnail((width, width))
+        out = io.BytesIO()
+        image.save(out, format='JPEG', quality=JPEG_QUALITY, optimize=True)
+    return out.getvalue()
+
+
+def fetch_image(image_url, session=None):
+    """Download a source image (at most MAX_SOURCE_BYTES)"""
+    # No redirects: they could lead off ALLOWED_IMAGE_HOSTS
+    response = (session or requests).get(image_url, timeout=FETCH_TIMEOUT, stream=True, allow_redirects=False)
+    response.raise_for_status()
+    if response.status_code != 200:
+        response.close()
+        raise ValueError(f"Unexpected status {response.status_code} for image")
+    data = bytearray()
+    for chunk in response.iter_content(64 * 1024):
+        data.extend(chunk)
+        if len(data) > MAX_SOURCE_BYTES:
+            response.close()
+            raise ValueError(f"Image larger than {MAX_SOURCE_BYTES} bytes")
+    return bytes(data)
+
+
+class ThumbnailCache:
+    """Disk LRU cache of thumbnails, safe to share between server threads"""
+
+    def __init__(self, directory=THUMBNAIL_DIR, max_bytes=THUMBNAIL_CACHE_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        # One lock per key being generated: concurrent requests for the same image fetch it once
+        self._pending = {}
+        os.makedirs(directory, exist_ok=True)
+        self._sizes = {}
+        for entry in os.scandir(directory):
+            if entry.is_file() and entry.name.endswith('.jpg'):
+                self._sizes[entry.path] = entry.stat().st_size
+        self._total = sum(self._sizes.values())
+
+    def _path(self, key):
+        return os.path.join(self.directory, key + '.jpg')
+
+    def _read(self, path):
+        try:
+            with open(path, 'rb') as f:
+                data = f.read()
+            os.utime(path)  # mtime is the LRU clock
+        except FileNotFoundError:
+            return None
+        return data
+
+    def _write(self, path, data):
+        tmp = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp, 'wb') as f:
+            f.write(data)
+        os.replace(tmp, path)
+        with self._lock:
+            self._total += len(data) - self._sizes.get(path, 0)
+            self._sizes[path] = len(data)
+            if self._total > self.max_bytes:
+                self._evict()
+
+    def _evict(self):
+        """Remove least recently used files until the cache is 90% full (caller holds the lock)"""
+        by_age = []
+        for path in self._sizes:
+            try:
+                by_age.append((os.stat(path).st_mtime, path))
+            except FileNotFoundError:
+                by_age.append((0, path))
+        by_age.sort()
+        target = self.max_bytes * 0.9
+        for _, path in by_age:
+            if self._total <= target:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            self._total -= self._sizes.pop(path)
+
+    def get(self, image_url, width, session=None):
+        """
+        Thumbnail bytes of image_url, fetched and resized on a miss
+
+        Returns:
+            Tuple of (JPEG bytes, key)
+        """
+        key = thumbnail_key(image_url, width)
+        path = self._path(key)
+        data = self._read(path)
+        if data is not None:
+            return data, key
+
+        with self._lock:
+            key_lock = self._pending.setdefault(key, threading.Lock())
+        with key_lock:
+            try:
+                data = self._read(path)
+                if data is None:
+                    data = make_thumbnail(fetch_image(image_url, session), width)
+                    self._write(path, data)
+            finally:
+                with self._lock:
+                    self._pending.pop(key, None)
+        return data, key
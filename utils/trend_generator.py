@@ -0,0 +1,80 @@
+"""
+Vectorized synthetic CTR/CVR trend generation
+
+NumPy equivalent of the per-element loops in scripts/populate_trends_data.py
+and scripts/create_demo_data.py: a whole block of terms is generated in one
+pass from a seeded Generator, so millions of series can be produced for load
+testing in seconds.
+"""
+
+import numpy as np
+
+TREND_TYPES = ('improvement', 'underperforming', 'neutral')
+
+# Per trend type: (slope over the series, noise low, noise high, clip low, clip high)
+# Same shapes as create_demo_data.generate_ctr_trend
+TREND_PARAMS = {
+    'improvement': (0.20, -0.02, 0.03, 0.05, 0.60),
+    'underperforming': (-0.15, -0.03, 0.02, 0.05, 0.60),
+    'neutral': (0.0, -0.05, 0.05, 0.05, 0.50),
+}
+
+
+def pick_trend_types(rng, num_terms, weights=None):
+    """Draw a trend type index (into TREND_TYPES) for each term"""
+    return rng.choice(len(TREND_TYPES), size=num_terms, p=weights)
+
+
+def generate_trend_matrix(rng, trend_type_idx, num_days):
+    """
+    Generate CTR and CVR series for many terms at once
+
+    Args:
+        rng: numpy.random.Generator
+        trend_type_idx: int array (num_terms,) of indexes into TREND_TYPES
+        num_days: Number of daily points per series
+
+    Returns:
+        Tuple of (ctr, cvr) float arrays with shape (num_terms, num_days), rounded to 3 places
+    """
+    num_terms = len(trend_type_idx)
+    params = np.array([TREND_PARAMS[t] for t in TREND_TYPES])[trend_type_idx]
+    slope, noise_low, noise_high, clip_low, clip_high = (params[:, i:i + 1] for i in range(5))
+
+    base_ctr = rng.uniform(0.20, 0.30, size=(num_terms, 1))
+    progress = np.arange(num_days) / num_days
+    noise = noise_low + (noise_high - noise_low) * rng.random((num_terms, num_days))
+
+    ctr = np.clip(base_ctr + slope * progress + noise, clip_low, clip_high).round(3)
+    cvr = (ctr * rng.uniform(0.3, 0.6, size=(num_terms, num_days))).round(3)
+    return ctr, cvr
+
+
+def classify_trend_matrix(ctr, window=5, threshold_pct=1.0):
+    """
+    Vectorized trend status from the last `window` CTR points
+
+    Same rule as populate_trends_data: more than +1% is improvement,
+    less than -1% is underperforming, otherwise neutral.
+
+    Returns:
+        Tuple of (trend type labels array, percent change array)
+    """
+    num_terms = ctr.shape[0]
+    if ctr.shape[1] < window:
+        return np.full(num_terms, 'neutral', dtype=object), np.zeros(num_terms)
+
+    first = ctr[:, -window]
+    last = ctr[:, -1]
+    pct_change = np.divide((last - first) * 100, first, out=np.zeros(num_terms), where=first > 0)
+
+    labels = np.full(num_terms, 'neutral', dtype=object)
+    labels[pct_change > threshold_pct] = 'improvement'
+    labels[pct_change < -threshold_pct] = 'underperforming'
+    return labels, pct_change
+
+
+def upward_streak_matrix(ctr, max_days=30):
+    """Vectorized count of consecutive day-over-day CTR increases ending at the last point"""
+    ups = np.diff(ctr, axis=1)[:, ::-1] > 0
+    return np.minimum(np.cumprod(ups, axis=1).sum(axis=1), max_days)
@@ -0,0 +1,364 @@
+"""
+Bucketed time-series storage for search term CTR/CVR trends
+
+Daily points live in search_term_trend_buckets, one document per term and
+calendar month:
+
+    {
+        'searchTerm': 'adidas',
+        'month': '2024-11',
+        'points': [{'date': '2024-11-01', 'ctr': 0.21, 'cvr': 0.08}, ...],  # sorted by date
+        'count': 30,
+        'firstDate': '2024-11-01',
+        'lastDate': '2024-11-30'
+    }
+
+Appending a day touches one small bucket instead of rewriting the whole
+series, and windowed reads only fetch the months they cover. A bucket holds
+at most 31 points, so documents stay tiny however long the history grows.
+
+search_term_trends keeps one summary document per term (trendType,
+lastUpdated), and the latest statistics are materialized onto the term
+document (see refresh_trend_stats).
+
+Dates are 'YYYY-MM-DD' strings, the same format the trends dialog plots.
+"""
+
+from datetime import datetime, timedelta
+
+from pymongo import ASCENDING, DESCENDING, UpdateOne
+from pymongo.errors import BulkWriteError, DuplicateKeyError
+
+from utils.ist import now_ist
+
+TRENDS_COLLECTION = 'search_term_trends'
+TREND_BUCKETS_COLLECTION = 'search_term_trend_buckets'
+
+DUPLICATE_KEY_ERROR = 11000
+
+
+def month_of(date_str):
+    """Bucket key ('YYYY-MM') for a 'YYYY-MM-DD' date string"""
+    return date_str[:7]
+
+
+def ensure_trend_indexes(db):
+    """Create the indexes the trend store relies on"""
+    db[TREND_BUCKETS_COLLECTION].create_index(
+        [('searchTerm', ASCENDING), ('month', ASCENDING)],
+        unique=True,
+        name='searchTerm_month_unique'
+    )
+    db[TRENDS_COLLECTION].create_index([('searchTerm', ASCENDING)], unique=True, name='searchTerm_unique')
+    db[TRENDS_COLLECTION].create_index([('trendType', ASCENDING)], name='trendType')
+
+
+def _append_update(term, date_str, ctr, cvr):
+    """Filter and update for an idempotent upsert of one daily point into its month bucket"""
+    # The $ne guard makes re-appending the same day a no-op: the filter stops
+    # matching and the upsert collides with the unique index instead.
+    query = {'searchTerm': term, 'month': month_of(date_str), 'points.date': {'$ne': date_str}}
+    update = {
+        '$push': {'points': {'$each': [{'date': date_str, 'ctr': ctr, 'cvr': cvr}], '$sort': {'date': 1}}},
+        '$inc': {'count': 1},
+        '$min': {'firstDate': date_str},
+        '$max': {'lastDate': date_str}
+    }
+    return query, update
+
+
+def append_daily_point(db, term, date_str, ctr, cvr, refresh_stats=True):
+    """
+    Append one daily CTR/CVR point for a term
+
+    Args:
+        refresh_stats: Recompute the term's materialized trend fields afterwards
+
+    Returns:
+        True if the point was stored, False if that day already existed
+    """
+    query, update = _append_update(term, date_str, ctr, cvr)
+    try:
+        db[TREND_BUCKETS_COLLECTION].update_one(query, update, upsert=True)
+    except DuplicateKeyError:
+        return False
+    if refresh_stats:
+        refresh_trend_stats(db, term)
+    return True
+
+
+def append_daily_points(db, points, batch_size=1000):
+    """
+    Append many daily points with unordered bulk writes
+
+    Materialized trend fields are not refreshed here; run
+    scripts/materialize_trend_stats.py (or refresh_trend_stats) afterwards.
+
+    Args:
+        points: Iterable of (term, date_str, ctr, cvr) tuples
+
+    Returns:
+        Number of points stored (days that already existed are skipped)
+    """
+    collection = db[TREND_BUCKETS_COLLECTION]
+    stored = 0
+    ops = []
+
+    def flush(ops):
+        try:
+            result = collection.bulk_write(ops, ordered=False)
+            return result.upserted_count + result.modified_count
+        except BulkWriteError as e:
+            details = e.details
+            real_errors = [err for err in details.get('writeErrors', []) if err.get('code') != DUPLICATE_KEY_ERROR]
+            if real_errors:
+                raise
+            return details.get('nUpserted', 0) + details.get('nModified', 0)
+
+    for term, date_str, ctr, cvr in points:
+        ops.append(UpdateOne(*_append_update(term, date_str, ctr, cvr), upsert=True))
+        if len(ops) >= batch_size:
+            stored += flush(ops)
+            ops = []
+    if ops:
+        stored += flush(ops)
+    return stored
+
+
+def build_bucket_docs(term, timestamps, ctr, cvr):
+    """Group parallel ctr/cvr/timestamps lists into month bucket documents"""
+    buckets = {}
+    for date_str, ctr_value, cvr_value in sorted(zip(timestamps, ctr, cvr)):
+        month = month_of(date_str)
+        bucket = buckets.setdefault(month, {'searchTerm': term, 'month': month, 'points': []})
+        bucket['points'].append({'date': date_str, 'ctr': ctr_value, 'cvr': cvr_value})
+
+    for bucket in buckets.values():
+        bucket['count'] = len(bucket['points'])
+        bucket['firstDate'] = bucket['points'][0]['date']
+        bucket['lastDate'] = bucket['points'][-1]['date']
+    return list(buckets.values())
+
+
+def replace_series(db, term, timestamps, ctr, cvr):
+    """Replace a term's whole trend history (used by the data generators)"""
+    collection = db[TREND_BUCKETS_COLLECTION]
+    collection.delete_many({'searchTerm': term})
+    buckets = build_bucket_docs(term, timestamps, ctr, cvr)
+    if buckets:
+        collection.insert_many(buckets)
+
+
+def delete_series(db, term):
+    """Remove all trend points and the summary for a term"""
+    db[TREND_BUCKETS_COLLECTION].delete_many({'searchTerm': term})
+    db[TRENDS_COLLECTION].delete_one({'searchTerm': term})
+
+
+def _to_series(points):
+    return {
+        'timestamps': [p['date'] for p in points],
+        'ctr': [p['ctr'] for p in points],
+        'cvr': [p['cvr'] for p in points],
+    }
+
+
+def get_trend_window(db, term, start_date=None, end_date=None):
+    """
+    Read the points of a term between two dates (inclusive)
+
+    Args:
+        start_date / end_date: 'YYYY-MM-DD' strings, None for unbounded
+
+    Returns:
+        Dict with parallel 'timestamps', 'ctr' and 'cvr' lists sorted by date
+    """
+    query = {'searchTerm': term}
+    month_range = {}
+    if start_date:
+        month_range['$gte'] = month_of(start_date)
+    if end_date:
+        month_range['$lte'] = month_of(end_date)
+    if month_range:
+        query['month'] = month_range
+
+    points = []
+    for bucket in db[TREND_BUCKETS_COLLECTION].find(query, {'points': 1}).sort('month', ASCENDING):
+        points.extend(
+            p for p in bucket['points']
+            if (not start_date or p['date'] >= start_date) and (not end_date or p['date'] <= end_date)
+        )
+    return _to_series(points)
+
+
+def get_recent_points(db, term, count):
+    """
+    Read the last `count` points of a term
+
+    Walks buckets newest-first and stops as soon as enough points are
+    collected, so reading the last few days costs one or two small documents.
+    """
+    points = []
+    cursor = (
+        db[TREND_BUCKETS_COLLECTION]
+        .find({'searchTerm': term}, {'points': 1})
+        .sort('month', DESCENDING)
+        .batch_size(2)
+    )
+    for bucket in cursor:
+        points = bucket['points'] + points
+        if len(points) >= count:
+            break
+    cursor.close()
+    return _to_series(points[-count:] if count else [])
+
+
+def get_days_window(db, term, days=None):
+    """
+    Read the last `days` calendar days of a term's history (None for all of it)
+
+    The window ends at the newest stored point rather than today, so terms
+    whose data stopped a while ago still show their last `days` days.
+    """
+    if days is None:
+        return get_trend_window(db, term)
+
+    newest = db[TREND_BUCKETS_COLLECTION].find_one(
+        {'searchTerm': term}, {'lastDate': 1}, sort=[('month', DESCENDING)]
+    )
+    if not newest:
+        return _to_series([])
+
+    end = newest['lastDate']
+    start = (datetime.strptime(end, '%Y-%m-%d') - timedelta(days=days - 1)).strftime('%Y-%m-%d')
+    return get_trend_window(db, term, start, end)
+
+
+# ---------------------------------------------------------------------------
+# Materialized trend statistics
+#
+# trendStatus, pctChange5d, upwardDays, latestCtr and latestCvr are
+# denormalized onto the search_term_categories document so the term list
+# renders without any per-row trend query. They are refreshed on every append
+# (append_daily_point) and in bulk by scripts/materialize_trend_stats.py.
+# ---------------------------------------------------------------------------
+
+TERMS_COLLECTION = 'search_term_categories'
+
+# Points used for the percent change shown in the term list
+TREND_WINDOW = 5
+# Percent change beyond which a term counts as improving / underperforming
+TREND_THRESHOLD_PCT = 1.0
+# Longest upward streak tracked (auto-lock needs 5)
+MAX_UPWARD_DAYS = 30
+
+# Trend fields every insert path writes onto a new term, so the term table
+# and its trend filter never meet a term without them. The first
+# append_daily_point (or scripts/materialize_trend_stats.py) replaces them.
+INITIAL_TREND_STATS = {'trendStatus': 'neutral', 'pctChange5d': 0, 'upwardDays': 0}
+
+
+def classify_pct_change(pct_change):
+    """Trend type for a percent change ('improvement', 'underperforming' or 'neutral')"""
+    if pct_change > TREND_THRESHOLD_PCT:
+        return 'improvement'
+    if pct_change < -TREND_THRESHOLD_PCT:
+        return 'underperforming'
+    return 'neutral'
+
+
+def compute_trend_stats(ctr, cvr):
+    """
+    Summary statistics for the most recent points of a series
+
+    Args:
+        ctr / cvr: Lists sorted by date (oldest first)
+
+    Returns:
+        Dict with pctChange5d, upwardDays, latestCtr and latestCvr
+    """
+    pct_change = 0
+    if len(ctr) >= TREND_WINDOW:
+        first_ctr = ctr[-TREND_WINDOW]
+        last_ctr = ctr[-1]
+        if first_ctr > 0:
+            pct_change = ((last_ctr - first_ctr) / first_ctr) * 100
+
+    upward_days = 0
+    for i in range(len(ctr) - 1, 0, -1):
+        if ctr[i] > ctr[i - 1] and upward_days < MAX_UPWARD_DAYS:
+            upward_days += 1
+        else:
+            break
+
+    return {
+        'pctChange5d': pct_change,
+        'upwardDays': upward_days,
+        'latestCtr': ctr[-1] if ctr else None,
+        'latestCvr': cvr[-1] if cvr else None,
+    }
+
+
+def trend_stats_update(stats, trend_type, now=None):
+    """$set document writing materialized trend fields onto a term"""
+    return {
+        'trendStatus': trend_type,
+        'pctChange5d': stats['pctChange5d'],
+        'upwardDays': stats['upwardDays'],
+        'latestCtr': stats['latestCtr'],
+        'latestCvr': stats['latestCvr'],
+        'trendStatsUpdatedDate': now or now_ist(),
+    }
+
+
+def refresh_trend_stats(db, term, recalculate_type=True):
+    """
+    Recompute and store the materialized trend fields for one term
+
+    Args:
+        recalculate_type: Derive trendType from the data (and update the
+            summary); otherwise keep the label stored in search_term_trends
+
+    Returns:
+        The stored fields
+    """
+    series = get_recent_points(db, term, MAX_UPWARD_DAYS + 1)
+    stats = compute_trend_stats(series['ctr'], series['cvr'])
+
+    if recalculate_type:
+        trend_type = classify_pct_change(stats['pctChange5d'])
+        db[TRENDS_COLLECTION].update_one(
+            {'searchTerm': term},
+            {'$set': {'trendType': trend_type, 'lastUpdated': now_ist()}},
+            upsert=True
+        )
+    else:
+        summary = db[TRENDS_COLLECTION].find_one({'searchTerm': term}, {'trendType': 1})
+        trend_type = summary.get('trendType', 'neutral') if summary else 'neutral'
+
+    fields = trend_stats_update(stats, trend_type)
+    db[TERMS_COLLECTION].update_one({'searchTerm': term}, {'$set': fields})
+    return fields
+
+
+def get_recent_series_many(db, terms, buckets_per_term=2):
+    """
+    Read the newest buckets of many terms in one aggregation
+
+    Returns:
+        Dict of term -> series dict ('timestamps', 'ctr', 'cvr')
+    """
+    pipeline = [
+        {'$match': {'searchTerm': {'$in': list(terms)}}},
+        {'$sort': {'searchTerm': 1, 'month': -1}},
+        {'$group': {
+            '_id': '$searchTerm',
+            # $firstN needs MongoDB 5.2+
+            'buckets': {'$firstN': {'n': buckets_per_term, 'input': '$points'}}
+        }}
+    ]
+    series = {}
+    for row in db[TREND_BUCKETS_COLLECTION].aggregate(pipeline, allowDiskUse=True):
+        points = [p for bucket in reversed(row['buckets']) for p in bucket]
+        series[row['_id']] = _to_series(points)
+    return series